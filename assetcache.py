@@ -0,0 +1,133 @@
+"""
+有界资源缓存：每个条目按字节数记账，超出字节预算或条目上限时按 LRU 淘汰，
+统计命中 / 未命中 / 淘汰次数；各模块的缓存创建时登记到这里，dump() 一次列出全部
+用法与 dict 相同（in / [] / get / pop / items ...），被淘汰的资源由调用方下次用到时重新生成
+"""
+from collections import OrderedDict
+
+import pygame
+
+_registry: dict[str, "AssetCache"] = {}
+_MISSING = object()
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """表面像素占用
+    覆盖整个父表面的 subsurface 视图（8 位调色板视图）让父表面一直存活，按父表面计：
+    父表面所在的缓存淘汰它时并不释放内存，多个配色共用一个父表面时宁可多算不漏算；
+    图集页上的局部视图计为 0，像素算在图集页名下"""
+    parent = surface.get_abs_parent()
+    if parent is not surface and parent.get_size() != surface.get_size():
+        return 0
+    return parent.get_pitch() * parent.get_height()
+
+
+class AssetCache:
+    """max_bytes / max_entries 为 None 表示不限；sizeof 为 None 时只限条目数（如字体）
+    命中计在 [] / get 上，未命中计在 get 返回默认值上，in 不计数"""
+
+    def __init__(self, name: str, max_bytes: int | None = None,
+                 max_entries: int | None = None, sizeof=surface_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizeof = sizeof
+        self._data: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get(self, key, default=None):
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        self.bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._evict()
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def _evict(self) -> None:
+        data = self._data
+        # 至少保留刚放入的一项，单个条目超出预算时也能用
+        while len(data) > 1 and (
+                (self.max_bytes is not None and self.bytes > self.max_bytes) or
+                (self.max_entries is not None and len(data) > self.max_entries)):
+            key, _ = data.popitem(last=False)
+            self.bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        if key not in self._data:
+            return default
+        self.bytes -= self._sizes.pop(key)
+        return self._data.pop(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+    def stats(self) -> dict:
+        return {"name": self.name, "entries": len(self._data), "bytes": self.bytes,
+                "peak_bytes": self.peak_bytes, "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+def stats() -> list[dict]:
+    return [cache.stats() for cache in _registry.values()]
+
+
+def total_bytes() -> int:
+    return sum(cache.bytes for cache in _registry.values())
+
+
+def dump() -> str:
+    """各缓存一行：条目数 / 上限、KiB / 预算、命中、未命中、淘汰次数"""
+    lines = [f"{'cache':<8} {'entries':>11} {'KiB':>15} {'hits':>8} {'misses':>7} "
+             f"{'evicted':>7}"]
+    for s in stats():
+        cap = "" if s["max_entries"] is None else f"/{s['max_entries']}"
+        budget = "" if s["max_bytes"] is None else f"/{s['max_bytes'] // 1024}"
+        lines.append(f"{s['name']:<8} {str(s['entries']) + cap:>11} "
+                     f"{str(s['bytes'] // 1024) + budget:>15} {s['hits']:>8} "
+                     f"{s['misses']:>7} {s['evictions']:>7}")
+    lines.append(f"{'total':<8} {'':>11} {total_bytes() // 1024:>15}")
+    return "\n".join(lines)
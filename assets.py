@@ -0,0 +1,74 @@
+"""
+分时资源预热：把换关 / Boss 出场时才会首次生成的资源（Boss 帧及其缩放版本、
+警告 / 过关 / 击杀文字）排进队列，利用每帧剩余的时间预算逐个生成，避免过场那一帧卡顿
+"""
+import time
+from collections import deque
+
+import pixel_art as pa
+import settings
+from sprites import Boss, FloatingText
+from utils import get_font, render_text
+
+SHADOW = (0, 0, 0)
+
+
+class AssetScheduler:
+    """按提交顺序执行的预热任务队列；同一 key 只执行一次"""
+
+    def __init__(self):
+        self.tasks: deque = deque()
+        self._seen: set = set()
+        self.done = 0
+        self.spent_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def submit(self, key, fn, *args) -> None:
+        if key not in self._seen:
+            self._seen.add(key)
+            self.tasks.append((fn, args))
+
+    def run(self, budget_ms: float) -> int:
+        """在 budget_ms 内执行任务（预算为正时至少执行一个），返回执行数量"""
+        if budget_ms <= 0 or not self.tasks:
+            return 0
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        n = 0
+        while self.tasks:
+            fn, args = self.tasks.popleft()
+            fn(*args)
+            n += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.done += n
+        self.spent_ms += (time.perf_counter() - start) * 1000
+        return n
+
+
+def _boss_frames(scheduler: AssetScheduler, level: int) -> None:
+    size = Boss.size_for(level)
+    for frame in (0, 1):
+        key = pa.boss_key(level, frame)
+        scheduler.submit(("sprite", key, size), pa.get_scaled, key, size)
+
+
+def _text(scheduler: AssetScheduler, size: int, text: str, color: tuple) -> None:
+    scheduler.submit(("text", size, text),
+                     lambda: render_text(get_font(size), text, color, SHADOW))
+
+
+def plan(scheduler: AssetScheduler, level: int, boss_warning: bool) -> None:
+    """关卡开始时预热本关 Boss 与警告文字；Boss 警告期间预热出场、击杀、过关文字与下一关 Boss
+    文字放到临近使用时才排队，免得在关卡中途被文字缓存的 LRU 挤掉"""
+    _boss_frames(scheduler, level)
+    _text(scheduler, 36, "⚠ WARNING ⚠", pa.RED)
+    if boss_warning:
+        _text(scheduler, settings.SCORE_FONT_SIZE, "! BOSS !", pa.RED)
+        text = f"BOSS +{Boss.points_for(level)}"
+        scheduler.submit(("floating", text), FloatingText.prerender, text, pa.GOLD, 22)
+        _text(scheduler, 32, f"LEVEL {level} CLEAR!", pa.CYAN)
+        _text(scheduler, 20, f"Lv.{level + 1}", pa.CYAN)
+        _boss_frames(scheduler, level + 1)
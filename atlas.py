@@ -0,0 +1,129 @@
+"""
+精灵图集：把生成好的精灵（含预缩放尺寸）按行（shelf）装箱进少数几张大表面
+各精灵以 subsurface 视图取用，名称 -> (页, rect) 索引可连同页面 PNG 整体存取
+"""
+import json
+import os
+
+import pygame
+
+PAGE_SIZE = 1024
+PADDING = 1
+
+
+class SpriteAtlas:
+    """若干页面 + 名称索引；get() 返回共享的 subsurface 视图，调用方不要修改"""
+
+    def __init__(self, pages: list[pygame.Surface],
+                 index: dict[str, tuple[int, tuple[int, int, int, int]]],
+                 meta: dict | None = None):
+        self.pages = pages
+        self.index = index
+        self.meta = meta or {}
+        self._views: dict[str, pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> list[str]:
+        return list(self.index)
+
+    def rect(self, name: str) -> pygame.Rect:
+        return pygame.Rect(self.index[name][1])
+
+    def get(self, name: str) -> pygame.Surface:
+        view = self._views.get(name)
+        if view is None:
+            page, rect = self.index[name]
+            view = self._views[name] = self.pages[page].subsurface(rect)
+        return view
+
+    def save(self, path: str, raw: bool = False) -> None:
+        """写出 path.json 索引（含 meta）与各页面：默认 PNG；raw 为 True 时写未压缩的
+        BGRA 字节（即常见显示格式的内存布局），读取时可零转换直接映射成表面"""
+        base = os.path.basename(path)
+        folder = os.path.dirname(path)
+        files = []
+        for i, page in enumerate(self.pages):
+            if raw:
+                name = f"{base}.{i}.bgra"
+                with open(os.path.join(folder, name), "wb") as f:
+                    f.write(pygame.image.tobytes(page, "BGRA"))
+            else:
+                name = f"{base}.{i}.png"
+                pygame.image.save(page, os.path.join(folder, name))
+            files.append([name, *page.get_size()])
+        data = {"meta": self.meta, "pages": files,
+                "sprites": {n: [p, *r] for n, (p, r) in self.index.items()}}
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "SpriteAtlas":
+        """读取 save() 写出的图集；文件缺失或损坏时抛出 OSError / ValueError"""
+        with open(path + ".json", encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            folder = os.path.dirname(path)
+            pages = []
+            for name, w, h in data["pages"]:
+                file = os.path.join(folder, name)
+                if name.endswith(".bgra"):
+                    with open(file, "rb") as f:
+                        buf = bytearray(f.read())
+                    if len(buf) != w * h * 4:
+                        raise ValueError(f"truncated page {name}")
+                    pages.append(pygame.image.frombuffer(buf, (w, h), "BGRA"))
+                else:
+                    page = pygame.image.load(file)
+                    if pygame.display.get_surface() is not None:
+                        page = page.convert_alpha()
+                    pages.append(page)
+            index = {n: (v[0], tuple(v[1:5])) for n, v in data["sprites"].items()}
+        except (KeyError, TypeError, IndexError, pygame.error) as e:
+            raise ValueError(f"bad atlas {path}: {e}") from e
+        return cls(pages, index, data.get("meta"))
+
+
+def pack(sprites: dict[str, pygame.Surface], page_size: int = PAGE_SIZE,
+         padding: int = PADDING) -> SpriteAtlas:
+    """按高度降序逐行摆放，一行放不下换行，一页放不下换页；同一表面只放一次"""
+    placed: dict[int, tuple[int, tuple[int, int, int, int]]] = {}
+    index = {}
+    sources = []
+    order = sorted(sprites.items(),
+                   key=lambda kv: (-kv[1].get_height(), -kv[1].get_width(), kv[0]))
+    extents: list[list[int]] = [[0, 0]]
+    page = x = y = shelf_h = 0
+    for name, surf in order:
+        if id(surf) in placed:
+            index[name] = placed[id(surf)]
+            continue
+        w, h = surf.get_size()
+        if w > page_size or h > page_size:
+            raise ValueError(f"sprite {name} ({w}x{h}) exceeds atlas page")
+        if x + w > page_size:
+            x, y, shelf_h = 0, y + shelf_h + padding, 0
+        if y + h > page_size:
+            page += 1
+            extents.append([0, 0])
+            x = y = shelf_h = 0
+        entry = (page, (x, y, w, h))
+        placed[id(surf)] = index[name] = entry
+        sources.append((surf, entry))
+        extents[page][0] = max(extents[page][0], x + w)
+        extents[page][1] = max(extents[page][1], y + h)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+
+    pages = []
+    for w, h in extents:
+        p = pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA)
+        p.fill((0, 0, 0, 0))
+        pages.append(p)
+    for surf, (page, rect) in sources:
+        pages[page].blit(surf, rect[:2])
+    return SpriteAtlas(pages, index)
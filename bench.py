@@ -0,0 +1,706 @@
+"""
+性能基准 / 无窗口压测脚本（不随 APK 打包）
+用法: python bench.py <命令> [参数...]
+  sim [ticks] [players]   纯模拟吞吐量（不渲染）与对象池复用统计
+  barrage [max]           敌方弹幕规模与单帧耗时（积分 + 命中 + 绘制）
+  blast [rounds]          双人导弹同帧落入密集编队时的结算耗时
+  particles [count]       粒子绘制：逐个 draw.rect 与预渲染方块 + blits 对比
+  alpha [frames]          光晕 / 护盾 / 血条：逐帧新建 alpha 表面与共享缓存对比
+  post [frames]           帧后处理：各扫描线策略 + 震动与旧的整屏中转做法对比
+  quality [frames]        各画质档位的模拟 + 渲染耗时，以及调节器对负载突变的响应
+  atlas [rounds]          图集打包耗时 / 页面尺寸，独立表面与图集视图的绘制对比
+  grid [rounds]           冷启动精灵栅格化：旧的逐像素 set_at 与查找表 + 缓冲区写入对比
+  spritecache [rounds]    冷启动精灵：全部重新生成 + 打包与读取磁盘缓存对比
+  warmup [workers]        冷启动精灵生成：主线程串行与进程池并行对比
+  transition [level]      Boss 出场 / 过关前后的逐帧耗时轨迹：无预热与分时预热对比
+  formats [rounds]        显示格式转换：SRCALPHA 图集视图与 colorkey + RLE 独立表面的绘制对比
+  palette [rounds]        8 位调色板精灵与 32 位精灵的像素内存、生成与绘制耗时对比
+  caches [levels]         无尽模式连续换关：有界缓存与不设上限时的资源内存走势
+"""
+import gc
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import assets
+import assetcache
+import compositor
+import formats
+import particles
+import quality
+import pixel_art as pa
+import pools
+import settings
+import spritecache
+import utils
+import warmup
+from bullets import EnemyBulletField
+from engine import GameState, PlayerInput
+from main import TITLE_SCENE_SIZE, render_game
+from sprites import Enemy, Missile, StarBackground, all_sprite_keys
+from utils import get_font
+
+
+def autopilot(state: GameState) -> list[PlayerInput]:
+    """简单的自动驾驶：左右扫动，持续开火并随时发射导弹"""
+    inputs = []
+    for i, p in enumerate(state.players):
+        phase = (state.tick // 90 + i) % 4
+        dx = (-1, 0, 1, 0)[phase]
+        dy = -1 if p.rect.bottom > settings.SCREEN_HEIGHT - 40 else 0
+        inputs.append(PlayerInput((dx, dy), None, True, True))
+    return inputs
+
+
+def bench_sim(ticks: str = "20000", players: str = "2") -> None:
+    random.seed(1)
+    ticks_n = int(ticks)
+    two_player = players == "2"
+    state = GameState(two_player)
+    games = 1
+    peak = 0
+    reused0 = pools.total_reused()
+    gc0 = sum(g["collections"] for g in gc.get_stats())
+    t0 = time.perf_counter()
+    for _ in range(ticks_n):
+        state.step(autopilot(state))
+        peak = max(peak, len(state.bullets) + len(state.enemy_bullets))
+        if state.game_over:
+            state = GameState(two_player)
+            games += 1
+    dt = time.perf_counter() - t0
+    print(f"sim: {ticks_n} ticks in {dt:.2f}s -> {ticks_n / dt:.0f} ticks/s "
+          f"({ticks_n / dt / settings.FPS:.1f}x realtime), games={games}, "
+          f"peak bullets={peak}, last level={state.level}")
+    sim_seconds = ticks_n / settings.SIM_HZ
+    avoided = pools.total_reused() - reused0
+    collections = sum(g["collections"] for g in gc.get_stats()) - gc0
+    print(f"pools: {avoided / sim_seconds:.0f} allocations avoided per game second, "
+          f"gc collections={collections}")
+    for name, (created, reused, free) in pools.stats().items():
+        print(f"  {name:<16} created={created:<5} reused={reused:<7} free={free}")
+
+
+def bench_barrage(max_count: str = "4000") -> None:
+    """维持固定数量的环形弹幕，统计每帧耗时随子弹数的变化"""
+    random.seed(1)
+    sw, sh = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
+    surface = pygame.Surface((sw, sh))
+    player = pygame.Rect(sw // 2 - 25, sh - 120, 50, 50)
+    count = 250
+    while count <= int(max_count):
+        field = EnemyBulletField()
+        frames = 240
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            while len(field) < count:
+                a = random.uniform(0, 6.2832)
+                spd = random.uniform(0.3, 4.0)
+                field.spawn(sw / 2, sh / 3, math.cos(a) * spd, math.sin(a) * spd,
+                            random.random() < 0.8)
+            field.save_prev()
+            field.update(sw, sh)
+            player.collidelistall(field.rects())
+            field.clear_radius([(sw / 2, sh / 3)], 40)
+            field.draw(surface, 0.5)
+        dt = (time.perf_counter() - t0) / frames * 1000
+        print(f"barrage {count:5d} bullets: {dt:6.2f} ms/frame "
+              f"({dt / count * 1000:.2f} us/bullet)")
+        count *= 2
+
+
+def bench_blast(rounds: str = "500") -> None:
+    random.seed(1)
+    sw = settings.SCREEN_WIDTH
+    worst = total = 0.0
+    kills = 0
+    for _ in range(int(rounds)):
+        state = GameState(True)
+        for row in range(4):
+            for col in range(10):
+                e = Enemy(sw, "small")
+                e.rect.topleft = (col * 46 + 10, row * 30 - 20)
+                state.enemies.append(e)
+        for _ in range(60):
+            a = random.uniform(0, 6.2832)
+            state.enemy_bullets.spawn(sw / 2, 40, math.cos(a) * 3, math.sin(a) * 3)
+        for i, x in enumerate((sw // 3, sw * 2 // 3)):
+            state.missiles.append((Missile(x, -20), i))
+        before = len(state.enemies)
+        t0 = time.perf_counter()
+        state._update_missiles()
+        dt = time.perf_counter() - t0
+        kills += before - len(state.enemies)
+        total += dt
+        worst = max(worst, dt)
+    n = int(rounds)
+    print(f"blast: {n} double detonations into 40 enemies + 60 bullets, "
+          f"avg {total / n * 1e6:.0f} us, worst {worst * 1e6:.0f} us, "
+          f"kills/round {kills / n:.1f}")
+
+
+def _draw_particles_rects(ps: particles.ParticleSystem,
+                          surface: pygame.Surface) -> int:
+    """旧的绘制方式（每个粒子一次 draw.rect / 一个临时 alpha 表面），返回绘制调用数"""
+    calls = 0
+    for x, y, life, dur, style in zip(ps.x, ps.y, ps.life, ps.dur, ps.style):
+        color, size, alpha = particles.appearance(style, dur, life)
+        half = size // 2
+        if alpha == 255:
+            pygame.draw.rect(surface, color,
+                             (int(x) - half, int(y) - half, size, size))
+        else:
+            s = pygame.Surface((size, size), pygame.SRCALPHA)
+            s.fill((*color, alpha))
+            surface.blit(s, (int(x) - half, int(y) - half))
+        calls += 1
+    return calls
+
+
+def bench_particles(count: str = "600") -> None:
+    random.seed(1)
+    sw, sh = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
+    surface = pygame.Surface((sw, sh))
+    ps = particles.ParticleSystem(int(count) * 2)
+    frames = 300
+    t_rects = t_blits = 0.0
+    live = calls = 0
+    for _ in range(frames):
+        while len(ps) < int(count):
+            x, y = random.randint(40, sw - 40), random.randint(40, sh - 40)
+            particles.emit_explosion(ps, x, y, random.randint(16, 28))
+            particles.emit_sparks(ps, x, y)
+            particles.emit_thrust(ps, x, y)
+        ps.update()
+        live += len(ps)
+        t0 = time.perf_counter()
+        calls += _draw_particles_rects(ps, surface)
+        t1 = time.perf_counter()
+        ps.draw(surface)
+        t2 = time.perf_counter()
+        t_rects += t1 - t0
+        t_blits += t2 - t1
+    print(f"particles: avg {live / frames:.0f} live over {frames} frames")
+    print(f"  draw.rect per particle: {t_rects / frames * 1000:6.2f} ms/frame, "
+          f"{calls / frames:.0f} draw calls/frame")
+    print(f"  tiles + Surface.blits:  {t_blits / frames * 1000:6.2f} ms/frame, "
+          f"1 draw call/frame ({len(particles._tiles)} tiles)")
+
+
+def bench_alpha(frames: str = "2000") -> None:
+    """玩家尾焰光晕 + 护盾光圈 + Boss 血条光晕 + 40 颗 Boss 子弹光晕"""
+    n = int(frames)
+    surface = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    bullets = [(20 + i * 11, 100 + (i * 37) % 300) for i in range(40)]
+    t_alloc = t_atlas = 0.0
+    before = pa.alpha_stats()["created"]
+    for f in range(n):
+        ticks = f * 16
+        player_a = int(40 + 20 * math.sin(ticks / 200.0))
+        shield_a = int(20 + 10 * math.sin(ticks / 150.0))
+        bullet_a = int(30 + 15 * math.sin(ticks / 100.0))
+        hp_w = 300 - f % 300
+        t0 = time.perf_counter()
+        s = pygame.Surface((16, 16), pygame.SRCALPHA)
+        s.fill((255, 163, 0, player_a))
+        surface.blit(s, (200, 500))
+        s = pygame.Surface((64, 64), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*pa.SHIELD_BLUE, shield_a), (32, 32), 30)
+        surface.blit(s, (180, 460))
+        s = pygame.Surface((hp_w, 14), pygame.SRCALPHA)
+        s.fill((255, 60, 60, 25))
+        surface.blit(s, (40, 30))
+        for x, y in bullets:
+            s = pygame.Surface((10, 18), pygame.SRCALPHA)
+            s.fill((*pa.BOSS_BULLET_COLOR, bullet_a))
+            surface.blit(s, (x, y))
+        t1 = time.perf_counter()
+        surface.blit(pa.alpha_rect((16, 16), (255, 163, 0), player_a), (200, 500))
+        surface.blit(pa.alpha_circle(30, pa.SHIELD_BLUE, shield_a), (180, 460))
+        surface.blit(pa.alpha_rect((300, 14), (255, 60, 60), 25), (40, 30),
+                     (0, 0, hp_w, 14))
+        glow = pa.alpha_rect((10, 18), pa.BOSS_BULLET_COLOR, bullet_a)
+        surface.blits([(glow, pos) for pos in bullets], False)
+        t2 = time.perf_counter()
+        t_alloc += t1 - t0
+        t_atlas += t2 - t1
+    created = pa.alpha_stats()["created"] - before
+    print(f"alpha: {n} frames, 43 translucent blits/frame")
+    print(f"  new Surface per blit: {t_alloc / n * 1000:6.3f} ms/frame, "
+          f"{43 * n} allocations")
+    print(f"  shared alpha atlas:   {t_atlas / n * 1000:6.3f} ms/frame, "
+          f"{created} allocations")
+
+
+def bench_post(frames: str = "600") -> None:
+    n = int(frames)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    frame = pa.create_bg_gradient(*size)
+    background = compositor.BackgroundCompositor(frame)
+    post = compositor.PostProcessor(size, "off", background)
+    scanlines = pa.create_scanlines(*size)
+    render_surf = pygame.Surface(size)
+    offsets = [(random.randint(-6, 6), random.randint(-6, 6)) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    for dx, dy in offsets:
+        background.draw_background(render_surf, 1)
+        render_surf.blit(scanlines, (0, 0))
+        screen.fill((0, 0, 0))
+        screen.blit(render_surf, (dx, dy))
+    old = (time.perf_counter() - t0) / n * 1000
+    print(f"post: {n} frames, {size[0]}x{size[1]}, shaking every frame")
+    print(f"  old (overlay + fill + full blit): {old:6.3f} ms/frame "
+          f"(incl. background blit)")
+    for mode in compositor.SCANLINE_MODES:
+        post.set_mode(mode)
+        t0 = time.perf_counter()
+        for offset in offsets:
+            background.draw_background(screen, 1)
+            post.apply(screen, offset)
+        dt = (time.perf_counter() - t0) / n * 1000
+        print(f"  {mode:<8} + scroll:                {dt:6.3f} ms/frame, "
+              f"post stage {post.stats()[mode]:6.3f} ms")
+
+
+def bench_quality(frames: str = "900") -> None:
+    n = int(frames)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    background = compositor.BackgroundCompositor(pa.create_bg_gradient(*size))
+    post = compositor.PostProcessor(size, background=background)
+    font, hud_font = get_font(settings.SCORE_FONT_SIZE), get_font(20)
+    print(f"quality: {n} frames per tier, 2 players on autopilot")
+    for i, tier in enumerate(quality.TIERS):
+        quality.set_tier(i)
+        post.set_mode(quality.scanline_mode())
+        random.seed(1)
+        state = GameState(True)
+        stars = StarBackground(*size)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            state.step(autopilot(state))
+            stars.update()
+            if state.game_over:
+                state = GameState(True)
+            render_game(screen, state, stars, background, font, hud_font)
+            post.apply(screen, state.shake.get_offset())
+        dt = (time.perf_counter() - t0) / n * 1000
+        print(f"  {tier[0]:<7} {dt:6.2f} ms/frame")
+
+    quality.set_tier(0)
+    gov = quality.QualityGovernor()
+    # 合成负载（相对帧预算）: 正常 -> 持续超预算 -> 恢复
+    target = gov.target_ms
+    trace = [0.5 * target] * 300 + [1.5 * target] * 600 + [0.35 * target] * 1500
+    for ms in trace:
+        # 降档后负载按档位减轻
+        gov.record(ms * (1 - 0.25 * quality.tier))
+    print("  governor on synthetic spike: "
+          + ", ".join(f"frame {f} -> {name} ({avg:.1f} ms)"
+                      for f, name, avg in gov.changes))
+    quality.set_tier(0)
+
+
+def bench_atlas(rounds: str = "200") -> None:
+    n = int(rounds)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    surface = pygame.Surface(size)
+    keys = all_sprite_keys()
+    t0 = time.perf_counter()
+    pa.warm_up(keys)
+    t1 = time.perf_counter()
+    atlas = pa.build_atlas(keys)
+    t2 = time.perf_counter()
+    loose = [(pa.get_scaled(key, sz), sz) for key, sz in keys]
+    views = [(atlas.get(pa.atlas_name(key, sz)), sz) for key, sz in keys]
+    positions = [(random.randint(0, size[0] - 60), random.randint(0, size[1] - 60))
+                 for _ in range(60)]
+    results = []
+    for label, sprites in (("separate surfaces", loose), ("atlas subsurfaces", views)):
+        seq = [(sprites[i % len(sprites)][0], pos) for i, pos in enumerate(positions)]
+        t = time.perf_counter()
+        for _ in range(n):
+            surface.blits(seq, False)
+        results.append((label, (time.perf_counter() - t) / n * 1000))
+    pages = ", ".join(f"{w}x{h}" for w, h in (p.get_size() for p in atlas.pages))
+    print(f"atlas: {len(atlas)} sprites, generate {(t1 - t0) * 1000:.1f} ms, "
+          f"pack {(t2 - t1) * 1000:.1f} ms, pages {pages}")
+    for label, ms in results:
+        print(f"  {label}: {ms:6.3f} ms per 60 sprite blits")
+
+
+def _grid_set_at(rows: list[str], palette: dict, scale: int = pa.PX) -> pygame.Surface:
+    """旧的 pa._grid：逐像素 set_at"""
+    h = len(rows)
+    w = len(rows[0]) if rows else 0
+    s = pygame.Surface((w, h), pygame.SRCALPHA)
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row):
+            if ch in palette:
+                s.set_at((x, y), palette[ch])
+    return pygame.transform.scale(s, (w * scale, h * scale))
+
+
+def bench_grid(rounds: str = "50") -> None:
+    n = int(rounds)
+    calls = []
+    grid = pa._grid
+
+    def record(rows, palette, scale=pa.PX):
+        calls.append((rows, palette, scale))
+        return grid(rows, palette, scale)
+
+    pa._grid = record
+    try:
+        pa._cache.clear()
+        for key, _ in all_sprite_keys():
+            pa.get_sprite(key)
+    finally:
+        pa._grid = grid
+        pa._cache.clear()
+    same = all(pygame.image.tobytes(grid(*c), "RGBA") ==
+               pygame.image.tobytes(_grid_set_at(*c), "RGBA") for c in calls)
+    cells = sum(len(rows) * len(rows[0]) for rows, _, _ in calls)
+    print(f"grid: {len(calls)} character-grid sprites, {cells} cells, "
+          f"pixel-identical: {same}")
+    for label, fn in (("set_at per pixel", _grid_set_at), ("lookup + buffer", grid)):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            for c in calls:
+                fn(*c)
+        print(f"  {label:<17} {(time.perf_counter() - t0) / n * 1000:6.2f} ms per cold start")
+
+
+def bench_spritecache(rounds: str = "20") -> None:
+    n = int(rounds)
+    pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    keys = all_sprite_keys()
+    raw = [pa.title_scene_key(*TITLE_SCENE_SIZE)]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sprite_cache")
+        t_build = t_load = 0.0
+        for _ in range(n):
+            pa._cache.clear()
+            pa._scaled_cache.clear()
+            t0 = time.perf_counter()
+            atlas = pa.build_atlas(keys, raw)
+            t_build += time.perf_counter() - t0
+        spritecache.save(atlas, keys, raw, path)
+        size = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+        for _ in range(n):
+            t0 = time.perf_counter()
+            cached = spritecache.load(keys, raw, path)
+            t_load += time.perf_counter() - t0
+    print(f"spritecache: {len(atlas)} sprites, cache {size / 1024:.0f} KiB, "
+          f"hit: {cached is not None}")
+    print(f"  generate + pack:  {t_build / n * 1000:6.2f} ms")
+    print(f"  load from cache:  {t_load / n * 1000:6.2f} ms (incl. fingerprint)")
+
+
+def bench_warmup(workers: str = "0") -> None:
+    pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    keys = all_sprite_keys()
+    raw = [pa.title_scene_key(*TITLE_SCENE_SIZE)]
+    print(f"warmup: {len(warmup._groups(keys, raw))} sprite groups")
+    reference = None
+    for parallel in (False, True):
+        pa._cache.clear()
+        pa._scaled_cache.clear()
+        t0 = time.perf_counter()
+        mode = warmup.generate(keys, raw, parallel, workers=int(workers) or None)
+        dt = time.perf_counter() - t0
+        pixels = {pa.atlas_name(k, sz): pygame.image.tobytes(pa.get_scaled(k, sz), "RGBA")
+                  for k, sz in keys}
+        same = "" if reference is None else f", identical to serial: {pixels == reference}"
+        reference = reference or pixels
+        print(f"  {mode:<8} {dt * 1000:7.1f} ms{same}")
+
+
+def _transition_trace(level: int, scheduler: assets.AssetScheduler | None,
+                      screen: pygame.Surface, background, font, hud_font) -> tuple[list[float], int]:
+    """从 Boss 警告前开始逐帧模拟 + 渲染，返回 (每帧毫秒, Boss 出场帧)"""
+    random.seed(1)
+    state = GameState(False)
+    state.level = level
+    state.score = level * settings.BOSS_SCORE_THRESHOLD
+    stars = StarBackground(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    stars.draw(screen)  # 星空条带首次 blit 时才做 RLE 编码，不计入轨迹
+    if scheduler is not None:
+        # 关卡进行中的空闲预算：警告触发前本关的预热任务早已完成
+        assets.plan(scheduler, level, False)
+        while scheduler:
+            scheduler.run(settings.ASSET_BUDGET_MS)
+    times, spawn = [], -1
+    planned = (level, False)
+    for f in range(240):
+        t0 = time.perf_counter()
+        had_boss = state.boss is not None
+        state.step([PlayerInput((0, 0), None, True, False)])
+        stars.update()
+        render_game(screen, state, stars, background, font, hud_font)
+        ms = (time.perf_counter() - t0) * 1000
+        times.append(ms)
+        if state.boss is not None and not had_boss:
+            spawn = f
+        if scheduler is not None:
+            key = (state.level, state.boss_warning_active)
+            if key != planned:
+                planned = key
+                assets.plan(scheduler, *key)
+            scheduler.run(min(settings.ASSET_BUDGET_MS, 1000 / settings.RENDER_FPS - ms))
+    return times, spawn
+
+
+def bench_transition(level: str = "9") -> None:
+    lv = int(level)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    background = compositor.BackgroundCompositor(pa.create_bg_gradient(*size))
+    font, hud_font = get_font(settings.SCORE_FONT_SIZE), get_font(20)
+    print(f"transition: level {lv} boss warning -> boss spawn, frame times in ms")
+    for label, scheduler in (("on demand", None), ("scheduled", assets.AssetScheduler())):
+        for frame in (0, 1):
+            pa._cache.pop(pa.boss_key(lv, frame), None)
+        pa._scaled_cache.clear()
+        utils._text_cache.clear()
+        times, spawn = _transition_trace(lv, scheduler, screen, background,
+                                         font, hud_font)
+        typical = sorted(times)[len(times) // 2]
+        print(f"  {label:<10} median {typical:5.2f} | warning frame 0: {times[0]:5.2f} | "
+              f"spawn frame {spawn}: " + " ".join(f"{t:5.2f}" for t in times[spawn:spawn + 3])
+              + f" | worst {max(times):5.2f} (frame {times.index(max(times))})")
+        if scheduler is not None:
+            print(f"  {'':<10} {scheduler.done} assets pre-generated in "
+                  f"{scheduler.spent_ms:.1f} ms of spare frame time")
+
+
+def _render_trace(screen: pygame.Surface, background, font, hud_font,
+                  frames: int) -> list[float]:
+    """固定随机种子的自动驾驶对局，返回每帧渲染毫秒（不含模拟）"""
+    random.seed(1)
+    state = GameState(True)
+    stars = StarBackground(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    times = []
+    for _ in range(frames):
+        state.step(autopilot(state))
+        stars.update()
+        t0 = time.perf_counter()
+        render_game(screen, state, stars, background, font, hud_font)
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def bench_formats(rounds: str = "300") -> None:
+    n = int(rounds)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    background = compositor.BackgroundCompositor(pa.create_bg_gradient(*size))
+    font, hud_font = get_font(settings.SCORE_FONT_SIZE), get_font(20)
+    keys = all_sprite_keys()
+    atlas = pa.build_atlas(keys)
+    names = [pa.atlas_name(key, sz) for key, sz in keys]
+    positions = [(random.randint(0, size[0] - 60), random.randint(0, size[1] - 60))
+                 for _ in range(60)]
+
+    def blit_ms(sprites) -> float:
+        seq = [(sprites[i % len(sprites)], pos) for i, pos in enumerate(positions)]
+        t = time.perf_counter()
+        for _ in range(n):
+            screen.blits(seq, False)
+        return (time.perf_counter() - t) / n * 1000
+
+    def frame_ms() -> float:
+        times = _render_trace(screen, background, font, hud_font, 600)
+        return sorted(times)[len(times) // 2]
+
+    pa.install_atlas(atlas)
+    before = [pa.get_scaled(key, sz) for key, sz in keys]
+    rows = [("SRCALPHA atlas views", blit_ms(before), frame_ms())]
+    t0 = time.perf_counter()
+    pa.convert_caches()
+    convert_ms = (time.perf_counter() - t0) * 1000
+    after = [pa.get_scaled(key, sz) for key, sz in keys]
+    rows.append(("colorkey + RLE surfaces", blit_ms(after), frame_ms()))
+
+    # RLE 与 subsurface：视图不继承父页面的 RLE；父页面已 RLE 编码时，
+    # 每次从视图 blit 都要先解码父页面（RLEACCEL 标志在首次 blit 编码后才出现）
+    key = formats.pick_colorkey(atlas.pages[0])
+    rects = [atlas.rect(name) for name in names if atlas.index[name][0] == 0]
+    page = formats.to_colorkey(atlas.pages[0], key, rle=False)
+    views = [page.subsurface(r) for r in rects]
+    view_rows = [("colorkey page views", blit_ms(views))]
+    for v in views:
+        v.set_colorkey(key, pygame.RLEACCEL)
+    view_rows.append(("views with own RLE", blit_ms(views)))
+    page = formats.to_colorkey(atlas.pages[0], key)
+    screen.blit(page, (0, 0))
+    views = [page.subsurface(r) for r in rects]
+    view_rows.append(("RLE page views", blit_ms(views)))
+    inherited = sum(bool(v.get_flags() & pygame.RLEACCEL) for v in views)
+
+    probe = pygame.Surface((128, 128))
+    same = True
+    for old, new in zip(before, after):
+        out = []
+        for s in (old, new):
+            probe.fill((10, 20, 30))
+            probe.blit(s, (0, 0))
+            out.append(pygame.image.tobytes(probe, "RGB"))
+        same = same and out[0] == out[1]
+    print(f"formats: {len(keys)} sprites, convert_caches {convert_ms:.1f} ms, "
+          f"{formats.stats()}, pixel-identical: {same}")
+    for label, ms, frame in rows:
+        print(f"  {label:<24} {ms:6.3f} ms per 60 sprite blits | "
+              f"render_game median {frame:5.2f} ms")
+    print(f"  subsurface views ({inherited}/{len(views)} inherit the page's RLE): " +
+          ", ".join(f"{label} {ms:.3f} ms" for label, ms in view_rows))
+
+
+def _pixel_bytes(surfaces) -> int:
+    """像素内存：subsurface 视图计入其所属的父表面，每个表面只计一次"""
+    owners = {}
+    for s in surfaces:
+        owner = s.get_abs_parent()
+        owners[id(owner)] = owner
+    return sum(s.get_pitch() * s.get_height() for s in owners.values())
+
+
+def _reset_sprites() -> None:
+    for cache in (pa._cache, pa._scaled_cache, pa._glow_cache, pa._shapes,
+                  pa._scaled_shapes, pa._variants):
+        cache.clear()
+    pa._convert = False
+
+
+def bench_palette(rounds: str = "300") -> None:
+    n = int(rounds)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    keys = all_sprite_keys()
+    positions = [(random.randint(0, size[0] - 60), random.randint(0, size[1] - 60))
+                 for _ in range(60)]
+    results, drawn = [], []
+    for mode in (False, True):
+        settings.PALETTE_SPRITES = mode
+        _reset_sprites()
+        t0 = time.perf_counter()
+        pa.warm_up(keys)
+        gen_ms = (time.perf_counter() - t0) * 1000
+        mem = _pixel_bytes([*pa._cache.values(), *pa._scaled_cache.values()])
+        pa.convert_caches()
+        sprites = [pa.get_scaled(key, sz) for key, sz in keys]
+        seq = [(sprites[i % len(sprites)], pos) for i, pos in enumerate(positions)]
+        t = time.perf_counter()
+        for _ in range(n):
+            screen.blits(seq, False)
+        blit_ms = (time.perf_counter() - t) / n * 1000
+        results.append(("8-bit palette" if mode else "32-bit", gen_ms, mem, blit_ms))
+        probe = pygame.Surface((200, 140))
+        out = []
+        for s in sprites:
+            probe.fill((10, 20, 30))
+            probe.blit(s, (0, 0))
+            out.append(pygame.image.tobytes(probe, "RGB"))
+        drawn.append(out)
+    shapes = lambda: _pixel_bytes([*pa._shapes.values(), *pa._scaled_shapes.values()])
+    before = shapes()
+    t0 = time.perf_counter()
+    pa.palette_variant("player_3_0", "player_1_0", {pa._P1_PAL["B"]: (230, 60, 200)})
+    pa.get_scaled("player_3_0", (50, 60))
+    variant_ms = (time.perf_counter() - t0) * 1000
+    added = shapes() - before
+    settings.PALETTE_SPRITES = False
+    _reset_sprites()
+    print(f"palette: {len(keys)} sprites, pixel-identical: {drawn[0] == drawn[1]}")
+    for label, gen_ms, mem, ms in results:
+        print(f"  {label:<14} generate {gen_ms:5.1f} ms | pixels {mem / 1024:6.1f} KiB | "
+              f"{ms:6.3f} ms per 60 sprite blits")
+    print(f"  new colour variant (player_3 at two sizes): {variant_ms:.2f} ms, "
+          f"+{added} bytes of pixels")
+
+
+
+def _endless_run(levels: int, screen: pygame.Surface, background,
+                 font, hud_font) -> list[int]:
+    """逐关模拟无尽模式：每关按 assets.plan 生成 Boss / 文字资源并渲染若干帧，返回每关结束时的缓存字节数"""
+    state = GameState(True)
+    stars = StarBackground(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    sizes = []
+    for level in range(1, levels + 1):
+        scheduler = assets.AssetScheduler()
+        assets.plan(scheduler, level, True)
+        while scheduler:
+            scheduler.run(settings.ASSET_BUDGET_MS)
+        state.level = level
+        state.score = level * settings.BOSS_SCORE_THRESHOLD
+        for _ in range(30):
+            state.step(autopilot(state))
+            render_game(screen, state, stars, background, font, hud_font)
+        sizes.append(assetcache.total_bytes())
+    return sizes
+
+
+def bench_caches(levels: str = "60") -> None:
+    n = int(levels)
+    size = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    screen = pygame.display.set_mode(size)
+    background = compositor.BackgroundCompositor(pa.create_bg_gradient(*size))
+    font, hud_font = get_font(settings.SCORE_FONT_SIZE), get_font(20)
+    caches = list(assetcache._registry.values())
+    limits = [(c.max_bytes, c.max_entries) for c in caches]
+    print(f"caches: endless run to level {n}, total cached bytes (KiB) every 10 levels")
+    for label in ("unbounded", "bounded"):
+        for cache, (max_bytes, max_entries) in zip(caches, limits):
+            cache.clear()
+            cache.hits = cache.misses = cache.evictions = cache.peak_bytes = 0
+            if label == "unbounded":
+                cache.max_bytes = cache.max_entries = None
+            else:
+                cache.max_bytes, cache.max_entries = max_bytes, max_entries
+        random.seed(1)
+        t0 = time.perf_counter()
+        sizes = _endless_run(n, screen, background, font, hud_font)
+        elapsed = time.perf_counter() - t0
+        marks = " ".join(f"{sizes[i] // 1024}" for i in range(9, n, 10))
+        print(f"  {label:<10} {marks} | {elapsed:.2f} s")
+    print(assetcache.dump())
+
+
+COMMANDS = {
+    "sim": bench_sim,
+    "barrage": bench_barrage,
+    "blast": bench_blast,
+    "particles": bench_particles,
+    "alpha": bench_alpha,
+    "post": bench_post,
+    "quality": bench_quality,
+    "atlas": bench_atlas,
+    "grid": bench_grid,
+    "spritecache": bench_spritecache,
+    "warmup": bench_warmup,
+    "transition": bench_transition,
+    "formats": bench_formats,
+    "palette": bench_palette,
+    "caches": bench_caches,
+}
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print(__doc__)
+        sys.exit(1)
+    pygame.init()
+    COMMANDS[sys.argv[1]](*sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ package.domain = org.planewar
 source.dir = .
 source.include_exts = py,txt,ttf,otf
 source.exclude_dirs = build,dist,.venv,.vscode,__pycache__,images,.git,.github,apk-output,build-log-output
+source.exclude_patterns = bench.py
 
 version = 1.0.0
 
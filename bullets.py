@@ -0,0 +1,248 @@
+"""
+子弹存储：玩家子弹池与敌方子弹场
+位置、速度、尺寸、样式按列存放在 array 中，
+积分 / 越界剔除 / 压缩删除都是整列操作，不再为每颗子弹维护一个对象
+"""
+import math
+from array import array
+from itertools import compress
+from operator import add
+
+import pygame
+
+import pixel_art as pa
+import quality
+
+STYLES = ("normal", "laser", "plasma", "electric")
+_STYLE_INDEX = {name: i for i, name in enumerate(STYLES)}
+
+_MARGIN = 20
+
+
+class BulletPool:
+    """列式存储的玩家子弹集合"""
+
+    _FLOAT_COLS = ("x", "y", "vx", "vy", "prev_x", "prev_y")
+    _BYTE_COLS = ("w", "h", "style")
+
+    def __init__(self):
+        for name in self._FLOAT_COLS:
+            setattr(self, name, array("d"))
+        for name in self._BYTE_COLS:
+            setattr(self, name, array("B"))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def spawn(self, x: float, y: float, w: int, h: int, style: str = "normal",
+              vx: float = 0.0, vy: float = -12.0) -> None:
+        x = float(x)
+        y = float(y)
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.prev_x.append(x)
+        self.prev_y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.style.append(_STYLE_INDEX.get(style, 0))
+
+    def save_prev(self) -> None:
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def update(self, screen_width: int, screen_height: int) -> None:
+        """整批积分并剔除越界子弹"""
+        if not self.x:
+            return
+        self.x = array("d", map(add, self.x, self.vx))
+        self.y = array("d", map(add, self.y, self.vy))
+        left, right = -_MARGIN, screen_width + _MARGIN
+        top, bottom = -_MARGIN, screen_height + _MARGIN
+        keep = [left <= int(x) + w and int(x) <= right and
+                top <= int(y) + h and int(y) <= bottom
+                for x, y, w, h in zip(self.x, self.y, self.w, self.h)]
+        if not all(keep):
+            self._compact(keep)
+
+    def _compact(self, keep: list[bool]) -> None:
+        for name in self._FLOAT_COLS:
+            setattr(self, name, array("d", compress(getattr(self, name), keep)))
+        for name in self._BYTE_COLS:
+            setattr(self, name, array("B", compress(getattr(self, name), keep)))
+
+    def remove(self, indices) -> None:
+        """按下标批量删除（一次压缩）"""
+        if indices:
+            self._compact([i not in indices for i in range(len(self.x))])
+
+    def rects(self) -> list[tuple[int, int, int, int]]:
+        """当前帧每颗子弹的整数 rect（与 pygame.Rect 的截断规则一致）"""
+        return list(zip(map(int, self.x), map(int, self.y), self.w, self.h))
+
+    def center(self, i: int) -> tuple[int, int]:
+        return int(self.x[i]) + self.w[i] // 2, int(self.y[i]) + self.h[i] // 2
+
+    def hit_first(self, grid) -> list[tuple[int, object]]:
+        """对空间网格批量查询，返回 (子弹下标, 第一个命中对象)，按子弹顺序"""
+        hits = []
+        first = grid.first
+        for i, r in enumerate(self.rects()):
+            obj = first(r)
+            if obj is not None:
+                hits.append((i, obj))
+        return hits
+
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
+        if not self.x:
+            return
+        px = pa.PX
+        t = (pygame.time.get_ticks() // 60) % 4
+        draw_rect = pygame.draw.rect
+        if alpha >= 1.0:
+            xs, ys = self.x, self.y
+        else:
+            xs = [p + (c - p) * alpha for p, c in zip(self.prev_x, self.x)]
+            ys = [p + (c - p) * alpha for p, c in zip(self.prev_y, self.y)]
+        for fx, fy, w, h, style in zip(xs, ys, self.w, self.h, self.style):
+            x, y = int(fx), int(fy)
+            cx, cy = x + w // 2, y + h // 2
+            if style == 1:
+                draw_rect(surface, pa.LASER_EDGE,
+                          (cx - px, y - px, px * 2, h + px * 2))
+                draw_rect(surface, pa.LASER_CORE,
+                          (cx - px // 2, y, px, h))
+                draw_rect(surface, pa.WHITE,
+                          (cx - 1, y, 2, px * 2))
+            elif style == 2:
+                size = px * 3
+                draw_rect(surface, pa.PLASMA_EDGE,
+                          (cx - size // 2, cy - size // 2, size, size))
+                draw_rect(surface, pa.PLASMA_MID,
+                          (cx - px, cy - px, px * 2, px * 2))
+                draw_rect(surface, pa.PLASMA_CORE,
+                          (cx - 1, cy - 1, 3, 3))
+            elif style == 3:
+                for i in range(3):
+                    ox = ((t + i) % 3 - 1) * px
+                    draw_rect(surface, pa.ELEC_BOLT,
+                              (cx + ox - 1, y + i * h // 3, px, h // 3))
+                draw_rect(surface, pa.ELEC_CORE,
+                          (cx - 1, y, 2, h))
+            else:
+                draw_rect(surface, pa.BULLET_YELLOW, (x, y, w, h))
+                draw_rect(surface, pa.BULLET_WHITE, (x, y, w, px))
+
+
+class EnemyBulletField:
+    """敌方子弹场：浮点坐标（亚像素运动），列式存储，整批积分/剔除/命中"""
+
+    W, H = 6, 14
+
+    _FLOAT_COLS = ("x", "y", "vx", "vy", "prev_x", "prev_y")
+    _BYTE_COLS = ("boss",)
+
+    def __init__(self):
+        for name in self._FLOAT_COLS:
+            setattr(self, name, array("d"))
+        for name in self._BYTE_COLS:
+            setattr(self, name, array("B"))
+        self._sprites: dict[int, pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def spawn(self, x: float, y: float, vx: float, vy: float,
+              is_boss: bool = False) -> None:
+        """x 为子弹中心横坐标，y 为顶端"""
+        x = float(x) - self.W // 2
+        y = float(y)
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.prev_x.append(x)
+        self.prev_y.append(y)
+        self.boss.append(1 if is_boss else 0)
+
+    def save_prev(self) -> None:
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def update(self, screen_width: int, screen_height: int) -> None:
+        """整批积分并剔除越界子弹"""
+        if not self.x:
+            return
+        self.x = array("d", map(add, self.x, self.vx))
+        self.y = array("d", map(add, self.y, self.vy))
+        w, h = self.W, self.H
+        keep = [-w <= x <= screen_width and -h <= y <= screen_height
+                for x, y in zip(self.x, self.y)]
+        if not all(keep):
+            self._compact(keep)
+
+    _compact = BulletPool._compact
+
+    def remove(self, indices) -> None:
+        if indices:
+            self._compact([i not in indices for i in range(len(self.x))])
+
+    def rects(self) -> list[tuple[int, int, int, int]]:
+        w, h = self.W, self.H
+        return [(int(x), int(y), w, h) for x, y in zip(self.x, self.y)]
+
+    def center(self, i: int) -> tuple[int, int]:
+        return int(self.x[i]) + self.W // 2, int(self.y[i]) + self.H // 2
+
+    def clear_radius(self, centers: list[tuple[float, float]],
+                     radius: float) -> int:
+        """清除落在任一爆炸圆内的子弹（只压缩一次），返回清除数量"""
+        if not self.x or not centers:
+            return 0
+        r2 = radius * radius
+        keep = [True] * len(self.x)
+        for cx, cy in centers:
+            ox, oy = self.W // 2 - cx, self.H // 2 - cy
+            keep = [k and (int(x) + ox) ** 2 + (int(y) + oy) ** 2 > r2
+                    for k, x, y in zip(keep, self.x, self.y)]
+        removed = keep.count(False)
+        if removed:
+            self._compact(keep)
+        return removed
+
+    def _sprite(self, is_boss: int) -> pygame.Surface:
+        s = self._sprites.get(is_boss)
+        if s is None:
+            w, h, px = self.W, self.H, pa.PX
+            s = pygame.Surface((w, h))
+            if is_boss:
+                s.fill(pa.BOSS_BULLET_COLOR)
+                pygame.draw.rect(s, pa.BOSS_BULLET_CORE, (w // 2 - 1, 0, 2, h))
+            else:
+                s.fill(pa.ENEMY_BULLET_CORE)
+                pygame.draw.rect(s, pa.ENEMY_BULLET_TIP, (0, h - px, w, px))
+                pygame.draw.rect(s, pa.WHITE, (w // 2 - 1, 0, 2, px))
+            self._sprites[is_boss] = s
+        return s
+
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
+        if not self.x:
+            return
+        sprites = (self._sprite(0), self._sprite(1))
+        glow_alpha = int(30 + 15 * math.sin(pygame.time.get_ticks() / 100.0))
+        glow = pa.alpha_rect((self.W + 4, self.H + 4), pa.BOSS_BULLET_COLOR,
+                             glow_alpha)
+        if alpha >= 1.0:
+            xs, ys = self.x, self.y
+        else:
+            xs = [p + (c - p) * alpha for p, c in zip(self.prev_x, self.x)]
+            ys = [p + (c - p) * alpha for p, c in zip(self.prev_y, self.y)]
+        seq = []
+        show_glow = quality.glow
+        for fx, fy, is_boss in zip(xs, ys, self.boss):
+            x, y = int(fx), int(fy)
+            seq.append((sprites[is_boss], (x, y)))
+            if is_boss and show_glow:
+                seq.append((glow, (x - 2, y - 2)))
+        surface.blits(seq, False)
@@ -0,0 +1,94 @@
+"""
+碰撞宽相：均匀网格空间哈希
+每个逻辑帧按实体 rect 重建；查询结果按插入顺序返回，
+因此"取第一个命中"的逻辑与逐对 colliderect 的结果完全一致
+"""
+CELL_SIZE = 64
+
+
+class SpatialHash:
+    """把带 rect 的对象按所覆盖的网格单元分桶"""
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.items: list = []
+
+    def build(self, items: list) -> None:
+        """用 items 重建网格（保留对列表的引用，查询时按下标回查）"""
+        cells: dict[tuple[int, int], list[int]] = {}
+        cs = self.cell_size
+        for idx, obj in enumerate(items):
+            r = obj.rect
+            x0, x1 = r.left // cs, (r.right - 1) // cs
+            y0, y1 = r.top // cs, (r.bottom - 1) // cs
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [idx]
+                    else:
+                        bucket.append(idx)
+        self.cells = cells
+        self.items = items
+
+    def query_indices(self, rect) -> list[int]:
+        """返回与 rect 相交对象的下标（升序）"""
+        x, y, w, h = rect
+        if w <= 0 or h <= 0 or not self.cells:
+            return []
+        cs = self.cell_size
+        cells = self.cells
+        items = self.items
+        x0, x1 = x // cs, (x + w - 1) // cs
+        y0, y1 = y // cs, (y + h - 1) // cs
+        if x0 == x1 and y0 == y1:
+            bucket = cells.get((x0, y0))
+            if not bucket:
+                return []
+            return [i for i in bucket if items[i].rect.colliderect(rect)]
+        found: set[int] = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return [i for i in sorted(found) if items[i].rect.colliderect(rect)]
+
+    def query_radius(self, cx: float, cy: float, radius: float) -> list[int]:
+        """返回中心点落在圆内的对象下标（升序）"""
+        if not self.cells:
+            return []
+        cs = self.cell_size
+        cells = self.cells
+        items = self.items
+        found: set[int] = set()
+        # 中心在圆内的对象，其 rect 必然覆盖圆的外接正方形内的某个单元
+        for gx in range(int(cx - radius) // cs, int(cx + radius) // cs + 1):
+            for gy in range(int(cy - radius) // cs, int(cy + radius) // cs + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    found.update(bucket)
+        r2 = radius * radius
+        hits = []
+        for i in sorted(found):
+            r = items[i].rect
+            dx = r.centerx - cx
+            dy = r.centery - cy
+            if dx * dx + dy * dy <= r2:
+                hits.append(i)
+        return hits
+
+    def query(self, rect) -> list:
+        """返回与 rect 相交的对象（按插入顺序）"""
+        items = self.items
+        return [items[i] for i in self.query_indices(rect)]
+
+    def first(self, rect, skip: set | None = None):
+        """返回第一个与 rect 相交且不在 skip 中的对象，没有则返回 None"""
+        items = self.items
+        for i in self.query_indices(rect):
+            obj = items[i]
+            if not skip or obj not in skip:
+                return obj
+        return None
@@ -0,0 +1,153 @@
+"""
+背景合成：渐变 + 关卡色调按关卡烘焙一次，逐帧只需一次不透明 blit
+Boss 警告闪屏使用一张常驻的不透明红色表面，透明度查预计算的脉冲表
+帧后处理：扫描线（可选策略）+ 屏幕震动（scroll 原地平移）
+"""
+import math
+import time
+
+import pygame
+
+import formats
+import pixel_art as pa
+import settings
+
+TINT_ALPHA = 35
+FLASH_COLOR = (255, 0, 0)
+FLASH_MAX_ALPHA = 40
+FLASH_PERIOD_MS = 80.0 * math.pi  # |sin(t / 80)| 的周期
+FLASH_STEPS = 64
+
+
+class BackgroundCompositor:
+    """持有烘焙好的关卡背景与警告闪屏层"""
+
+    def __init__(self, gradient: pygame.Surface, tints=settings.LEVEL_TINTS):
+        self.gradient = gradient
+        self.tints = tints
+        self.scanlines: pygame.Surface | None = None
+        self._baked: pygame.Surface | None = None
+        self._baked_idx = -1
+        self._flash: pygame.Surface | None = None
+        self._flash_alpha = -1
+        self.flash_ramp = [
+            int(abs(math.sin(math.pi * i / FLASH_STEPS)) * FLASH_MAX_ALPHA)
+            for i in range(FLASH_STEPS)
+        ]
+
+    def background(self, level: int) -> pygame.Surface:
+        """当前关卡的背景；换关时重新烘焙（只保留一张，节省内存）"""
+        idx = (level - 1) % len(self.tints)
+        if idx != self._baked_idx:
+            baked = self.gradient.copy()
+            tint = pygame.Surface(baked.get_size(), pygame.SRCALPHA)
+            tint.fill((*self.tints[idx], TINT_ALPHA))
+            baked.blit(tint, (0, 0))
+            if self.scanlines is not None:
+                baked.blit(self.scanlines, (0, 0))
+            self._baked = baked
+            self._baked_idx = idx
+        return self._baked
+
+    def set_scanlines(self, scanlines: pygame.Surface | None) -> None:
+        """烘焙进背景的扫描线层（None 为不烘焙）；变化时下次重新烘焙"""
+        if scanlines is not self.scanlines:
+            self.scanlines = scanlines
+            self._baked_idx = -1
+
+    def draw_background(self, surface: pygame.Surface, level: int) -> None:
+        surface.blit(self.background(level), (0, 0))
+
+    def flash_alpha(self, ticks: int) -> int:
+        phase = (ticks % FLASH_PERIOD_MS) / FLASH_PERIOD_MS
+        return self.flash_ramp[int(phase * FLASH_STEPS) % FLASH_STEPS]
+
+    def draw_warning_flash(self, surface: pygame.Surface, ticks: int) -> None:
+        alpha = self.flash_alpha(ticks)
+        if alpha <= 0:
+            return
+        if self._flash is None:
+            self._flash = pygame.Surface(self.gradient.get_size())
+            self._flash.fill(FLASH_COLOR)
+        if alpha != self._flash_alpha:
+            self._flash.set_alpha(alpha)
+            self._flash_alpha = alpha
+        surface.blit(self._flash, (0, 0))
+
+
+# 扫描线策略:
+#   overlay  每帧叠加整屏 alpha 层（原始做法，最贵）
+#   mult     每帧以 BLEND_MULT 乘一张不透明层，效果等同 overlay
+#   baked    烘焙进关卡背景，逐帧零开销，但精灵上没有扫描线
+#   off      关闭
+SCANLINE_MODES = ("overlay", "mult", "baked", "off")
+
+
+class PostProcessor:
+    """帧后处理：直接在显示表面上叠加扫描线并施加震动，不再经过整屏中转表面"""
+
+    def __init__(self, size: tuple[int, int], mode: str = settings.SCANLINE_MODE,
+                 background: BackgroundCompositor | None = None,
+                 alpha: int = settings.SCANLINE_ALPHA):
+        self.size = size
+        self.alpha = alpha
+        self.background = background
+        self._overlay: pygame.Surface | None = None
+        self._mult: pygame.Surface | None = None
+        # 策略 -> [累计秒数, 帧数]
+        self.timings = {m: [0.0, 0] for m in SCANLINE_MODES}
+        self.mode = ""
+        self.set_mode(mode)
+
+    def overlay(self) -> pygame.Surface:
+        if self._overlay is None:
+            self._overlay = formats.optimize(pa.create_scanlines(*self.size, self.alpha))
+        return self._overlay
+
+    def mult(self) -> pygame.Surface:
+        if self._mult is None:
+            self._mult = formats.optimize(pa.create_scanlines_mult(*self.size, self.alpha))
+        return self._mult
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in SCANLINE_MODES:
+            raise ValueError(f"unknown scanline mode: {mode}")
+        self.mode = mode
+        if self.background is not None:
+            self.background.set_scanlines(self.overlay() if mode == "baked" else None)
+
+    def draw_scanlines(self, surface: pygame.Surface, baked: bool = True) -> None:
+        """baked 为 False 表示 surface 的背景未烘焙扫描线（如菜单界面），此时改用乘法层"""
+        mode = self.mode
+        if mode == "mult" or (mode == "baked" and not baked):
+            surface.blit(self.mult(), (0, 0), special_flags=pygame.BLEND_MULT)
+        elif mode == "overlay":
+            surface.blit(self.overlay(), (0, 0))
+
+    def apply(self, surface: pygame.Surface, offset: tuple[int, int]) -> None:
+        """叠加扫描线并按 offset 原地平移画面，露出的边带填黑"""
+        t0 = time.perf_counter()
+        self.draw_scanlines(surface)
+        shake(surface, *offset)
+        rec = self.timings[self.mode]
+        rec[0] += time.perf_counter() - t0
+        rec[1] += 1
+
+    def stats(self) -> dict[str, float]:
+        """各策略实际运行过的平均耗时（毫秒/帧）"""
+        return {m: total / n * 1000 for m, (total, n) in self.timings.items() if n}
+
+
+def shake(surface: pygame.Surface, dx: int, dy: int) -> None:
+    if not dx and not dy:
+        return
+    w, h = surface.get_size()
+    surface.scroll(dx, dy)
+    if dx > 0:
+        surface.fill((0, 0, 0), (0, 0, dx, h))
+    elif dx < 0:
+        surface.fill((0, 0, 0), (w + dx, 0, -dx, h))
+    if dy > 0:
+        surface.fill((0, 0, 0), (0, 0, w, dy))
+    elif dy < 0:
+        surface.fill((0, 0, 0), (0, h + dy, w, -dy))
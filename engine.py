@@ -0,0 +1,695 @@
+"""
+游戏模拟核心：实体列表、刷怪、碰撞、计分与生命
+与显示、时钟和事件队列完全解耦，可在无窗口环境下以远超实时的速度运行
+"""
+import math
+import random
+
+import pixel_art as pa
+import settings
+from bullets import BulletPool, EnemyBulletField
+from collision import SpatialHash
+from particles import (
+    ParticleSystem, emit_explosion, emit_exhaust, emit_missile_blast,
+    emit_sparks, emit_thrust,
+)
+from pools import EntityList, acquire
+from sprites import (
+    Boss, Enemy, Explosion, FloatingText,
+    Missile, MissileExplosion, Player, PowerUp, ScreenShake,
+)
+
+
+def get_spawn_interval(score: int) -> int:
+    step = score // settings.DIFFICULTY_SCORE_STEP
+    interval = settings.INITIAL_SPAWN_INTERVAL - step * 4
+    return max(settings.MIN_SPAWN_INTERVAL, interval)
+
+
+def spawn_enemy(screen_width: int) -> Enemy:
+    r = random.random()
+    if r < 0.4:
+        return Enemy(screen_width, "medium")
+    if r < 0.75:
+        return Enemy(screen_width, "small")
+    return Enemy(screen_width, "large")
+
+
+def spawn_formation(screen_width: int) -> list[Enemy]:
+    """生成编队敌机"""
+    pattern = random.choice(["v", "line", "diagonal"])
+    etype = random.choice(["small", "medium"])
+    count = random.randint(3, 5)
+    enemies = []
+    cx = random.randint(80, screen_width - 80)
+    for i in range(count):
+        e = Enemy(screen_width, etype)
+        if pattern == "v":
+            offset = (i - count // 2) * 40
+            e.rect.x = max(0, min(screen_width - e.width, cx + offset))
+            e.rect.y = -(abs(i - count // 2) * 30 + e.height)
+        elif pattern == "line":
+            spacing = screen_width // (count + 1)
+            e.rect.x = spacing * (i + 1) - e.width // 2
+            e.rect.y = -e.height - random.randint(0, 10)
+        else:
+            e.rect.x = max(0, min(screen_width - e.width, cx + i * 35))
+            e.rect.y = -(i * 25 + e.height)
+        enemies.append(e)
+    return enemies
+
+
+def spawn_powerup(x: int, y: int) -> PowerUp:
+    ptype = random.choice(settings.POWERUP_TYPES)
+    return acquire(PowerUp, x, y, ptype, settings.POWERUP_SPEED)
+
+
+def fire_bullets(player: Player, bullets: BulletPool, kills: int = 0,
+                 level: int = 1) -> None:
+    by = player.rect.top
+    cx = player.rect.centerx
+    bt = player.bullet_type
+    style = player.bullet_style
+    if bt == "normal" and kills >= settings.DOUBLE_SHOT_UNLOCK:
+        bt = "double"
+
+    spd = 13
+    w, h = (3, 18) if style == "laser" else (8, 14) if style == "plasma" else (5, 14) if style == "electric" else (4, 12)
+
+    level_bonus = min(level - 1, 5)
+
+    if bt == "fan10":
+        count = 10 + level_bonus
+        half_angle = 0.55 + level_bonus * 0.03
+        for i in range(count):
+            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
+            vx = math.cos(angle) * spd
+            vy = math.sin(angle) * spd
+            bullets.spawn(cx - w // 2, by, w, h, style, vx, vy)
+    elif bt == "fan7":
+        count = 7 + level_bonus
+        half_angle = 0.45 + level_bonus * 0.02
+        for i in range(count):
+            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
+            vx = math.cos(angle) * spd
+            vy = math.sin(angle) * spd
+            bullets.spawn(cx - w // 2, by, w, h, style, vx, vy)
+    elif bt == "fan5":
+        count = 5 + level_bonus
+        half_angle = 0.35 + level_bonus * 0.02
+        for i in range(count):
+            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
+            vx = math.cos(angle) * spd
+            vy = math.sin(angle) * spd
+            bullets.spawn(cx - w // 2, by, w, h, style, vx, vy)
+    elif bt == "triple":
+        count = 3 + min(level_bonus, 3)
+        half_angle = 0.2 + level_bonus * 0.015
+        for i in range(count):
+            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
+            vx = math.cos(angle) * spd
+            vy = math.sin(angle) * spd
+            bullets.spawn(cx - w // 2, by, w, h, style, vx, vy)
+    elif bt == "double":
+        for ox in (-8, 4):
+            bullets.spawn(cx + ox - w // 2, by, w, h, style, 0.0, -spd)
+        if level_bonus >= 2:
+            for angle_off in [-0.15, 0.15]:
+                angle = -math.pi / 2 + angle_off
+                vx = math.cos(angle) * spd
+                vy = math.sin(angle) * spd
+                bullets.spawn(cx - w // 2, by, w, h, style, vx, vy)
+    else:
+        bullets.spawn(cx - w // 2, by, w, h, style, 0.0, -spd)
+
+
+def _boss_fire(boss: Boss, enemy_bullets: EnemyBulletField,
+               players: list[Player], lives_list: list[int], level: int) -> None:
+    """Boss发射子弹 — 根据关卡使用不同弹幕模式"""
+    alive = [(i, p) for i, p in enumerate(players) if lives_list[i] > 0]
+    if not alive:
+        return
+
+    _, target = random.choice(alive)
+    dx = target.rect.centerx - boss.rect.centerx
+    dy = target.rect.centery - boss.rect.bottom
+    base_angle = math.atan2(dy, dx)
+    spd = settings.BOSS_BULLET_SPEED + level * 0.25
+    phase = boss.attack_phase
+
+    def _fan(count, spread, aimed=True):
+        ang = base_angle if aimed else math.pi / 2
+        for i in range(count):
+            offset = (i - (count - 1) / 2) * (spread / max(1, count - 1))
+            a = ang + offset
+            enemy_bullets.spawn(
+                boss.rect.centerx, boss.rect.bottom,
+                math.cos(a) * spd, math.sin(a) * spd, True)
+
+    def _circle(count, speed_mult=1.0):
+        for i in range(count):
+            a = 2 * math.pi * i / count
+            enemy_bullets.spawn(
+                boss.rect.centerx, boss.rect.centery,
+                math.cos(a) * spd * speed_mult,
+                math.sin(a) * spd * speed_mult, True)
+
+    def _spiral(count, offset_angle=0):
+        for i in range(count):
+            a = offset_angle + (2 * math.pi * i / count)
+            enemy_bullets.spawn(
+                boss.rect.centerx, boss.rect.centery,
+                math.cos(a) * spd * 0.8,
+                math.sin(a) * spd * 0.8, True)
+
+    if level == 1:
+        _fan(3 + phase % 2, 0.6)
+    elif level == 2:
+        if phase % 2 == 0:
+            _fan(5, 0.8)
+        else:
+            _circle(8)
+    elif level == 3:
+        if phase % 3 == 0:
+            _fan(7, 1.0)
+        elif phase % 3 == 1:
+            _circle(10)
+        else:
+            _fan(5, 0.5)
+            for ox in [-30, 30]:
+                enemy_bullets.spawn(
+                    boss.rect.centerx + ox, boss.rect.bottom,
+                    0.0, spd * 1.2, True)
+    elif level == 4:
+        if phase % 3 == 0:
+            _fan(9, 1.2)
+        elif phase % 3 == 1:
+            _circle(14)
+        else:
+            _spiral(10, boss.pattern_timer * 0.05)
+    elif level == 5:
+        if phase % 4 == 0:
+            _fan(11, 1.4)
+        elif phase % 4 == 1:
+            _circle(16, 0.9)
+            _circle(8, 1.3)
+        elif phase % 4 == 2:
+            _spiral(12, boss.pattern_timer * 0.08)
+        else:
+            _fan(7, 0.8)
+            for ox in [-40, -20, 20, 40]:
+                enemy_bullets.spawn(
+                    boss.rect.centerx + ox, boss.rect.bottom,
+                    0.0, spd * 1.1, True)
+    else:
+        if phase % 4 == 0:
+            _fan(13 + level, 1.6)
+        elif phase % 4 == 1:
+            _circle(18 + level, 0.85)
+            _circle(10, 1.4)
+        elif phase % 4 == 2:
+            _spiral(14 + level, boss.pattern_timer * 0.1)
+            _fan(5, 0.4)
+        else:
+            _circle(20 + level)
+            for ox in [-50, -25, 0, 25, 50]:
+                enemy_bullets.spawn(
+                    boss.rect.centerx + ox, boss.rect.bottom,
+                    ox * 0.02, spd * 1.3, True)
+
+
+def _add_score_text(floating_texts: list, x: int, y: int,
+                    pts: int, multiplier: int) -> None:
+    if multiplier >= 8:
+        color = pa.GOLD
+        size = 22
+    elif multiplier >= 5:
+        color = pa.CYAN
+        size = 20
+    elif multiplier >= 3:
+        color = pa.ORANGE
+        size = 18
+    else:
+        color = pa.YELLOW
+        size = 16
+    text = f"+{pts}"
+    if multiplier > 1:
+        text += f" x{multiplier}"
+    floating_texts.append(acquire(FloatingText, x, y, text, color, 45, size))
+
+
+_BULLET_LEVELS = [
+    ("normal", "normal"), ("double", "normal"),
+    ("triple", "normal"), ("fan5", "normal"),
+    ("fan7", "normal"), ("fan7", "laser"),
+    ("fan10", "normal"), ("fan10", "laser"),
+    ("fan10", "plasma"), ("fan10", "electric"),
+]
+
+
+class PlayerInput:
+    """单个玩家一帧的输入：移动方向 / 触控目标 / 开火 / 导弹"""
+
+    def __init__(self, move: tuple[int, int] = (0, 0),
+                 touch_target: tuple[float, float] | None = None,
+                 fire: bool = False, missile: bool = False):
+        self.move = move
+        self.touch_target = touch_target
+        self.fire = fire
+        self.missile = missile
+
+
+class GameState:
+    """一局游戏的全部模拟状态，step() 推进一个逻辑帧"""
+
+    def __init__(self, two_player: bool = False,
+                 screen_width: int = settings.SCREEN_WIDTH,
+                 screen_height: int = settings.SCREEN_HEIGHT):
+        self.sw = screen_width
+        self.sh = screen_height
+
+        self.players = [Player(screen_width, screen_height, 1, two_player)]
+        if two_player:
+            self.players.append(Player(screen_width, screen_height, 2, two_player))
+            self.players[0].rect.x = screen_width // 4 - 25
+            self.players[1].rect.x = screen_width * 3 // 4 - 25
+        for p in self.players:
+            p.invincible = True
+            p.invincible_timer = settings.INVINCIBILITY_FRAMES
+
+        self.bullets = BulletPool()
+        self.enemy_bullets = EnemyBulletField()
+        self.enemies: EntityList = EntityList()
+        self.explosions: EntityList = EntityList()
+        self.missiles: list[tuple[Missile, int]] = []
+        self.powerups: EntityList = EntityList()
+        self.floating_texts: EntityList = EntityList()
+        self.particles = ParticleSystem(settings.PARTICLE_BUDGET)
+        self.boss: Boss | None = None
+
+        self.score = 0
+        self.kills = 0
+        self.total_kills = 0
+        self.level = 1
+        self.lives_list = [settings.PLAYER_LIVES] * len(self.players)
+        self.fire_cooldowns = [0] * len(self.players)
+        self.missile_cooldowns = [0] * len(self.players)
+        self.enemy_spawn_timer = 0
+        self.formation_timer = 0
+
+        self.combo_count = 0
+        self.combo_timer = 0
+        self.max_combo = 0
+        self.shake = ScreenShake()
+
+        self.boss_warning_timer = 0
+        self.boss_warning_active = False
+        self.level_clear_timer = 0
+
+        self.tick = 0
+        self.game_over = False
+
+        self._grid = SpatialHash()
+        self._killed: set[Enemy] = set()
+
+    def is_alive(self, i: int) -> bool:
+        return self.lives_list[i] > 0
+
+    def step(self, inputs: list[PlayerInput]) -> None:
+        """推进一个逻辑帧；inputs 与 players 一一对应"""
+        if self.game_over:
+            return
+        self.tick += 1
+        self._save_prev()
+
+        for i in range(len(self.fire_cooldowns)):
+            if self.fire_cooldowns[i] > 0:
+                self.fire_cooldowns[i] -= 1
+            if self.missile_cooldowns[i] > 0:
+                self.missile_cooldowns[i] -= 1
+
+        if self.combo_timer > 0:
+            self.combo_timer -= 1
+            if self.combo_timer <= 0:
+                self.combo_count = 0
+
+        self.shake.update()
+
+        self._update_players(inputs)
+        self._update_level()
+        self._update_entities()
+        self._update_missiles()
+        self._update_effects()
+        self._collide_bullets()
+        self._check_boss_dead()
+        self._collect_powerups()
+        self._collide_players()
+
+        if all(lv <= 0 for lv in self.lives_list):
+            self.game_over = True
+
+    def _save_prev(self) -> None:
+        """记录上一帧位置，供渲染插值使用"""
+        self.bullets.save_prev()
+        self.enemy_bullets.save_prev()
+        for group in (self.players,
+                      self.enemies, self.powerups):
+            for e in group:
+                e.save_prev()
+        for m, _ in self.missiles:
+            m.save_prev()
+        if self.boss:
+            self.boss.save_prev()
+
+    # ── 玩家 ────────────────────────────────────
+
+    def _update_players(self, inputs: list[PlayerInput]) -> None:
+        for i, p in enumerate(self.players):
+            if not self.is_alive(i):
+                continue
+            inp = inputs[i] if i < len(inputs) else PlayerInput()
+            if p.update(move=inp.move, touch_target=inp.touch_target):
+                emit_thrust(self.particles, p.rect.centerx, p.rect.bottom)
+
+        for i, p in enumerate(self.players):
+            if not self.is_alive(i):
+                continue
+            inp = inputs[i] if i < len(inputs) else PlayerInput()
+            if inp.fire and self.fire_cooldowns[i] <= 0:
+                fire_bullets(p, self.bullets, self.kills, self.level)
+                self.fire_cooldowns[i] = settings.FIRE_COOLDOWN
+            if inp.missile and self.missile_cooldowns[i] <= 0:
+                m = Missile(p.rect.centerx, p.rect.top, settings.MISSILE_SPEED)
+                self.missiles.append((m, i))
+                self.missile_cooldowns[i] = settings.MISSILE_COOLDOWN
+
+    def _damage_player(self, i: int) -> None:
+        p = self.players[i]
+        if p.shield_timer > 0:
+            p.shield_timer = 0
+            self.shake.trigger(3, 6)
+        else:
+            self.lives_list[i] -= 1
+            self.shake.trigger(6, 12)
+            if self.lives_list[i] > 0:
+                p.hit(settings.INVINCIBILITY_FRAMES)
+
+    # ── 关卡 / Boss / 刷怪 ──────────────────────
+
+    def _update_level(self) -> None:
+        if self.level_clear_timer > 0:
+            self.level_clear_timer -= 1
+            if self.level_clear_timer <= 0:
+                self.level += 1
+
+        if self.boss_warning_active:
+            self.boss_warning_timer -= 1
+            if self.boss_warning_timer <= 0:
+                self.boss_warning_active = False
+                self.boss = Boss(self.sw, self.sh, self.level)
+                self.shake.trigger(6, 15)
+        elif self.boss:
+            self.boss.update()
+            fire_interval = max(20, settings.BOSS_FIRE_INTERVAL - self.level * 3)
+            if self.boss.should_fire(fire_interval):
+                self.boss.reset_fire_timer()
+                _boss_fire(self.boss, self.enemy_bullets, self.players,
+                           self.lives_list, self.level)
+        elif self.level_clear_timer <= 0:
+            if self.score >= self.level * settings.BOSS_SCORE_THRESHOLD:
+                self.boss_warning_active = True
+                self.boss_warning_timer = 120
+
+        if not self.boss and not self.boss_warning_active and self.level_clear_timer <= 0:
+            interval = get_spawn_interval(self.score + self.level * 5)
+            self.enemy_spawn_timer += 1
+            if self.enemy_spawn_timer >= interval:
+                self.enemies.append(spawn_enemy(self.sw))
+                self.enemy_spawn_timer = 0
+
+            self.formation_timer += 1
+            if self.formation_timer >= 400 + random.randint(0, 200):
+                self.enemies.extend(spawn_formation(self.sw))
+                self.formation_timer = 0
+
+    # ── 移动 ────────────────────────────────────
+
+    def _update_entities(self) -> None:
+        self.bullets.update(self.sw, self.sh)
+
+        for enemy in self.enemies:
+            enemy.update()
+            if enemy.fire_timer >= settings.ENEMY_FIRE_INTERVAL:
+                enemy.fire_timer = 0
+                self.enemy_bullets.spawn(
+                    enemy.rect.centerx, enemy.rect.bottom,
+                    0.0, settings.ENEMY_BULLET_SPEED,
+                )
+        self.enemies.sweep(lambda enemy: enemy.is_off_screen(self.sh))
+
+        self.enemy_bullets.update(self.sw, self.sh)
+
+        for pu in self.powerups:
+            pu.update()
+        self.powerups.sweep(lambda pu: pu.is_off_screen(self.sh))
+
+    def _explode(self, x: int, y: int, duration: int = 16) -> None:
+        self.explosions.append(acquire(Explosion, x, y, duration))
+        emit_explosion(self.particles, x, y, duration)
+
+    def _register_kill(self, enemy: Enemy) -> int:
+        """连杀计数与计分，返回本次得分"""
+        self.combo_count += 1
+        self.combo_timer = settings.COMBO_WINDOW
+        self.max_combo = max(self.max_combo, self.combo_count)
+        multiplier = min(self.combo_count, settings.COMBO_MAX)
+        pts = enemy.points * multiplier
+        self.score += pts
+        self.kills += 1
+        self.total_kills += 1
+        _add_score_text(self.floating_texts, enemy.rect.centerx,
+                        enemy.rect.centery, pts, multiplier)
+        return pts
+
+    def _register_kills(self, killed: list[Enemy]) -> tuple[int, int]:
+        """批量计分：连杀倍率逐个递增至上限，返回 (总得分, 最终倍率)"""
+        start = self.combo_count
+        cap = settings.COMBO_MAX
+        pts = sum(e.points * min(start + k, cap)
+                  for k, e in enumerate(killed, 1))
+        self.combo_count = start + len(killed)
+        self.combo_timer = settings.COMBO_WINDOW
+        self.max_combo = max(self.max_combo, self.combo_count)
+        self.score += pts
+        self.kills += len(killed)
+        self.total_kills += len(killed)
+        return pts, min(self.combo_count, cap)
+
+    def _update_missiles(self) -> None:
+        """本帧所有导弹的爆炸合并结算：一次建网格，按半径查询，副作用批量处理"""
+        blasts: list[tuple[int, int]] = []
+        remaining = []
+        for entry in self.missiles:
+            m = entry[0]
+            if m.update(self.sh):
+                blasts.append(m.explosion_pos)
+            else:
+                emit_exhaust(self.particles, *m.exhaust_pos)
+                remaining.append(entry)
+        if not blasts:
+            return
+        self.missiles = remaining
+        radius = settings.MISSILE_RADIUS
+        for ex, ey in blasts:
+            self.explosions.append(acquire(MissileExplosion, ex, ey, radius))
+            emit_missile_blast(self.particles, ex, ey, radius)
+        self.shake.trigger(8, 18)
+
+        if self.enemies:
+            grid = self._grid
+            grid.build(self.enemies)
+            claimed: set[int] = set()
+            for ex, ey in blasts:
+                hits = [i for i in grid.query_radius(ex, ey, radius)
+                        if i not in claimed]
+                if not hits:
+                    continue
+                claimed.update(hits)
+                killed = [self.enemies[i] for i in hits]
+                pts, multiplier = self._register_kills(killed)
+                _add_score_text(self.floating_texts, ex, ey, pts, multiplier)
+                for enemy in killed:
+                    cx, cy = enemy.rect.center
+                    self._explode(cx, cy, 16)
+                    if random.random() < settings.POWERUP_DROP_CHANCE:
+                        self.powerups.append(spawn_powerup(cx, cy))
+            if claimed:
+                self.enemies.remove_indices(claimed)
+
+        self.enemy_bullets.clear_radius(blasts, radius)
+
+        boss = self.boss
+        if boss:
+            r2 = radius * radius
+            bx, by = boss.rect.center
+            hits = sum(1 for ex, ey in blasts
+                       if (bx - ex) ** 2 + (by - ey) ** 2 <= r2)
+            if hits:
+                boss.take_damage(settings.MISSILE_BOSS_DAMAGE * hits)
+                self.shake.trigger(6, 12)
+                for _ in range(5 * hits):
+                    self._explode(bx + random.randint(-30, 30), by, 18)
+
+    def _update_effects(self) -> None:
+        self.explosions.sweep(lambda exp: exp.update())
+        self.particles.update()
+        self.floating_texts.sweep(lambda ft: ft.update())
+
+    # ── 碰撞 ────────────────────────────────────
+
+    def _collide_bullets(self) -> None:
+        """子弹 vs Boss / 敌机；敌机网格本帧内还供玩家撞机检测复用"""
+        bullets = self.bullets
+        bullets_to_remove: set[int] = set()
+        enemies_to_remove: set[Enemy] = set()
+        self._killed = enemies_to_remove
+        grid = self._grid
+        grid.build(self.enemies)
+        boss = self.boss
+        if boss:
+            for idx in boss.rect.collidelistall(bullets.rects()):
+                bullets_to_remove.add(idx)
+                boss.take_damage(1)
+                emit_sparks(self.particles, *bullets.center(idx))
+        elif self.enemies:
+            for idx, enemy in bullets.hit_first(grid):
+                bullets_to_remove.add(idx)
+                enemies_to_remove.add(enemy)
+                self._explode(enemy.rect.centerx, enemy.rect.centery)
+                emit_sparks(self.particles, *bullets.center(idx))
+                if random.random() < settings.POWERUP_DROP_CHANCE:
+                    self.powerups.append(spawn_powerup(enemy.rect.centerx, enemy.rect.centery))
+        bullets.remove(bullets_to_remove)
+        if enemies_to_remove:
+            killed = [e for e in self.enemies if e in enemies_to_remove]
+            self.enemies.sweep(enemies_to_remove.__contains__)
+            for enemy in killed:
+                self._register_kill(enemy)
+
+    def _check_boss_dead(self) -> None:
+        boss = self.boss
+        if not (boss and boss.is_dead):
+            return
+        bx, by = boss.rect.centerx, boss.rect.centery
+        for _ in range(12):
+            self._explode(bx + random.randint(-50, 50),
+                          by + random.randint(-35, 35),
+                          random.randint(18, 28))
+        self.shake.trigger(12, 25)
+        self.score += boss.points
+        self.floating_texts.append(acquire(
+            FloatingText, bx, by, f"BOSS +{boss.points}", pa.GOLD, 60, 22))
+        self.boss = None
+        self.level_clear_timer = 90
+
+    def _apply_powerup(self, p: Player, i: int, pu: PowerUp) -> None:
+        if pu.ptype == "bullet":
+            levels = _BULLET_LEVELS
+            cur = (p.bullet_type, p.bullet_style)
+            idx = next((j for j, L in enumerate(levels) if L == cur), 0)
+            nxt = levels[min(idx + 1, len(levels) - 1)]
+            if idx >= len(levels) - 1:
+                nxt = levels[6]
+            p.bullet_type, p.bullet_style = nxt
+            names = {"double": "双发!", "triple": "三连!",
+                     "fan5": "五连扇!", "fan7": "七连扇!",
+                     "fan10": "十连暴风!"}
+            label = names.get(nxt[0], "火力升级!")
+            if nxt[1] != "normal":
+                sn = {"laser": "激光", "plasma": "等离子", "electric": "雷电"}
+                label = sn.get(nxt[1], "") + "!"
+            self.floating_texts.append(acquire(
+                FloatingText, p.rect.centerx, p.rect.top - 10,
+                label, pa.GREEN, 40, 18))
+        elif pu.ptype == "life":
+            self.lives_list[i] += 1
+            self.floating_texts.append(acquire(
+                FloatingText, p.rect.centerx, p.rect.top - 10,
+                "+1 HP", pa.RED, 40, 16))
+        elif pu.ptype == "morph":
+            forms = ["normal", "agile", "heavy"]
+            idx = forms.index(p.plane_form)
+            p.apply_form(forms[(idx + 1) % 3])
+            form_names = {"normal": "标准", "agile": "疾速", "heavy": "重甲"}
+            self.floating_texts.append(acquire(
+                FloatingText, p.rect.centerx, p.rect.top - 10,
+                form_names[p.plane_form], pa.ORANGE, 40, 16))
+        elif pu.ptype == "shield":
+            p.shield_timer = settings.SHIELD_DURATION
+            self.floating_texts.append(acquire(
+                FloatingText, p.rect.centerx, p.rect.top - 10,
+                "护盾!", pa.SHIELD_BLUE, 40, 16))
+
+    def _collect_powerups(self) -> None:
+        if not self.powerups:
+            return
+        rects = [pu.rect for pu in self.powerups]
+        owner: dict[int, int] = {}
+        for i, p in enumerate(self.players):
+            if self.is_alive(i):
+                for idx in p.rect.collidelistall(rects):
+                    owner.setdefault(idx, i)
+        if not owner:
+            return
+        for idx in sorted(owner):
+            i = owner[idx]
+            self._apply_powerup(self.players[i], i, self.powerups[idx])
+        self.powerups.remove_indices(owner)
+
+    def _collide_players(self) -> None:
+        targets = [i for i, p in enumerate(self.players)
+                   if self.is_alive(i) and not p.invincible]
+        if not targets:
+            return
+        hit_taken = set()
+        if self.enemy_bullets:
+            rects = self.enemy_bullets.rects()
+            used: set[int] = set()
+            for i in targets:
+                p = self.players[i]
+                idx = next((j for j in p.rect.collidelistall(rects) if j not in used), -1)
+                if idx < 0:
+                    continue
+                used.add(idx)
+                if p.shield_timer > 0:
+                    bx, by = self.enemy_bullets.center(idx)
+                    emit_sparks(self.particles, bx, by, pa.SHIELD_BLUE)
+                    self.floating_texts.append(acquire(
+                        FloatingText, p.rect.centerx, p.rect.top - 10,
+                        "护盾抵挡!", pa.SHIELD_BLUE, 35, 14))
+                self._damage_player(i)
+                hit_taken.add(i)
+            self.enemy_bullets.remove(used)
+
+        if self.enemies:
+            # 复用子弹阶段建好的敌机网格，跳过本帧已被击毁的敌机
+            grid = self._grid
+            rammed: set[Enemy] = set(self._killed)
+            for i in targets:
+                if i in hit_taken:
+                    continue
+                enemy = grid.first(self.players[i].rect, rammed)
+                if enemy is None:
+                    continue
+                rammed.add(enemy)
+                self._explode(enemy.rect.centerx, enemy.rect.centery)
+                self._damage_player(i)
+                hit_taken.add(i)
+            if len(rammed) > len(self._killed):
+                self.enemies.sweep(rammed.__contains__)
+
+        boss = self.boss
+        if boss:
+            for i in targets:
+                if i not in hit_taken and self.players[i].rect.colliderect(boss.rect):
+                    self._damage_player(i)
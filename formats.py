@@ -0,0 +1,90 @@
+"""
+显示格式管理：显示表面建立后，缓存的表面统一转换成显示格式，并按像素内容选 blit 方式
+- 只有全透明 / 全不透明像素的像素画：不透明表面 + colorkey + RLEACCEL，blit 时整段跳过透明像素
+- 真正需要半透明的（光晕、半透明色块、触控按钮、扫描线叠加层）：convert_alpha
+- 不透明表面（背景渐变、乘法扫描线层、粒子色块）：convert
+RLE 编码的是表面自身的像素：图集页上的 subsurface 视图不继承父页面的 RLE，
+父页面一旦被 RLE 编码，从视图 blit 每次都要先解码整页（慢上百倍），所以转换结果总是独立表面
+"""
+import pygame
+
+# colorkey 候选色，取精灵中未出现的第一个
+COLORKEYS = ((255, 0, 255), (0, 255, 1), (1, 2, 3), (254, 1, 253))
+
+_counts = {"colorkey": 0, "alpha": 0, "opaque": 0}
+
+
+def ready() -> bool:
+    return pygame.display.get_surface() is not None
+
+
+def is_binary_alpha(surface: pygame.Surface) -> bool:
+    """每个像素要么全透明要么全不透明"""
+    alpha = pygame.image.tobytes(surface, "RGBA")[3::4]
+    return not alpha.translate(None, b"\x00\xff")
+
+
+def _has_pixel(rgba: bytes, pixel: bytes) -> bool:
+    i = rgba.find(pixel)
+    while i >= 0:
+        if i % 4 == 0:
+            return True
+        i = rgba.find(pixel, i + 1)
+    return False
+
+
+def pick_colorkey(surface: pygame.Surface, rgba: bytes | None = None) -> tuple | None:
+    """不透明像素中未出现的第一个候选色"""
+    if rgba is None:
+        rgba = pygame.image.tobytes(surface, "RGBA")
+    for key in COLORKEYS:
+        if not _has_pixel(rgba, bytes((*key, 255))):
+            return key
+    return None
+
+
+def to_colorkey(surface: pygame.Surface, key: tuple, rle: bool = True) -> pygame.Surface:
+    """二值透明的 SRCALPHA 表面 -> 显示格式的不透明表面 + colorkey"""
+    out = pygame.Surface(surface.get_size()).convert()
+    out.fill(key)
+    out.blit(surface, (0, 0))
+    out.set_colorkey(key, pygame.RLEACCEL if rle else 0)
+    return out
+
+
+def optimize(surface: pygame.Surface, rle: bool = True) -> pygame.Surface:
+    """返回转换后的新表面；显示表面尚未建立时原样返回"""
+    if not ready() or surface.get_bitsize() == 8:
+        # 8 位调色板精灵（settings.PALETTE_SPRITES）保持原样，转成 32 位就失去了省内存的意义
+        return surface
+    if not surface.get_flags() & pygame.SRCALPHA:
+        _counts["opaque"] += 1
+        return surface.convert()
+    rgba = pygame.image.tobytes(surface, "RGBA")
+    alpha = rgba[3::4]
+    if not alpha.translate(None, b"\xff"):
+        _counts["opaque"] += 1
+        return surface.convert()
+    if not alpha.translate(None, b"\x00\xff"):
+        key = pick_colorkey(surface, rgba)
+        if key is not None:
+            _counts["colorkey"] += 1
+            return to_colorkey(surface, key, rle)
+    _counts["alpha"] += 1
+    return surface.convert_alpha()
+
+
+def without_rle(surface: pygame.Surface) -> pygame.Surface:
+    """去掉 RLE 的独立副本，给每帧改 set_alpha 的表面用：
+    RLE 表面每次改 alpha 后下一次 blit 都要整面重新编码；copy() 会保留 RLE 标志，
+    先清掉 colorkey 再不带 RLEACCEL 重设才能去掉"""
+    out = surface.copy()
+    key = out.get_colorkey()
+    if key is not None:
+        out.set_colorkey(None)
+        out.set_colorkey(key)
+    return out
+
+
+def stats() -> dict[str, int]:
+    return dict(_counts)
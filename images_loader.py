@@ -9,7 +9,11 @@
 import os
 import pygame
 
-_images_cache: dict[str, pygame.Surface] = {}
+from assetcache import AssetCache
+
+IMAGE_CACHE_BYTES = 16 * 1024 * 1024
+
+_images_cache = AssetCache("images", IMAGE_CACHE_BYTES)
 _images_dir = ""
 
 
@@ -27,8 +31,9 @@ def _get_images_dir() -> str:
 
 
 def _load(path: str) -> pygame.Surface | None:
-    if path in _images_cache:
-        return _images_cache[path]
+    surf = _images_cache.get(path)
+    if surf is not None:
+        return surf
     if not os.path.isfile(path):
         return None
     try:
@@ -3,22 +3,32 @@
 支持 PC 键盘操作 和 安卓触屏操作
 """
 import math
+import multiprocessing
 import os
-import random
 import pygame
 import sys
+import time
 
+import assetcache
+import assets
+import formats
 import pixel_art as pa
+import quality
 import settings
-from sprites import (
-    Boss, Bullet, Enemy, EnemyBullet, Explosion, FloatingText,
-    HitSpark, Missile, MissileExplosion, Player, PowerUp,
-    ScreenShake, StarBackground,
-)
-from utils import get_font
+import spritecache
+import warmup
+from compositor import BackgroundCompositor, PostProcessor
+from engine import GameState, PlayerInput
+from sprites import StarBackground, all_sprite_keys
+from utils import SHADOW_OFFSET, get_font, render_text, warm_fonts
 
 IS_ANDROID = "ANDROID_ROOT" in os.environ or "ANDROID_STORAGE" in os.environ
 
+TITLE_SCENE_SIZE = (settings.SCREEN_WIDTH - 40, 130)
+
+# 连杀脉冲缩放的量化级数（每级 1/40），限制缓存的缩放文字数量
+COMBO_PULSE_STEPS = 40
+
 if IS_ANDROID:
     from touch_controls import TouchControls
 
@@ -49,73 +59,27 @@ def add_to_leaderboard(score: int) -> list[int]:
     return scores
 
 
-def get_spawn_interval(score: int) -> int:
-    step = score // settings.DIFFICULTY_SCORE_STEP
-    interval = settings.INITIAL_SPAWN_INTERVAL - step * 4
-    return max(settings.MIN_SPAWN_INTERVAL, interval)
-
-
-def spawn_enemy(screen_width: int) -> Enemy:
-    r = random.random()
-    if r < 0.4:
-        return Enemy(screen_width, "medium")
-    if r < 0.75:
-        return Enemy(screen_width, "small")
-    return Enemy(screen_width, "large")
-
-
-def spawn_formation(screen_width: int) -> list[Enemy]:
-    """生成编队敌机"""
-    pattern = random.choice(["v", "line", "diagonal"])
-    etype = random.choice(["small", "medium"])
-    count = random.randint(3, 5)
-    enemies = []
-    cx = random.randint(80, screen_width - 80)
-    for i in range(count):
-        e = Enemy(screen_width, etype)
-        if pattern == "v":
-            offset = (i - count // 2) * 40
-            e.rect.x = max(0, min(screen_width - e.width, cx + offset))
-            e.rect.y = -(abs(i - count // 2) * 30 + e.height)
-        elif pattern == "line":
-            spacing = screen_width // (count + 1)
-            e.rect.x = spacing * (i + 1) - e.width // 2
-            e.rect.y = -e.height - random.randint(0, 10)
-        else:
-            e.rect.x = max(0, min(screen_width - e.width, cx + i * 35))
-            e.rect.y = -(i * 25 + e.height)
-        enemies.append(e)
-    return enemies
-
-
-def spawn_powerup(x: int, y: int) -> PowerUp:
-    ptype = random.choice(settings.POWERUP_TYPES)
-    return PowerUp(x, y, ptype, settings.POWERUP_SPEED)
-
-
 def _draw_text_shadow(surface: pygame.Surface, font: pygame.font.Font,
                       text: str, color: tuple, x: int, y: int,
                       shadow_color: tuple = (0, 0, 0)) -> None:
-    shadow = font.render(text, False, shadow_color)
-    main = font.render(text, False, color)
-    surface.blit(shadow, (x + 2, y + 2))
-    surface.blit(main, (x, y))
+    surface.blit(render_text(font, text, color, shadow_color), (x, y))
 
 
 def _draw_text_center(surface: pygame.Surface, font: pygame.font.Font,
                       text: str, color: tuple, y: int,
                       shadow: bool = True) -> None:
-    main = font.render(text, False, color)
-    x = settings.SCREEN_WIDTH // 2 - main.get_width() // 2
     if shadow:
-        sh = font.render(text, False, (0, 0, 0))
-        surface.blit(sh, (x + 2, y + 2))
-    surface.blit(main, (x, y))
+        surf = render_text(font, text, color, (0, 0, 0))
+        w = surf.get_width() - SHADOW_OFFSET
+    else:
+        surf = render_text(font, text, color)
+        w = surf.get_width()
+    surface.blit(surf, (settings.SCREEN_WIDTH // 2 - w // 2, y))
 
 
 def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
                      clock: pygame.time.Clock, bg_grad: pygame.Surface,
-                     stars: StarBackground, scanlines: pygame.Surface) -> tuple[bool, bool]:
+                     stars: StarBackground, post: PostProcessor) -> tuple[bool, bool]:
     title_font = get_font(48)
     sub_font = get_font(20)
     info_font = get_font(16)
@@ -123,7 +87,7 @@ def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
     blink_timer = 0
 
     sw = settings.SCREEN_WIDTH
-    scene_w, scene_h = sw - 40, 130
+    scene_w, scene_h = TITLE_SCENE_SIZE
     scene_surf = pa.create_title_scene(scene_w, scene_h)
 
     prev_keys = pygame.key.get_pressed()
@@ -200,7 +164,7 @@ def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
             ]:
                 pygame.draw.rect(screen, color, (pu_x, row_y + 2, 10, 10))
                 pygame.draw.rect(screen, pa.WHITE, (pu_x, row_y + 2, 10, 10), 1)
-                txt = info_font.render(desc, False, pa.LIGHT_GRAY)
+                txt = render_text(info_font, desc, pa.LIGHT_GRAY)
                 screen.blit(txt, (pu_x + 16, row_y))
                 row_y += 22
             pygame.draw.rect(screen, pa.DARK_BLUE, (40, row_y + 4, sw - 80, 1))
@@ -246,7 +210,7 @@ def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
             ]:
                 pygame.draw.rect(screen, color, (pu_x, row_y + 2, 10, 10))
                 pygame.draw.rect(screen, pa.WHITE, (pu_x, row_y + 2, 10, 10), 1)
-                txt = info_font.render(desc, False, pa.LIGHT_GRAY)
+                txt = render_text(info_font, desc, pa.LIGHT_GRAY)
                 screen.blit(txt, (pu_x + 16, row_y))
                 row_y += 22
             pygame.draw.rect(screen, pa.DARK_BLUE, (40, row_y + 4, sw - 80, 1))
@@ -271,7 +235,7 @@ def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
             _draw_text_center(screen, info_font, "[ ESC 退出 ]",
                               (55, 55, 75), menu_y + 90 + 8)
 
-        screen.blit(scanlines, (0, 0))
+        post.draw_scanlines(screen, baked=False)
         pygame.display.flip()
         clock.tick(settings.FPS)
 
@@ -279,7 +243,7 @@ def run_start_screen(screen: pygame.Surface, font: pygame.font.Font,
 def run_game_over(
     screen: pygame.Surface, font: pygame.font.Font, score: int,
     leaderboard: list[int], clock: pygame.time.Clock,
-    bg_grad: pygame.Surface, scanlines: pygame.Surface,
+    bg_grad: pygame.Surface, stars: StarBackground, post: PostProcessor,
     total_kills: int = 0, max_combo: int = 0, level: int = 1,
 ) -> bool:
     big_font = get_font(42)
@@ -288,7 +252,6 @@ def run_game_over(
     stat_font = get_font(16)
     label_font = get_font(14)
     blink = 0
-    stars = StarBackground(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT, 60)
 
     while True:
         for e in pygame.event.get():
@@ -342,7 +305,7 @@ def run_game_over(
         stat_y += 24
         combo_color = pa.GOLD if max_combo >= 8 else pa.ORANGE if max_combo >= 5 else pa.LIGHT_GRAY
         combo_str = f"最大连杀: {max_combo}"
-        ct = stat_font.render(combo_str, False, combo_color)
+        ct = render_text(stat_font, combo_str, combo_color)
         screen.blit(ct, (sw // 2 - ct.get_width() // 2, stat_y))
         cy += stat_panel_h + 10
 
@@ -362,7 +325,7 @@ def run_game_over(
                 t = pygame.time.get_ticks()
                 color = pa.GOLD if (t // 300) % 2 == 0 else pa.YELLOW
                 entry += "  ← NEW"
-            txt = rank_font.render(entry, False, color)
+            txt = render_text(rank_font, entry, color)
             screen.blit(txt, (sw // 2 - txt.get_width() // 2, entry_y))
             entry_y += 26
         cy += lb_panel_h + 16
@@ -375,166 +338,160 @@ def run_game_over(
             _draw_text_center(screen, label_font,
                               "[ ESC 退出 ]", (55, 55, 75), cy)
 
-        screen.blit(scanlines, (0, 0))
+        post.draw_scanlines(screen, baked=False)
         pygame.display.flip()
         clock.tick(settings.FPS)
 
 
-def fire_bullets(player: Player, bullets: list, kills: int = 0,
-                 level: int = 1) -> None:
-    by = player.rect.top
-    cx = player.rect.centerx
-    bt = player.bullet_type
-    style = player.bullet_style
-    if bt == "normal" and kills >= settings.DOUBLE_SHOT_UNLOCK:
-        bt = "double"
-
-    spd = 13
-    w, h = (3, 18) if style == "laser" else (8, 14) if style == "plasma" else (5, 14) if style == "electric" else (4, 12)
-
-    level_bonus = min(level - 1, 5)
-
-    if bt == "fan10":
-        count = 10 + level_bonus
-        half_angle = 0.55 + level_bonus * 0.03
-        for i in range(count):
-            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
-            vx = math.cos(angle) * spd
-            vy = math.sin(angle) * spd
-            bullets.append(Bullet(cx - w // 2, by, w, h, spd, style, vx=vx, vy=vy))
-    elif bt == "fan7":
-        count = 7 + level_bonus
-        half_angle = 0.45 + level_bonus * 0.02
-        for i in range(count):
-            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
-            vx = math.cos(angle) * spd
-            vy = math.sin(angle) * spd
-            bullets.append(Bullet(cx - w // 2, by, w, h, spd, style, vx=vx, vy=vy))
-    elif bt == "fan5":
-        count = 5 + level_bonus
-        half_angle = 0.35 + level_bonus * 0.02
-        for i in range(count):
-            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
-            vx = math.cos(angle) * spd
-            vy = math.sin(angle) * spd
-            bullets.append(Bullet(cx - w // 2, by, w, h, spd, style, vx=vx, vy=vy))
-    elif bt == "triple":
-        count = 3 + min(level_bonus, 3)
-        half_angle = 0.2 + level_bonus * 0.015
-        for i in range(count):
-            angle = -math.pi / 2 + (-half_angle + 2 * half_angle * i / max(1, count - 1))
-            vx = math.cos(angle) * spd
-            vy = math.sin(angle) * spd
-            bullets.append(Bullet(cx - w // 2, by, w, h, spd, style, vx=vx, vy=vy))
-    elif bt == "double":
-        for ox in (-8, 4):
-            bullets.append(Bullet(cx + ox - w // 2, by, w, h, spd, style))
-        if level_bonus >= 2:
-            for angle_off in [-0.15, 0.15]:
-                angle = -math.pi / 2 + angle_off
-                vx = math.cos(angle) * spd
-                vy = math.sin(angle) * spd
-                bullets.append(Bullet(cx - w // 2, by, w, h, spd, style, vx=vx, vy=vy))
-    else:
-        bullets.append(Bullet(cx - w // 2, by, w, h, spd, style))
-
-
-def _boss_fire(boss: Boss, enemy_bullets: list, players: list[Player],
-               lives_list: list[int], level: int) -> None:
-    """Boss发射子弹 — 根据关卡使用不同弹幕模式"""
-    alive = [(i, p) for i, p in enumerate(players) if lives_list[i] > 0]
-    if not alive:
-        return
-
-    _, target = random.choice(alive)
-    dx = target.rect.centerx - boss.rect.centerx
-    dy = target.rect.centery - boss.rect.bottom
-    base_angle = math.atan2(dy, dx)
-    spd = settings.BOSS_BULLET_SPEED + level * 0.25
-    phase = boss.attack_phase
-
-    def _fan(count, spread, aimed=True):
-        ang = base_angle if aimed else math.pi / 2
-        for i in range(count):
-            offset = (i - (count - 1) / 2) * (spread / max(1, count - 1))
-            a = ang + offset
-            enemy_bullets.append(EnemyBullet(
-                boss.rect.centerx, boss.rect.bottom,
-                vx=math.cos(a) * spd, vy=math.sin(a) * spd, is_boss=True))
-
-    def _circle(count, speed_mult=1.0):
-        for i in range(count):
-            a = 2 * math.pi * i / count
-            enemy_bullets.append(EnemyBullet(
-                boss.rect.centerx, boss.rect.centery,
-                vx=math.cos(a) * spd * speed_mult,
-                vy=math.sin(a) * spd * speed_mult, is_boss=True))
-
-    def _spiral(count, offset_angle=0):
-        for i in range(count):
-            a = offset_angle + (2 * math.pi * i / count)
-            enemy_bullets.append(EnemyBullet(
-                boss.rect.centerx, boss.rect.centery,
-                vx=math.cos(a) * spd * 0.8,
-                vy=math.sin(a) * spd * 0.8, is_boss=True))
-
-    if level == 1:
-        _fan(3 + phase % 2, 0.6)
-    elif level == 2:
-        if phase % 2 == 0:
-            _fan(5, 0.8)
-        else:
-            _circle(8)
-    elif level == 3:
-        if phase % 3 == 0:
-            _fan(7, 1.0)
-        elif phase % 3 == 1:
-            _circle(10)
-        else:
-            _fan(5, 0.5)
-            for ox in [-30, 30]:
-                enemy_bullets.append(EnemyBullet(
-                    boss.rect.centerx + ox, boss.rect.bottom,
-                    vx=0, vy=spd * 1.2, is_boss=True))
-    elif level == 4:
-        if phase % 3 == 0:
-            _fan(9, 1.2)
-        elif phase % 3 == 1:
-            _circle(14)
-        else:
-            _spiral(10, boss.pattern_timer * 0.05)
-    elif level == 5:
-        if phase % 4 == 0:
-            _fan(11, 1.4)
-        elif phase % 4 == 1:
-            _circle(16, 0.9)
-            _circle(8, 1.3)
-        elif phase % 4 == 2:
-            _spiral(12, boss.pattern_timer * 0.08)
-        else:
-            _fan(7, 0.8)
-            for ox in [-40, -20, 20, 40]:
-                enemy_bullets.append(EnemyBullet(
-                    boss.rect.centerx + ox, boss.rect.bottom,
-                    vx=0, vy=spd * 1.1, is_boss=True))
-    else:
-        if phase % 4 == 0:
-            _fan(13 + level, 1.6)
-        elif phase % 4 == 1:
-            _circle(18 + level, 0.85)
-            _circle(10, 1.4)
-        elif phase % 4 == 2:
-            _spiral(14 + level, boss.pattern_timer * 0.1)
-            _fan(5, 0.4)
+def render_game(surface: pygame.Surface, state: GameState, stars: StarBackground,
+                background: BackgroundCompositor, font: pygame.font.Font,
+                hud_font: pygame.font.Font, alpha: float = 1.0) -> None:
+    """把当前模拟状态绘制到 surface（不含触控层与扫描线）
+    alpha 为上一逻辑帧到当前逻辑帧之间的插值系数"""
+    players = state.players
+    lives_list = state.lives_list
+    level = state.level
+
+    background.draw_background(surface, level)
+
+    stars.draw(surface)
+
+    for exp in state.explosions:
+        exp.draw(surface)
+    state.particles.draw(surface)
+    for m, _ in state.missiles:
+        m.draw(surface, alpha)
+    for pu in state.powerups:
+        pu.draw(surface, alpha)
+    for i, p in enumerate(players):
+        if lives_list[i] > 0:
+            p.draw(surface, alpha)
+    state.enemy_bullets.draw(surface, alpha)
+    for enemy in state.enemies:
+        enemy.draw(surface, alpha)
+    if state.boss:
+        state.boss.draw(surface, alpha)
+    state.bullets.draw(surface, alpha)
+    for ft in state.floating_texts:
+        ft.draw(surface)
+
+    px = pa.PX
+
+    _draw_text_shadow(surface, font,
+                      f"SCORE {state.score}", pa.WHITE, 10, 8)
+    _draw_text_shadow(surface, hud_font,
+                      f"Lv.{level}", pa.CYAN, 12, 36)
+
+    combo_count = state.combo_count
+    if combo_count >= 2:
+        combo_color = pa.GOLD if combo_count >= 8 else pa.ORANGE if combo_count >= 5 else pa.YELLOW
+        ticks = pygame.time.get_ticks()
+        pulse = 1.0 + 0.1 * math.sin(ticks / 100.0)
+        combo_text = f"COMBO x{combo_count}"
+        # 脉冲缩放用同一张缓存文字按量化比例缩放，不再按字号新建字体
+        scale = round(pulse * COMBO_PULSE_STEPS) / COMBO_PULSE_STEPS
+        combo = render_text(get_font(18), combo_text, combo_color,
+                            (0, 0, 0), scale)
+        surface.blit(combo, (12, 58))
+
+    if state.boss_warning_active:
+        ticks = pygame.time.get_ticks()
+        if (ticks // 100) % 2 == 0:
+            warn_font = get_font(36)
+            _draw_text_center(surface, warn_font,
+                              "⚠ WARNING ⚠", pa.RED,
+                              settings.SCREEN_HEIGHT // 2 - 40)
+        background.draw_warning_flash(surface, ticks)
+
+    if state.boss:
+        _draw_text_center(surface, font, "! BOSS !", pa.RED, 8)
+
+    if state.level_clear_timer > 0:
+        clear_font = get_font(32)
+        clear_alpha = min(255, state.level_clear_timer * 6)
+        clear_text = f"LEVEL {level} CLEAR!"
+        ct = render_text(clear_font, clear_text, pa.CYAN, (0, 0, 0))
+        cx = settings.SCREEN_WIDTH // 2 - (ct.get_width() - SHADOW_OFFSET) // 2
+        cy = settings.SCREEN_HEIGHT // 2 - 30
+        ct.set_alpha(clear_alpha)
+        surface.blit(ct, (cx, cy))
+        ct.set_alpha(255)
+
+    for i, p in enumerate(players):
+        lv = lives_list[i]
+        color = pa.RED if p.player_id == 1 else pa.GREEN
+        label_color = pa.LIGHT_BLUE if p.player_id == 1 else pa.LIGHT_GREEN
+        y_off = 8 + i * 24
+        label = f"P{p.player_id}"
+        lbl_surf = render_text(hud_font, label, label_color)
+        lbl_x = settings.SCREEN_WIDTH - settings.PLAYER_MAX_HP * (px * 5 + px) - lbl_surf.get_width() - 16
+        surface.blit(lbl_surf, (lbl_x, y_off - 2))
+        for j in range(settings.PLAYER_MAX_HP):
+            hx = lbl_x + lbl_surf.get_width() + 6 + j * (px * 5 + px)
+            if j < lv:
+                pa.draw_pixel_heart(surface, hx, y_off, color, px)
+            else:
+                pa.draw_pixel_heart(surface, hx, y_off, pa.DARK_GRAY, px)
+
+    for i, p in enumerate(players):
+        if lives_list[i] <= 0:
+            continue
+        eff = "double" if (p.bullet_type == "normal" and state.kills >= settings.DOUBLE_SHOT_UNLOCK) else p.bullet_type
+        tags = []
+        bt_names = {"fan10": "十连", "fan7": "七连", "fan5": "五连",
+                    "triple": "三发", "double": "双发"}
+        if eff in bt_names:
+            tags.append(bt_names[eff])
+        style_names = {"laser": "激光", "plasma": "等离子", "electric": "雷电"}
+        if p.bullet_style != "normal":
+            tags.append(style_names.get(p.bullet_style, ""))
+        if p.plane_form == "agile":
+            tags.append("疾")
+        elif p.plane_form == "heavy":
+            tags.append("甲")
+        if p.shield_timer > 0:
+            tags.append("盾")
+        if tags:
+            tag_text = f"P{p.player_id}:{' '.join(tags)}"
+            _draw_text_shadow(surface, hud_font, tag_text,
+                              pa.GREEN, 10, settings.SCREEN_HEIGHT - 50 + i * 22)
+
+    if quality.tier > 0:
+        _draw_text_shadow(surface, hud_font, f"画质:{quality.label}",
+                          pa.LIGHT_GRAY, 10, settings.SCREEN_HEIGHT - 74)
+
+    for i in range(len(players)):
+        if lives_list[i] <= 0:
+            continue
+        cd = state.missile_cooldowns[i]
+        y_cd = settings.SCREEN_HEIGHT - 50 + i * 22
+        if cd > 0:
+            ratio = 1 - cd / settings.MISSILE_COOLDOWN
+            bar_w = 60
+            bar_x = settings.SCREEN_WIDTH - bar_w - 10
+            pa.draw_pixel_bar(surface, bar_x, y_cd + 2, bar_w, px * 3,
+                              ratio, pa.ORANGE, (40, 20, 10), pa.PEACH)
+            _draw_text_shadow(surface, hud_font, "M",
+                              pa.ORANGE, bar_x - 18, y_cd - 2)
         else:
-            _circle(20 + level)
-            for ox in [-50, -25, 0, 25, 50]:
-                enemy_bullets.append(EnemyBullet(
-                    boss.rect.centerx + ox, boss.rect.bottom,
-                    vx=ox * 0.02, vy=spd * 1.3, is_boss=True))
+            txt = render_text(hud_font, "M:OK", pa.GREEN)
+            surface.blit(txt, (settings.SCREEN_WIDTH - txt.get_width() - 10, y_cd))
+
+
+def _draw_loading(screen: pygame.Surface, bg_grad: pygame.Surface,
+                  font: pygame.font.Font, ratio: float) -> None:
+    """冷启动加载进度（精灵生成期间代替黑屏）"""
+    sw, sh = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
+    screen.blit(bg_grad, (0, 0))
+    _draw_text_center(screen, font, "加载中...", pa.CYAN, sh // 2 - 40)
+    pa.draw_pixel_bar(screen, 60, sh // 2, sw - 120, pa.PX * 4,
+                      ratio, pa.CYAN, pa.DARK_BLUE, pa.WHITE)
+    pygame.display.flip()
+    pygame.event.pump()
 
 
 def main() -> None:
+    t_start = time.perf_counter()
     pygame.init()
     if not IS_ANDROID:
         try:
@@ -547,67 +504,60 @@ def main() -> None:
     pygame.display.set_caption(settings.WINDOW_TITLE + " [Pixel Edition]")
 
     font = get_font(settings.SCORE_FONT_SIZE)
+    bg_gradient = formats.optimize(
+        pa.create_bg_gradient(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    _draw_loading(screen, bg_gradient, font, 0.0)
+    first_frame = time.perf_counter() - t_start
+
+    warm_fonts(settings.FONT_SIZES)
     hud_font = get_font(20)
     clock = pygame.time.Clock()
 
-    bg_gradient = pa.create_bg_gradient(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
-    scanlines = pa.create_scanlines(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    background = BackgroundCompositor(bg_gradient)
+    post = PostProcessor((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT),
+                         background=background)
+    governor = quality.QualityGovernor()
     stars = StarBackground(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
 
-    render_surf = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    warm_mode = "cache"
+
+    def _generate(entries, raw_keys) -> None:
+        nonlocal warm_mode
+        warm_mode = warmup.generate(
+            entries, raw_keys,
+            settings.PARALLEL_WARMUP and not IS_ANDROID and not settings.PALETTE_SPRITES,
+            lambda done, total: _draw_loading(screen, bg_gradient, font, done / total))
+
+    entries, raw_keys = all_sprite_keys(), [pa.title_scene_key(*TITLE_SCENE_SIZE)]
+    if settings.PALETTE_SPRITES:
+        # 图集页面与磁盘缓存都是 32 位，8 位精灵直接生成
+        _generate(entries, raw_keys)
+    else:
+        # 不保留图集引用：convert_caches 把视图都换成独立表面后，图集页随之释放
+        pa.install_atlas(spritecache.load_or_build(entries, raw_keys, generate=_generate)[0])
+    pa.convert_caches()
+    print(f"[startup] first frame {first_frame * 1000:.0f} ms, "
+          f"menu ready {(time.perf_counter() - t_start) * 1000:.0f} ms "
+          f"(sprites: {warm_mode}, formats: {formats.stats()})")
 
     game_running = True
 
     while game_running:
         start, two_player = run_start_screen(screen, font, clock,
-                                              bg_gradient, stars, scanlines)
+                                              bg_gradient, stars, post)
         if not start:
             break
 
         pygame.event.clear()
         pygame.time.delay(80)
 
-        players = [
-            Player(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT, 1, two_player),
-        ]
-        if two_player:
-            players.append(Player(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT, 2, two_player))
-            players[0].rect.x = settings.SCREEN_WIDTH // 4 - 25
-            players[1].rect.x = settings.SCREEN_WIDTH * 3 // 4 - 25
-
-        for p in players:
-            p.invincible = True
-            p.invincible_timer = settings.INVINCIBILITY_FRAMES
-
-        bullets: list[Bullet] = []
-        enemy_bullets: list[EnemyBullet] = []
-        enemies: list[Enemy] = []
-        explosions: list[Explosion] = []
-        missiles: list[tuple[Missile, int]] = []
-        powerups: list[PowerUp] = []
-        floating_texts: list[FloatingText] = []
-        hit_sparks: list[HitSpark] = []
-        boss: Boss | None = None
-
-        score = 0
-        kills = 0
-        total_kills = 0
-        level = 1
-        lives_list = [settings.PLAYER_LIVES] * len(players)
-        fire_cooldowns = [0] * len(players)
-        missile_cooldowns = [0] * len(players)
-        enemy_spawn_timer = 0
-        formation_timer = 0
+        state = GameState(two_player)
+        players = state.players
+        scheduler = assets.AssetScheduler()
+        planned = None
         keys_pressed: set[int] = set()
-
-        combo_count = 0
-        combo_timer = 0
-        max_combo = 0
-        shake = ScreenShake()
-
-        boss_warning_timer = 0
-        boss_warning_active = False
-        level_clear_timer = 0
+        fire_taps = [False] * len(players)
+        missile_taps = [False] * len(players)
 
         touch: "TouchControls | None" = None
         if IS_ANDROID:
@@ -618,15 +568,57 @@ def main() -> None:
         SCN_J, SCN_K = 13, 14
         SCN_LEFT, SCN_RIGHT, SCN_UP, SCN_DOWN = 80, 79, 82, 81
 
+        held_inputs: list[tuple[bool, bool]] = []
+
+        def _gather_inputs() -> list[PlayerInput]:
+            """读取键盘/触控，生成本帧输入；按下事件只作用于第一步"""
+            nonlocal fire_taps, missile_taps
+            _kp = pygame.key.get_pressed()
+            def _key(k, scn):
+                return scn in keys_pressed or _kp[k]
+            inputs: list[PlayerInput] = []
+            held_inputs.clear()
+            for i, p in enumerate(players):
+                if p.player_id == 1:
+                    dx = _key(pygame.K_d, SCN_D) - _key(pygame.K_a, SCN_A)
+                    dy = _key(pygame.K_s, SCN_S) - _key(pygame.K_w, SCN_W)
+                    fire_held = _kp[pygame.K_j]
+                    missile_held = _kp[pygame.K_k]
+                else:
+                    dx = _key(pygame.K_RIGHT, SCN_RIGHT) - _key(pygame.K_LEFT, SCN_LEFT)
+                    dy = _key(pygame.K_DOWN, SCN_DOWN) - _key(pygame.K_UP, SCN_UP)
+                    fire_held = _kp[pygame.K_KP1]
+                    missile_held = _kp[pygame.K_KP2]
+                held = (touch is None and bool(fire_held),
+                        touch is None and bool(missile_held))
+                held_inputs.append(held)
+                inputs.append(PlayerInput(
+                    (dx, dy), None,
+                    fire_taps[i] or held[0], missile_taps[i] or held[1]))
+            if touch is not None:
+                if touch.target_x is not None:
+                    inputs[0].touch_target = (touch.target_x, touch.target_y)
+                inputs[0].fire = True
+                inputs[0].missile = touch.consume_missile()
+                held_inputs[0] = (True, False)
+            fire_taps = [False] * len(players)
+            missile_taps = [False] * len(players)
+            return inputs
+
+        step_dt = 1.0 / settings.SIM_HZ
+        accumulator = step_dt
+        clock.tick()
+
         running = True
         while running:
+            frame_start = time.perf_counter()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                     game_running = False
                 elif event.type in (pygame.FINGERDOWN, pygame.FINGERMOTION,
                                     pygame.FINGERUP):
-                    if touch is not None and lives_list[0] > 0:
+                    if touch is not None and state.is_alive(0):
                         touch.handle_event(
                             event,
                             player_cx=float(players[0].rect.centerx),
@@ -638,21 +630,16 @@ def main() -> None:
                     if event.key == pygame.K_ESCAPE:
                         running = False
                     for i, p in enumerate(players):
-                        if lives_list[i] <= 0:
-                            continue
                         if p.player_id == 1:
-                            fire_ok = (event.key == pygame.K_j or scn == SCN_J) and fire_cooldowns[i] <= 0
-                            missile_ok = (event.key == pygame.K_k or scn == SCN_K) and missile_cooldowns[i] <= 0
+                            if event.key == pygame.K_j or scn == SCN_J:
+                                fire_taps[i] = True
+                            if event.key == pygame.K_k or scn == SCN_K:
+                                missile_taps[i] = True
                         else:
-                            fire_ok = (event.key == pygame.K_KP1 or scn == SCN_KP1) and fire_cooldowns[i] <= 0
-                            missile_ok = (event.key == pygame.K_KP2 or scn == SCN_KP2) and missile_cooldowns[i] <= 0
-                        if fire_ok:
-                            fire_bullets(p, bullets, kills, level)
-                            fire_cooldowns[i] = settings.FIRE_COOLDOWN
-                        if missile_ok:
-                            m = Missile(p.rect.centerx, p.rect.top, settings.MISSILE_SPEED)
-                            missiles.append((m, i))
-                            missile_cooldowns[i] = settings.MISSILE_COOLDOWN
+                            if event.key == pygame.K_KP1 or scn == SCN_KP1:
+                                fire_taps[i] = True
+                            if event.key == pygame.K_KP2 or scn == SCN_KP2:
+                                missile_taps[i] = True
                 elif event.type == pygame.KEYUP:
                     scn = getattr(event, "scancode", -1)
                     keys_pressed.discard(scn if scn >= 0 else event.key)
@@ -660,341 +647,28 @@ def main() -> None:
             if not running:
                 break
 
-            for i in range(len(fire_cooldowns)):
-                if fire_cooldowns[i] > 0:
-                    fire_cooldowns[i] -= 1
-                if missile_cooldowns[i] > 0:
-                    missile_cooldowns[i] -= 1
-
-            if combo_timer > 0:
-                combo_timer -= 1
-                if combo_timer <= 0:
-                    combo_count = 0
-
-            shake.update()
-
-            _kp = pygame.key.get_pressed()
-            def _key(k, scn):
-                return scn in keys_pressed or _kp[k]
-            keys = type("Keys", (), {
-                "__getitem__": lambda s, k: (
-                    _key(pygame.K_LEFT, SCN_LEFT) if k == pygame.K_LEFT else
-                    _key(pygame.K_RIGHT, SCN_RIGHT) if k == pygame.K_RIGHT else
-                    _key(pygame.K_UP, SCN_UP) if k == pygame.K_UP else
-                    _key(pygame.K_DOWN, SCN_DOWN) if k == pygame.K_DOWN else
-                    _key(pygame.K_w, SCN_W) if k == pygame.K_w else
-                    _key(pygame.K_a, SCN_A) if k == pygame.K_a else
-                    _key(pygame.K_s, SCN_S) if k == pygame.K_s else
-                    _key(pygame.K_d, SCN_D) if k == pygame.K_d else False
-                )
-            })()
-            for i, p in enumerate(players):
-                if lives_list[i] > 0:
-                    if touch is not None and i == 0 and touch.target_x is not None:
-                        p.update(touch_target=(touch.target_x, touch.target_y))
-                    else:
-                        p.update(keys)
-
-            if touch is not None:
-                if lives_list[0] > 0 and fire_cooldowns[0] <= 0:
-                    fire_bullets(players[0], bullets, kills, level)
-                    fire_cooldowns[0] = settings.FIRE_COOLDOWN
-                if touch.consume_missile() and missile_cooldowns[0] <= 0:
-                    m = Missile(players[0].rect.centerx, players[0].rect.top,
-                                settings.MISSILE_SPEED)
-                    missiles.append((m, 0))
-                    missile_cooldowns[0] = settings.MISSILE_COOLDOWN
-            else:
-                for i, p in enumerate(players):
-                    if lives_list[i] <= 0:
-                        continue
-                    if p.player_id == 1:
-                        fire_held = _kp[pygame.K_j]
-                        missile_held = _kp[pygame.K_k]
-                    else:
-                        fire_held = _kp[pygame.K_KP1]
-                        missile_held = _kp[pygame.K_KP2]
-                    if fire_held and fire_cooldowns[i] <= 0:
-                        fire_bullets(p, bullets, kills, level)
-                        fire_cooldowns[i] = settings.FIRE_COOLDOWN
-                    if missile_held and missile_cooldowns[i] <= 0:
-                        m = Missile(p.rect.centerx, p.rect.top, settings.MISSILE_SPEED)
-                        missiles.append((m, i))
-                        missile_cooldowns[i] = settings.MISSILE_COOLDOWN
-
-            stars.update()
-
-            if level_clear_timer > 0:
-                level_clear_timer -= 1
-                if level_clear_timer <= 0:
-                    level += 1
-
-            if boss_warning_active:
-                boss_warning_timer -= 1
-                if boss_warning_timer <= 0:
-                    boss_warning_active = False
-                    boss = Boss(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT, level)
-                    shake.trigger(6, 15)
-            elif boss:
-                boss.update()
-                fire_interval = max(20, settings.BOSS_FIRE_INTERVAL - level * 3)
-                if boss.should_fire(fire_interval):
-                    boss.reset_fire_timer()
-                    _boss_fire(boss, enemy_bullets, players, lives_list, level)
-            elif level_clear_timer <= 0:
-                if score >= level * settings.BOSS_SCORE_THRESHOLD:
-                    boss_warning_active = True
-                    boss_warning_timer = 120
-
-            if not boss and not boss_warning_active and level_clear_timer <= 0:
-                interval = get_spawn_interval(score + level * 5)
-                enemy_spawn_timer += 1
-                if enemy_spawn_timer >= interval:
-                    enemies.append(spawn_enemy(settings.SCREEN_WIDTH))
-                    enemy_spawn_timer = 0
-
-                formation_timer += 1
-                if formation_timer >= 400 + random.randint(0, 200):
-                    enemies.extend(spawn_formation(settings.SCREEN_WIDTH))
-                    formation_timer = 0
-
-            for bullet in bullets[:]:
-                bullet.update()
-                if bullet.is_off_screen(settings.SCREEN_HEIGHT):
-                    bullets.remove(bullet)
-
-            for enemy in enemies[:]:
-                enemy.update()
-                if enemy.is_off_screen(settings.SCREEN_HEIGHT):
-                    enemies.remove(enemy)
-                if enemy.fire_timer >= settings.ENEMY_FIRE_INTERVAL:
-                    enemy.fire_timer = 0
-                    enemy_bullets.append(EnemyBullet(
-                        enemy.rect.centerx, enemy.rect.bottom,
-                        settings.ENEMY_BULLET_SPEED,
-                    ))
-
-            for eb in enemy_bullets[:]:
-                eb.update()
-                if eb.is_off_screen(settings.SCREEN_HEIGHT):
-                    enemy_bullets.remove(eb)
-
-            for pu in powerups[:]:
-                pu.update()
-                if pu.is_off_screen(settings.SCREEN_HEIGHT):
-                    powerups.remove(pu)
-
-            missiles_to_remove: list[int] = []
-            for idx, (m, _) in enumerate(missiles):
-                if m.update(settings.SCREEN_HEIGHT):
-                    missiles_to_remove.append(idx)
-            for idx in reversed(missiles_to_remove):
-                m, _ = missiles.pop(idx)
-                ex, ey = m.explosion_pos
-                explosions.append(MissileExplosion(ex, ey, settings.MISSILE_RADIUS))
-                shake.trigger(8, 18)
-                r2 = settings.MISSILE_RADIUS ** 2
-                for enemy in enemies[:]:
-                    dx = enemy.rect.centerx - ex
-                    dy = enemy.rect.centery - ey
-                    if dx * dx + dy * dy <= r2:
-                        enemies.remove(enemy)
-                        combo_count += 1
-                        combo_timer = settings.COMBO_WINDOW
-                        max_combo = max(max_combo, combo_count)
-                        multiplier = min(combo_count, settings.COMBO_MAX)
-                        pts = enemy.points * multiplier
-                        score += pts
-                        kills += 1
-                        total_kills += 1
-                        explosions.append(Explosion(enemy.rect.centerx, enemy.rect.centery, 16))
-                        _add_score_text(floating_texts, enemy.rect.centerx,
-                                        enemy.rect.centery, pts, multiplier)
-                        if random.random() < settings.POWERUP_DROP_CHANCE:
-                            powerups.append(spawn_powerup(enemy.rect.centerx, enemy.rect.centery))
-                for eb in enemy_bullets[:]:
-                    dx = eb.rect.centerx - ex
-                    dy = eb.rect.centery - ey
-                    if dx * dx + dy * dy <= r2:
-                        enemy_bullets.remove(eb)
-                if boss:
-                    dx = boss.rect.centerx - ex
-                    dy = boss.rect.centery - ey
-                    if dx * dx + dy * dy <= r2:
-                        boss.take_damage(settings.MISSILE_BOSS_DAMAGE)
-                        shake.trigger(6, 12)
-                        for _ in range(5):
-                            explosions.append(Explosion(
-                                boss.rect.centerx + random.randint(-30, 30),
-                                boss.rect.centery,
-                                18,
-                            ))
-
-            for exp in explosions[:]:
-                if exp.update():
-                    explosions.remove(exp)
-
-            for spark in hit_sparks[:]:
-                if spark.update():
-                    hit_sparks.remove(spark)
-
-            for ft in floating_texts[:]:
-                if ft.update():
-                    floating_texts.remove(ft)
-
-            bullets_to_remove: set[Bullet] = set()
-            enemies_to_remove: set[Enemy] = set()
-            if boss:
-                for bullet in bullets:
-                    if pygame.sprite.collide_rect(bullet, boss):
-                        bullets_to_remove.add(bullet)
-                        boss.take_damage(1)
-                        hit_sparks.append(HitSpark(bullet.rect.centerx, bullet.rect.centery))
-            else:
-                for bullet in bullets:
-                    for enemy in enemies:
-                        if pygame.sprite.collide_rect(bullet, enemy):
-                            bullets_to_remove.add(bullet)
-                            enemies_to_remove.add(enemy)
-                            explosions.append(Explosion(enemy.rect.centerx, enemy.rect.centery))
-                            hit_sparks.append(HitSpark(bullet.rect.centerx, bullet.rect.centery))
-                            if random.random() < settings.POWERUP_DROP_CHANCE:
-                                powerups.append(spawn_powerup(enemy.rect.centerx, enemy.rect.centery))
-                            break
-            for bullet in bullets_to_remove:
-                bullets.remove(bullet)
-            for enemy in enemies_to_remove:
-                enemies.remove(enemy)
-                combo_count += 1
-                combo_timer = settings.COMBO_WINDOW
-                max_combo = max(max_combo, combo_count)
-                multiplier = min(combo_count, settings.COMBO_MAX)
-                pts = enemy.points * multiplier
-                score += pts
-                kills += 1
-                total_kills += 1
-                _add_score_text(floating_texts, enemy.rect.centerx,
-                                enemy.rect.centery, pts, multiplier)
-
-            if boss and boss.is_dead:
-                bx, by = boss.rect.centerx, boss.rect.centery
-                for _ in range(12):
-                    explosions.append(Explosion(
-                        bx + random.randint(-50, 50),
-                        by + random.randint(-35, 35),
-                        random.randint(18, 28),
-                    ))
-                shake.trigger(12, 25)
-                score += boss.points
-                floating_texts.append(FloatingText(
-                    bx, by, f"BOSS +{boss.points}", pa.GOLD, 60, 22))
-                boss = None
-                level_clear_timer = 90
-
-            for pu in powerups[:]:
-                for i, p in enumerate(players):
-                    if lives_list[i] <= 0:
-                        continue
-                    if pygame.sprite.collide_rect(p, pu):
-                        if pu.ptype == "bullet":
-                            levels = [
-                                ("normal", "normal"), ("double", "normal"),
-                                ("triple", "normal"), ("fan5", "normal"),
-                                ("fan7", "normal"), ("fan7", "laser"),
-                                ("fan10", "normal"), ("fan10", "laser"),
-                                ("fan10", "plasma"), ("fan10", "electric"),
-                            ]
-                            cur = (p.bullet_type, p.bullet_style)
-                            idx = next((j for j, L in enumerate(levels) if L == cur), 0)
-                            nxt = levels[min(idx + 1, len(levels) - 1)]
-                            if idx >= len(levels) - 1:
-                                nxt = levels[6]
-                            p.bullet_type, p.bullet_style = nxt
-                            names = {"double": "双发!", "triple": "三连!",
-                                     "fan5": "五连扇!", "fan7": "七连扇!",
-                                     "fan10": "十连暴风!"}
-                            label = names.get(nxt[0], "火力升级!")
-                            if nxt[1] != "normal":
-                                sn = {"laser": "激光", "plasma": "等离子", "electric": "雷电"}
-                                label = sn.get(nxt[1], "") + "!" 
-                            floating_texts.append(FloatingText(
-                                p.rect.centerx, p.rect.top - 10,
-                                label, pa.GREEN, 40, 18))
-                        elif pu.ptype == "life":
-                            lives_list[i] += 1
-                            floating_texts.append(FloatingText(
-                                p.rect.centerx, p.rect.top - 10,
-                                "+1 HP", pa.RED, 40, 16))
-                        elif pu.ptype == "morph":
-                            forms = ["normal", "agile", "heavy"]
-                            idx = forms.index(p.plane_form)
-                            p.apply_form(forms[(idx + 1) % 3])
-                            form_names = {"normal": "标准", "agile": "疾速", "heavy": "重甲"}
-                            floating_texts.append(FloatingText(
-                                p.rect.centerx, p.rect.top - 10,
-                                form_names[p.plane_form], pa.ORANGE, 40, 16))
-                        elif pu.ptype == "shield":
-                            p.shield_timer = settings.SHIELD_DURATION
-                            floating_texts.append(FloatingText(
-                                p.rect.centerx, p.rect.top - 10,
-                                "护盾!", pa.SHIELD_BLUE, 40, 16))
-                        powerups.remove(pu)
-                        break
-
-            game_over = False
-            for i, p in enumerate(players):
-                if lives_list[i] > 0 and not p.invincible:
-                    hit_taken = False
-                    for eb in enemy_bullets[:]:
-                        if pygame.sprite.collide_rect(p, eb):
-                            enemy_bullets.remove(eb)
-                            if p.shield_timer > 0:
-                                p.shield_timer = 0
-                                hit_sparks.append(HitSpark(
-                                    eb.rect.centerx, eb.rect.centery, pa.SHIELD_BLUE))
-                                floating_texts.append(FloatingText(
-                                    p.rect.centerx, p.rect.top - 10,
-                                    "护盾抵挡!", pa.SHIELD_BLUE, 35, 14))
-                                shake.trigger(3, 6)
-                            else:
-                                lives_list[i] -= 1
-                                shake.trigger(6, 12)
-                                if lives_list[i] > 0:
-                                    p.hit(settings.INVINCIBILITY_FRAMES)
-                            hit_taken = True
-                            break
-                    if not hit_taken:
-                        for enemy in enemies[:]:
-                            if pygame.sprite.collide_rect(p, enemy):
-                                enemies.remove(enemy)
-                                explosions.append(Explosion(enemy.rect.centerx, enemy.rect.centery))
-                                if p.shield_timer > 0:
-                                    p.shield_timer = 0
-                                    shake.trigger(3, 6)
-                                else:
-                                    lives_list[i] -= 1
-                                    shake.trigger(6, 12)
-                                    if lives_list[i] > 0:
-                                        p.hit(settings.INVINCIBILITY_FRAMES)
-                                hit_taken = True
-                                break
-                    if not hit_taken and boss and pygame.sprite.collide_rect(p, boss):
-                        if p.shield_timer > 0:
-                            p.shield_timer = 0
-                            shake.trigger(3, 6)
-                        else:
-                            lives_list[i] -= 1
-                            shake.trigger(6, 12)
-                            if lives_list[i] > 0:
-                                p.hit(settings.INVINCIBILITY_FRAMES)
-            if all(l <= 0 for l in lives_list):
-                game_over = True
-
-            if game_over:
-                leaderboard = add_to_leaderboard(score)
-                if not run_game_over(screen, font, score, leaderboard, clock,
-                                     bg_gradient, scanlines,
-                                     total_kills, max_combo, level):
+            # 固定步长：逻辑以 SIM_HZ 推进，渲染帧率独立；落后太多时最多追赶 MAX_SIM_STEPS 步
+            steps = 0
+            while accumulator >= step_dt and steps < settings.MAX_SIM_STEPS:
+                if steps == 0:
+                    inputs = _gather_inputs()
+                else:
+                    for inp, held in zip(inputs, held_inputs):
+                        inp.fire, inp.missile = held
+                state.step(inputs)
+                stars.update()
+                accumulator -= step_dt
+                steps += 1
+                if state.game_over:
+                    break
+            if accumulator >= step_dt:
+                accumulator %= step_dt
+
+            if state.game_over:
+                leaderboard = add_to_leaderboard(state.score)
+                if not run_game_over(screen, font, state.score, leaderboard, clock,
+                                     bg_gradient, stars, post,
+                                     state.total_kills, state.max_combo, state.level):
                     game_running = False
                 break
 
@@ -1002,175 +676,34 @@ def main() -> None:
             #  RENDER
             # ══════════════════════════════════════
 
-            render_surf.blit(bg_gradient, (0, 0))
-
-            tint_idx = (level - 1) % len(settings.LEVEL_TINTS)
-            tint = settings.LEVEL_TINTS[tint_idx]
-            tint_surf = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), pygame.SRCALPHA)
-            tint_surf.fill((*tint, 35))
-            render_surf.blit(tint_surf, (0, 0))
-
-            stars.draw(render_surf)
-
-            for exp in explosions:
-                exp.draw(render_surf)
-            for spark in hit_sparks:
-                spark.draw(render_surf)
-            for m, _ in missiles:
-                m.draw(render_surf)
-            for pu in powerups:
-                pu.draw(render_surf)
-            for i, p in enumerate(players):
-                if lives_list[i] > 0:
-                    p.draw(render_surf)
-            for eb in enemy_bullets:
-                eb.draw(render_surf)
-            for enemy in enemies:
-                enemy.draw(render_surf)
-            if boss:
-                boss.draw(render_surf)
-            for bullet in bullets:
-                bullet.draw(render_surf)
-            for ft in floating_texts:
-                ft.draw(render_surf)
-
-            px = pa.PX
-
-            _draw_text_shadow(render_surf, font,
-                              f"SCORE {score}", pa.WHITE, 10, 8)
-            _draw_text_shadow(render_surf, hud_font,
-                              f"Lv.{level}", pa.CYAN, 12, 36)
-
-            if combo_count >= 2:
-                combo_color = pa.GOLD if combo_count >= 8 else pa.ORANGE if combo_count >= 5 else pa.YELLOW
-                ticks = pygame.time.get_ticks()
-                pulse = 1.0 + 0.1 * math.sin(ticks / 100.0)
-                combo_text = f"COMBO x{combo_count}"
-                combo_font = get_font(int(18 * pulse))
-                _draw_text_shadow(render_surf, combo_font,
-                                  combo_text, combo_color, 12, 58)
-
-            if boss_warning_active:
-                ticks = pygame.time.get_ticks()
-                if (ticks // 100) % 2 == 0:
-                    warn_font = get_font(36)
-                    _draw_text_center(render_surf, warn_font,
-                                      "⚠ WARNING ⚠", pa.RED,
-                                      settings.SCREEN_HEIGHT // 2 - 40)
-                flash_alpha = int(abs(math.sin(ticks / 80.0)) * 40)
-                flash_surf = pygame.Surface(
-                    (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), pygame.SRCALPHA)
-                flash_surf.fill((255, 0, 0, flash_alpha))
-                render_surf.blit(flash_surf, (0, 0))
-
-            if boss:
-                _draw_text_center(render_surf, font, "! BOSS !", pa.RED, 8)
-
-            if level_clear_timer > 0:
-                clear_font = get_font(32)
-                alpha = min(255, level_clear_timer * 6)
-                clear_text = f"LEVEL {level} CLEAR!"
-                ct = clear_font.render(clear_text, False, pa.CYAN)
-                ct.set_alpha(alpha)
-                cx = settings.SCREEN_WIDTH // 2 - ct.get_width() // 2
-                cy = settings.SCREEN_HEIGHT // 2 - 30
-                shadow = clear_font.render(clear_text, False, (0, 0, 0))
-                shadow.set_alpha(alpha)
-                render_surf.blit(shadow, (cx + 2, cy + 2))
-                render_surf.blit(ct, (cx, cy))
-
-            for i, p in enumerate(players):
-                lv = lives_list[i]
-                color = pa.RED if p.player_id == 1 else pa.GREEN
-                label_color = pa.LIGHT_BLUE if p.player_id == 1 else pa.LIGHT_GREEN
-                y_off = 8 + i * 24
-                label = f"P{p.player_id}"
-                lbl_surf = hud_font.render(label, False, label_color)
-                lbl_x = settings.SCREEN_WIDTH - settings.PLAYER_MAX_HP * (px * 5 + px) - lbl_surf.get_width() - 16
-                render_surf.blit(lbl_surf, (lbl_x, y_off - 2))
-                for j in range(settings.PLAYER_MAX_HP):
-                    hx = lbl_x + lbl_surf.get_width() + 6 + j * (px * 5 + px)
-                    if j < lv:
-                        pa.draw_pixel_heart(render_surf, hx, y_off, color, px)
-                    else:
-                        pa.draw_pixel_heart(render_surf, hx, y_off, pa.DARK_GRAY, px)
-
-            for i, p in enumerate(players):
-                if lives_list[i] <= 0:
-                    continue
-                eff = "double" if (p.bullet_type == "normal" and kills >= settings.DOUBLE_SHOT_UNLOCK) else p.bullet_type
-                tags = []
-                bt_names = {"fan10": "十连", "fan7": "七连", "fan5": "五连",
-                            "triple": "三发", "double": "双发"}
-                if eff in bt_names:
-                    tags.append(bt_names[eff])
-                style_names = {"laser": "激光", "plasma": "等离子", "electric": "雷电"}
-                if p.bullet_style != "normal":
-                    tags.append(style_names.get(p.bullet_style, ""))
-                if p.plane_form == "agile":
-                    tags.append("疾")
-                elif p.plane_form == "heavy":
-                    tags.append("甲")
-                if p.shield_timer > 0:
-                    tags.append("盾")
-                if tags:
-                    tag_text = f"P{p.player_id}:{' '.join(tags)}"
-                    _draw_text_shadow(render_surf, hud_font, tag_text,
-                                      pa.GREEN, 10, settings.SCREEN_HEIGHT - 50 + i * 22)
-
-            for i in range(len(players)):
-                if lives_list[i] <= 0:
-                    continue
-                cd = missile_cooldowns[i]
-                y_cd = settings.SCREEN_HEIGHT - 50 + i * 22
-                if cd > 0:
-                    ratio = 1 - cd / settings.MISSILE_COOLDOWN
-                    bar_w = 60
-                    bar_x = settings.SCREEN_WIDTH - bar_w - 10
-                    pa.draw_pixel_bar(render_surf, bar_x, y_cd + 2, bar_w, px * 3,
-                                      ratio, pa.ORANGE, (40, 20, 10), pa.PEACH)
-                    _draw_text_shadow(render_surf, hud_font, "M",
-                                      pa.ORANGE, bar_x - 18, y_cd - 2)
-                else:
-                    txt = hud_font.render("M:OK", False, pa.GREEN)
-                    render_surf.blit(txt, (settings.SCREEN_WIDTH - txt.get_width() - 10, y_cd))
+            render_game(screen, state, stars, background, font, hud_font,
+                        accumulator / step_dt)
 
             if touch is not None:
-                missile_ready = missile_cooldowns[0] <= 0 if lives_list[0] > 0 else False
-                touch.draw(render_surf, hud_font, missile_ready)
+                missile_ready = state.missile_cooldowns[0] <= 0 if state.is_alive(0) else False
+                touch.draw(screen, hud_font, missile_ready)
 
-            render_surf.blit(scanlines, (0, 0))
-
-            shake_x, shake_y = shake.get_offset()
-            screen.fill((0, 0, 0))
-            screen.blit(render_surf, (shake_x, shake_y))
+            post.apply(screen, state.shake.get_offset())
+            work_ms = (time.perf_counter() - frame_start) * 1000
+            if governor.record(work_ms):
+                post.set_mode(quality.scanline_mode())
 
             pygame.display.flip()
-            clock.tick(settings.FPS)
 
+            plan_key = (state.level, state.boss_warning_active)
+            if plan_key != planned:
+                planned = plan_key
+                assets.plan(scheduler, *plan_key)
+            # 预加载只用本渲染帧（RENDER_FPS）剩余的时间，与画质预算无关
+            scheduler.run(min(settings.ASSET_BUDGET_MS, 1000 / settings.RENDER_FPS - work_ms))
+            accumulator += clock.tick(settings.RENDER_FPS) / 1000.0
+
+    print(f"[quality] {governor.stats()}")
+    print("[caches]\n" + assetcache.dump())
     pygame.quit()
     sys.exit()
 
 
-def _add_score_text(floating_texts: list, x: int, y: int,
-                    pts: int, multiplier: int) -> None:
-    if multiplier >= 8:
-        color = pa.GOLD
-        size = 22
-    elif multiplier >= 5:
-        color = pa.CYAN
-        size = 20
-    elif multiplier >= 3:
-        color = pa.ORANGE
-        size = 18
-    else:
-        color = pa.YELLOW
-        size = 16
-    text = f"+{pts}"
-    if multiplier > 1:
-        text += f" x{multiplier}"
-    floating_texts.append(FloatingText(x, y, text, color, 45, size))
-
-
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
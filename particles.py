@@ -0,0 +1,250 @@
+"""
+统一粒子系统：定容、列式存储，整批积分 / 阻尼 / 寿命递减 / 剔除
+爆炸、火花、导弹爆炸、尾焰、流星尾迹都只是以不同样式向系统发射粒子
+粒子每帧整列重建，列用 list 而非 array：CPython 中 map/compress 生成 list 快得多
+发射数量、有效容量与尾迹长度按 quality.detail 缩放；档位随实测帧耗时变化，
+所以粒子只用自己的 rng，不消耗模拟用的全局 random 序列（固定种子的无窗口模拟保持确定）
+"""
+import math
+import random
+from itertools import compress, repeat
+from operator import add, mul, sub
+
+import pygame
+
+import formats
+import pixel_art as pa
+import quality
+
+_TWO_PI = 2 * math.pi
+
+# 装饰效果（粒子、流星）专用随机数
+rng = random.Random()
+
+# 样式: (颜色阶梯, 大尺寸, 小尺寸, 大尺寸寿命比例, 每点寿命透明度)
+# 颜色阶梯为 [(t 上限, 颜色), ...]，t = 1 - life / dur，最后一项兜底
+# 尺寸以像素块 PX 为单位；大尺寸为 None 时尺寸随寿命缩小；透明度为 0 表示不透明
+_STYLES: list[tuple] = []
+_STYLE_INDEX: dict = {}
+
+# (颜色, 边长, 透明度) -> 预渲染方块，所有粒子系统共用
+_tiles: dict[tuple[tuple, int, int], pygame.Surface] = {}
+
+
+def register_style(key, ramp, big: int | None = 2, small: int = 1,
+                   big_frac: float = 0.6, alpha_per_life: int = 0) -> int:
+    idx = _STYLE_INDEX.get(key)
+    if idx is None:
+        idx = len(_STYLES)
+        _STYLES.append((tuple(ramp), big, small, big_frac, alpha_per_life))
+        _STYLE_INDEX[key] = idx
+    return idx
+
+
+FIRE = register_style("fire", [(0.2, pa.WHITE), (0.4, pa.YELLOW),
+                               (0.7, pa.ORANGE), (1.0, pa.RED)])
+SMOKE = register_style("smoke", [(0.3, pa.LIGHT_GRAY), (0.6, pa.DARK_GRAY),
+                                 (1.0, (60, 50, 45))])
+BLAST = register_style("blast", [(0.2, pa.WHITE), (0.4, pa.YELLOW),
+                                 (0.6, pa.ORANGE), (1.0, pa.RED)], big_frac=0.5)
+THRUST = register_style("thrust", [(0.3, pa.YELLOW), (0.6, pa.ORANGE),
+                                   (1.0, (180, 60, 20))],
+                        big=1, big_frac=1.0, alpha_per_life=25)
+EXHAUST = register_style("exhaust", [(0.25, pa.WHITE), (0.45, pa.YELLOW),
+                                     (0.7, pa.ORANGE), (1.0, pa.RED)], big=None)
+STARDUST = register_style("stardust", [(1.0, pa.WHITE)],
+                          big_frac=0.27, alpha_per_life=18)
+
+
+def spark_style(color: tuple) -> int:
+    return register_style(("spark", color), [(1.0, color)])
+
+
+def appearance(style: int, dur: int, life: int) -> tuple[tuple, int, int]:
+    """粒子在给定寿命下的 (颜色, 边长, 透明度)"""
+    ramp, big, small, big_frac, alpha_per_life = _STYLES[style]
+    t = 1 - life / dur
+    color = ramp[-1][1]
+    for limit, c in ramp[:-1]:
+        if t < limit:
+            color = c
+            break
+    if big is None:
+        size = max(small, life // 2) * pa.PX
+    else:
+        size = (big if life > dur * big_frac else small) * pa.PX
+    alpha = min(255, life * alpha_per_life) if alpha_per_life else 255
+    return color, size, alpha
+
+
+def get_tile(color: tuple, size: int, alpha: int = 255) -> pygame.Surface:
+    key = (color, size, alpha)
+    tile = _tiles.get(key)
+    if tile is None:
+        if alpha >= 255:
+            tile = pygame.Surface((size, size))
+            tile.fill(color)
+            tile = formats.optimize(tile)
+        else:
+            tile = pa.alpha_rect((size, size), color, alpha)
+        _tiles[key] = tile
+    return tile
+
+
+class ParticleSystem:
+    """定容粒子池：超过容量的发射直接丢弃并计数"""
+
+    _COLS = ("x", "y", "vx", "vy", "damping", "life", "dur", "style")
+
+    def __init__(self, capacity: int = 1500):
+        self.capacity = capacity
+        self.dropped = 0
+        for name in self._COLS:
+            setattr(self, name, [])
+        # (样式, 总寿命, 剩余寿命) -> (方块, 半边长)
+        self._looks: dict[tuple[int, int, int], tuple[pygame.Surface, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def free(self) -> int:
+        """剩余容量；低画质档位下有效容量按 quality.detail 缩小"""
+        return max(0, int(self.capacity * quality.detail) - len(self.x))
+
+    def clear(self) -> None:
+        for name in self._COLS:
+            setattr(self, name, [])
+
+    def emit(self, xs, ys, vxs, vys, lives, dur: int, style,
+             damping: float = 1.0) -> int:
+        """批量写入；style 为单个样式或逐粒子样式序列；返回实际写入数量"""
+        n = min(len(xs), self.free())
+        if n < len(xs):
+            self.dropped += len(xs) - n
+        if n <= 0:
+            return 0
+        self.x.extend(xs[:n])
+        self.y.extend(ys[:n])
+        self.vx.extend(vxs[:n])
+        self.vy.extend(vys[:n])
+        self.life.extend(lives[:n])
+        self.damping.extend(repeat(damping, n))
+        self.dur.extend(repeat(dur, n))
+        if isinstance(style, int):
+            self.style.extend(repeat(style, n))
+        else:
+            self.style.extend(style[:n])
+        return n
+
+    def burst(self, x: float, y: float, count: int, speed: tuple[float, float],
+              life: tuple[int, int], dur: int, style, damping: float,
+              spread: float = 0.0) -> int:
+        """从 (x, y) 向随机方向发射 count 个粒子；style 为样式序列时逐粒子随机选取"""
+        count = int(count * quality.detail)
+        room = self.free()
+        if count > room:
+            self.dropped += count - room
+            count = room
+        if count <= 0:
+            return 0
+        rnd = rng.random
+        cos, sin = math.cos, math.sin
+        s0, ds = speed[0], speed[1] - speed[0]
+        l0, dl = life[0], life[1] - life[0] + 1
+        xs, ys, vxs, vys, lives = [], [], [], [], []
+        for _ in range(count):
+            a = rnd() * _TWO_PI
+            c, s = cos(a), sin(a)
+            spd = s0 + ds * rnd()
+            if spread:
+                d = spread * rnd()
+                xs.append(x + d * c)
+                ys.append(y + d * s)
+            else:
+                xs.append(x)
+                ys.append(y)
+            vxs.append(c * spd)
+            vys.append(s * spd)
+            lives.append(l0 + int(dl * rnd()))
+        if not isinstance(style, int):
+            style = [rng.choice(style) for _ in range(count)]
+        return self.emit(xs, ys, vxs, vys, lives, dur, style, damping)
+
+    def update(self) -> None:
+        """整批积分、阻尼、寿命递减，并一次压缩剔除死亡粒子"""
+        if not self.x:
+            return
+        self.x = list(map(add, self.x, self.vx))
+        self.y = list(map(add, self.y, self.vy))
+        self.vx = list(map(mul, self.vx, self.damping))
+        self.vy = list(map(mul, self.vy, self.damping))
+        self.life = list(map(sub, self.life, repeat(1)))
+        if min(self.life) <= 0:
+            keep = [lv > 0 for lv in self.life]
+            for name in self._COLS:
+                setattr(self, name, list(compress(getattr(self, name), keep)))
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """所有粒子合并为一次 Surface.blits 提交"""
+        if not self.x:
+            return
+        looks = self._looks
+        seq = []
+        append = seq.append
+        for x, y, life, dur, style in zip(self.x, self.y, self.life,
+                                          self.dur, self.style):
+            key = (style, dur, life)
+            look = looks.get(key)
+            if look is None:
+                color, size, alpha = appearance(style, dur, life)
+                look = looks[key] = (get_tile(color, size, alpha), size // 2)
+            tile, half = look
+            append((tile, (int(x) - half, int(y) - half)))
+        surface.blits(seq, False)
+
+
+# ── 发射器 ─────────────────────────────────────
+
+_EXPLOSION_STYLES = (FIRE, SMOKE)
+_SPARK_STYLES: list[int] = []
+
+
+def emit_explosion(ps: ParticleSystem, x: float, y: float,
+                   duration: int = 16) -> None:
+    ps.burst(x, y, 20, (1.5, 6), (6, duration), duration,
+             _EXPLOSION_STYLES, 0.92)
+
+
+def emit_sparks(ps: ParticleSystem, x: float, y: float,
+                color: tuple | None = None) -> None:
+    if color is None:
+        if not _SPARK_STYLES:
+            _SPARK_STYLES.extend(spark_style(c)
+                                 for c in (pa.WHITE, pa.YELLOW, pa.ORANGE))
+        styles = _SPARK_STYLES
+    else:
+        styles = (spark_style(color), spark_style(pa.WHITE))
+    ps.burst(x, y, 8, (2, 6), (4, 10), 10, styles, 0.88)
+
+
+def emit_missile_blast(ps: ParticleSystem, x: float, y: float,
+                       radius: int, duration: int = 35) -> None:
+    ps.burst(x, y, 55, (1.5, 7), (15, duration), duration, BLAST, 0.94,
+             spread=radius * 0.25)
+
+
+def emit_thrust(ps: ParticleSystem, x: float, y: float) -> None:
+    """玩家尾焰"""
+    ps.emit([x + rng.randint(-3, 3)], [y],
+            [rng.uniform(-0.5, 0.5)], [rng.uniform(1.0, 3.0)],
+            [max(1, int(rng.randint(6, 12) * quality.detail))], 12, THRUST)
+
+
+def emit_exhaust(ps: ParticleSystem, x: float, y: float) -> None:
+    """导弹尾焰（静止，逐帧缩小）"""
+    ps.emit([x], [y], [0.0], [0.0], [max(1, int(8 * quality.detail))], 8, EXHAUST)
+
+
+def emit_stardust(ps: ParticleSystem, x: float, y: float) -> None:
+    """流星尾迹"""
+    ps.emit([x], [y], [0.0], [0.0], [14], 15, STARDUST)
@@ -4,8 +4,17 @@
 Hue-shifted 调色板，光源从右上方照射
 """
 import math
+import sys
+from array import array
+
 import pygame
 
+import formats
+import quality
+import settings
+from assetcache import AssetCache
+from atlas import SpriteAtlas, pack as pack_atlas
+
 PX = 3
 
 BLACK       = (0, 0, 0)
@@ -33,7 +42,12 @@ LIGHT_GREEN = (120, 255, 160)
 SHIELD_BLUE = (60, 150, 255)
 GOLD        = (255, 215, 0)
 
-_cache: dict[str, pygame.Surface] = {}
+# 精灵缓存上限（LRU 淘汰，被淘汰的精灵下次用到时重新生成）；
+# 原始精灵、缩放精灵、8 位缩放形状各自一份预算
+SPRITE_CACHE_BYTES = 4 * 1024 * 1024
+SPRITE_CACHE_SIZE = 256
+
+_cache = AssetCache("sprites", SPRITE_CACHE_BYTES, SPRITE_CACHE_SIZE)
 
 
 def _r(inner: str, w: int) -> str:
@@ -42,13 +56,24 @@ def _r(inner: str, w: int) -> str:
 
 
 def _grid(rows: list[str], palette: dict, scale: int = PX) -> pygame.Surface:
+    """字符网格 -> 精灵：每个通道用一张 256 项查找表整体 translate，
+    交错写入表面自身像素格式的缓冲区，再放大 scale 倍（网格字符均为 ASCII）"""
     h = len(rows)
     w = len(rows[0]) if rows else 0
     s = pygame.Surface((w, h), pygame.SRCALPHA)
-    for y, row in enumerate(rows):
-        for x, ch in enumerate(row):
-            if ch in palette:
-                s.set_at((x, y), palette[ch])
+    if not w or not h:
+        return pygame.transform.scale(s, (w * scale, h * scale))
+    text = "".join(row[:w].ljust(w, "\0") for row in rows).encode("latin-1")
+    tables = [bytearray(256) for _ in range(4)]
+    for ch, color in palette.items():
+        code = ord(ch)
+        for table, value in zip(tables, (*color, 255)[:4]):
+            table[code] = value
+    buf = bytearray(w * h * 4)
+    for table, shift in zip(tables, s.get_shifts()):
+        offset = shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+        buf[offset::4] = text.translate(table)
+    s.get_buffer().write(bytes(buf))
     return pygame.transform.scale(s, (w * scale, h * scale))
 
 
@@ -64,6 +89,96 @@ def _fix_row(row: str, w: int) -> str:
     return row[left:left + w]
 
 
+# ═══════════════════════════════════════════════════════════
+#  8-bit Palette Sprites  (settings.PALETTE_SPRITES)
+# ═══════════════════════════════════════════════════════════
+
+# 索引 0 为透明（colorkey），调色板从索引 1 开始
+_KEY_COLOR = (255, 0, 255)
+
+# 形状键 -> 原始尺寸的 8 位索引表面（种类有限，不设上限，视图依赖它重建）；
+# (形状键, 尺寸) -> 缩放后的共享表面
+_shapes = AssetCache("pal")
+_scaled_shapes = AssetCache("palscale", SPRITE_CACHE_BYTES, SPRITE_CACHE_SIZE)
+# 精灵键 -> (形状键, 调色板)
+_variants: dict[str, tuple[str, list[tuple]]] = {}
+
+
+def _indexed(data: bytes, w: int, h: int) -> pygame.Surface:
+    """每像素一个索引的字节串 -> 8 位表面（行宽按 pitch 补齐）"""
+    s = pygame.Surface((w, h), 0, 8)
+    pitch = s.get_pitch()
+    if pitch != w:
+        data = b"".join(data[y * w:(y + 1) * w].ljust(pitch, b"\0") for y in range(h))
+    s.get_buffer().write(data)
+    return s
+
+
+def _index_grid(rows: list[str], chars, scale: int = PX) -> pygame.Surface:
+    """字符网格 -> 8 位索引表面：chars 中第 i 个字符取索引 i，其余字符为透明"""
+    h = len(rows)
+    w = len(rows[0])
+    table = bytearray(256)
+    for i, ch in enumerate(chars, 1):
+        table[ord(ch)] = i
+    text = "".join(row[:w].ljust(w, "\0") for row in rows).encode("latin-1")
+    return pygame.transform.scale(_indexed(text.translate(table), w, h),
+                                  (w * scale, h * scale))
+
+
+def _quantize(surface: pygame.Surface) -> tuple[pygame.Surface, list[tuple]] | None:
+    """二值透明的 RGBA 表面 -> (8 位索引表面, 调色板)；有半透明像素或超过 255 色时返回 None
+    像素按 32 位整数整体去重 / 映射，透明像素一律映射到索引 0"""
+    w, h = surface.get_size()
+    rgba = pygame.image.tobytes(surface, "RGBA")
+    if rgba[3::4].translate(None, b"\x00\xff"):
+        return None
+    pixels = array("I", rgba)
+    lut = {}
+    colors = []
+    for v in dict.fromkeys(pixels):
+        rgb = v.to_bytes(4, sys.byteorder)
+        if rgb[3]:
+            colors.append(tuple(rgb[:3]))
+            lut[v] = len(colors)
+        else:
+            lut[v] = 0
+    if len(colors) > 255:
+        return None
+    return _indexed(bytes(map(lut.__getitem__, pixels)), w, h), colors
+
+
+def _variant(shape: str, palette: list[tuple],
+             size: tuple[int, int] | None = None) -> pygame.Surface:
+    """形状（按需缩放，各尺寸只存一份）上的调色板视图：像素共用，调色板各自独立"""
+    surf = base = _shapes[shape]
+    if size is not None and size != base.get_size():
+        surf = _scaled_shapes.get((shape, size))
+        if surf is None:
+            surf = _scaled_shapes[(shape, size)] = pygame.transform.scale(base, size)
+    view = surf.subsurface(surf.get_rect())
+    view.set_palette([_KEY_COLOR] + palette)
+    view.set_colorkey(0, pygame.RLEACCEL)
+    return view
+
+
+def _register(key: str, shape: str, build, palette: list[tuple]) -> pygame.Surface:
+    """8 位模式下的精灵：同一形状只 build 一次，换色只是换调色板"""
+    if shape not in _shapes:
+        _shapes[shape] = build()
+    _variants[key] = (shape, palette)
+    result = _cache[key] = _variant(shape, palette)
+    return result
+
+
+def palette_variant(key: str, shape_key: str, palette: dict) -> pygame.Surface:
+    """以已生成精灵 shape_key 的形状登记新配色 key（8 位模式）
+    palette 把 shape_key 调色板中的颜色映射到新颜色，未列出的保持不变"""
+    get_sprite(shape_key)
+    shape, base = _variants[shape_key]
+    return _register(key, shape, None, [palette.get(c, c) for c in base])
+
+
 # ═══════════════════════════════════════════════════════════
 #  Player Sprites  (20×24 → 60×72)
 # ═══════════════════════════════════════════════════════════
@@ -143,10 +258,15 @@ _P_TAIL_F1 = [
 
 def player_sprite(pid: int, frame: int = 0) -> pygame.Surface:
     key = f"player_{pid}_{frame}"
-    if key in _cache:
-        return _cache[key]
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
     pal = _P1_PAL if pid == 1 else _P2_PAL
     rows = _P_BODY + (_P_TAIL_F0 if frame == 0 else _P_TAIL_F1)
+    if settings.PALETTE_SPRITES:
+        # 两名玩家字符相同，只是调色板不同：共用一个形状
+        return _register(key, f"player_{frame}", lambda: _index_grid(rows, _P1_PAL),
+                         [pal[ch] for ch in _P1_PAL])
     result = _grid(rows, pal)
     _cache[key] = result
     return result
@@ -256,8 +376,9 @@ _ENEMY_L = [
 
 def enemy_sprite(etype: str) -> pygame.Surface:
     key = f"enemy_{etype}"
-    if key in _cache:
-        return _cache[key]
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
 
     if etype == "small":
         pal, rows, w = _ES_PAL, _ENEMY_S, _ESW
@@ -267,6 +388,8 @@ def enemy_sprite(etype: str) -> pygame.Surface:
         pal, rows, w = _EM_PAL, _ENEMY_M, _EMW
 
     fixed = [_fix_row(r, w) for r in rows]
+    if settings.PALETTE_SPRITES:
+        return _register(key, key, lambda: _index_grid(fixed, pal), list(pal.values()))
     result = _grid(fixed, pal)
     _cache[key] = result
     return result
@@ -462,10 +585,16 @@ _BOSS_DRAW_FUNCS = {
 }
 
 
+def boss_key(level: int, frame: int = 0) -> str:
+    """Boss 精灵的规范缓存键：外观每 7 关循环一次，第 8 关起与前面的关卡共用 boss_L1..L7"""
+    return f"boss_L{(level - 1) % len(_BOSS_PALETTES) + 1}_{frame}"
+
+
 def boss_sprite(level: int = 1, frame: int = 0) -> pygame.Surface:
-    key = f"boss_L{level}_{frame}"
-    if key in _cache:
-        return _cache[key]
+    key = boss_key(level, frame)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
 
     w, h = 40, 28
     s = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -475,6 +604,13 @@ def boss_sprite(level: int = 1, frame: int = 0) -> pygame.Surface:
     draw_fn = _BOSS_DRAW_FUNCS[pal_key]
     draw_fn(s, w, h, pal, frame)
 
+    if settings.PALETTE_SPRITES:
+        indexed = _quantize(s)
+        if indexed is not None:
+            # 同一类型的 Boss（每 7 关循环）共用一个形状
+            small, colors = indexed
+            return _register(key, f"boss_T{pal_key}_{frame}",
+                             lambda: pygame.transform.scale(small, (w * PX, h * PX)), colors)
     result = pygame.transform.scale(s, (w * PX, h * PX))
     _cache[key] = result
     return result
@@ -563,8 +699,9 @@ _PU_S = [
 
 def powerup_sprite(ptype: str) -> pygame.Surface:
     key = f"powerup_{ptype}"
-    if key in _cache:
-        return _cache[key]
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
     if ptype == "bullet":
         rows, pal = _PU_B, _PU_B_PAL
     elif ptype == "life":
@@ -573,16 +710,228 @@ def powerup_sprite(ptype: str) -> pygame.Surface:
         rows, pal = _PU_S, _PU_S_PAL
     else:
         rows, pal = _PU_M, _PU_M_PAL
+    if settings.PALETTE_SPRITES:
+        return _register(key, key, lambda: _index_grid(rows, pal), list(pal.values()))
     result = _grid(rows, pal)
     _cache[key] = result
     return result
 
 
+# ═══════════════════════════════════════════════════════════
+#  Scaled Sprite Cache
+# ═══════════════════════════════════════════════════════════
+
+_scaled_cache = AssetCache("scaled", SPRITE_CACHE_BYTES, SPRITE_CACHE_SIZE)
+_glow_cache = AssetCache("glow", SPRITE_CACHE_BYTES // 4, 64)
+_convert = False  # convert_caches() 之后新生成的缩放精灵直接转换成显示格式
+
+
+def get_sprite(key: str) -> pygame.Surface:
+    """按缓存键取原始精灵，未生成时分派给对应的生成函数"""
+    if key in _cache:
+        return _cache[key]
+    if key in _variants:
+        # 8 位模式下被淘汰的配色（含 palette_variant 登记的自定义键）按登记的形状与调色板重建
+        result = _cache[key] = _variant(*_variants[key])
+        return result
+    kind, _, rest = key.partition("_")
+    if kind == "player":
+        pid, frame = rest.split("_")
+        return player_sprite(int(pid), int(frame))
+    if kind == "enemy":
+        return enemy_sprite(rest)
+    if kind == "boss":
+        level, frame = rest.split("_")
+        return boss_sprite(int(level[1:]), int(frame))
+    if kind == "powerup":
+        return powerup_sprite(rest)
+    if kind == "title":
+        w, h = rest.split("x")
+        return create_title_scene(int(w), int(h))
+    raise KeyError(key)
+
+
+def get_scaled(key: str, size: tuple[int, int]) -> pygame.Surface:
+    """缩放到目标尺寸的精灵（共享表面，调用方不要修改）"""
+    ck = (key, size)
+    cached = _scaled_cache.get(ck)
+    if cached is not None:
+        return cached
+    base = get_sprite(key)
+    if key in _variants:
+        result = _scaled_cache[ck] = _variant(*_variants[key], size)
+        return result
+    if base.get_size() == size:
+        result = base
+    else:
+        result = pygame.transform.scale(base, size)
+    if _convert:
+        result = formats.optimize(result)
+    _scaled_cache[ck] = result
+    return result
+
+
+def get_glow(key: str, size: tuple[int, int]) -> pygame.Surface:
+    """发光层用的独立副本：允许 set_alpha 而不影响共享精灵；不带 RLE，每帧改 alpha 不触发重新编码"""
+    ck = (key, size)
+    cached = _glow_cache.get(ck)
+    if cached is not None:
+        return cached
+    result = formats.without_rle(get_scaled(key, size))
+    _glow_cache[ck] = result
+    return result
+
+
+def warm_up(entries) -> None:
+    """预生成 (键, 尺寸) 列表中的缩放精灵，避免首次出现时卡顿"""
+    for key, size in entries:
+        get_scaled(key, size)
+
+
+def atlas_name(key: str, size: tuple[int, int] | None = None) -> str:
+    """图集中的名称：原始精灵用缓存键，缩放精灵为 键@宽x高"""
+    return key if size is None else f"{key}@{size[0]}x{size[1]}"
+
+
+def build_atlas(entries, raw_keys=()) -> SpriteAtlas:
+    """预生成 entries 中的缩放精灵与 raw_keys 中的原始精灵，连同已缓存的全部精灵打包成图集"""
+    warm_up(entries)
+    for key in raw_keys:
+        get_sprite(key)
+    sprites = dict(_cache.items())
+    for (key, size), surf in _scaled_cache.items():
+        sprites[atlas_name(key, size)] = surf
+    return pack_atlas(sprites)
+
+
+def install_sprites(sprites: dict[str, pygame.Surface]) -> None:
+    """按图集名称（见 atlas_name）把现成的表面放入缓存"""
+    for name, surf in sprites.items():
+        key, _, size = name.partition("@")
+        if size:
+            w, h = size.split("x")
+            _scaled_cache[(key, (int(w), int(h)))] = surf
+        else:
+            _cache[key] = surf
+    _glow_cache.clear()
+
+
+def install_atlas(atlas: SpriteAtlas) -> None:
+    """用图集中的 subsurface 视图替换缓存里的独立表面"""
+    install_sprites({name: atlas.get(name) for name in atlas.names()})
+
+
+def convert_caches() -> None:
+    """显示表面建立后调用：把已缓存的精灵与半透明表面转换成显示格式（见 formats）
+    图集视图会被换成独立表面，RLE 只对独立表面生效"""
+    global _convert
+    if not formats.ready():
+        return
+    done: dict[int, pygame.Surface] = {}
+
+    def convert(s):
+        if id(s) not in done:
+            done[id(s)] = formats.optimize(s)
+        return done[id(s)]
+    for cache in (_cache, _scaled_cache):
+        for key, surf in list(cache.items()):
+            cache[key] = convert(surf)
+    for key, surf in list(_alpha_cache.items()):
+        _alpha_cache[key] = surf.convert_alpha()
+    _glow_cache.clear()
+    _blast_cache.clear()
+    _convert = True
+
+
+# ═══════════════════════════════════════════════════════════
+#  Alpha Surface Atlas
+# ═══════════════════════════════════════════════════════════
+
+ALPHA_STEP = 4
+# 半透明表面按 (形状, 尺寸, 颜色, 量化后的透明度) 缓存；尺寸随画面变化的调用方应先量化尺寸
+ALPHA_CACHE_BYTES = SPRITE_CACHE_BYTES // 4
+ALPHA_CACHE_SIZE = 512
+
+_alpha_cache = AssetCache("alpha", ALPHA_CACHE_BYTES, ALPHA_CACHE_SIZE)
+
+
+def _quantize_alpha(alpha: int) -> int:
+    return min(255, max(0, (int(alpha) + ALPHA_STEP // 2) // ALPHA_STEP * ALPHA_STEP))
+
+
+def _alpha_surface(key: tuple, build) -> pygame.Surface:
+    s = _alpha_cache.get(key)
+    if s is None:
+        s = _alpha_cache[key] = build()
+    return s
+
+
+def alpha_rect(size: tuple[int, int], color: tuple, alpha: int) -> pygame.Surface:
+    """半透明纯色矩形（共享表面，调用方不要修改），透明度按 ALPHA_STEP 量化"""
+    alpha = _quantize_alpha(alpha)
+
+    def build():
+        s = pygame.Surface(size, pygame.SRCALPHA)
+        s.fill((*color, alpha))
+        return s
+    return _alpha_surface(("rect", size, color, alpha), build)
+
+
+def alpha_circle(radius: int, color: tuple, alpha: int,
+                 pad: int = 2) -> pygame.Surface:
+    """半透明实心圆，表面边长 2 * (radius + pad)，圆心在表面中心"""
+    alpha = _quantize_alpha(alpha)
+
+    def build():
+        side = (radius + pad) * 2
+        s = pygame.Surface((side, side), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*color, alpha), (radius + pad, radius + pad), radius)
+        return s
+    return _alpha_surface(("circle", radius, color, alpha, pad), build)
+
+
+# MISSILE_RADIUS = 110 的一次爆炸约 18 帧、1.1 MiB，预算要能放下整段动画
+_blast_cache = AssetCache("blast", SPRITE_CACHE_BYTES // 2, 64)
+
+
+def missile_blast(outer: int) -> pygame.Surface:
+    """导弹爆炸一帧：低分辨率半径 outer 的三层同心圆放大 PX 倍（共享表面，调用方不要修改）
+    边长 (max(outer, 1) + 1) * 2 * PX，中心即爆炸中心"""
+    cached = _blast_cache.get(outer)
+    if cached is not None:
+        return cached
+    c = max(outer, 1) + 1
+    lo = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA)
+    if outer > 0:
+        pygame.draw.circle(lo, ORANGE, (c, c), outer)
+    pygame.draw.circle(lo, YELLOW, (c, c), max(1, int(outer * 0.6)))
+    pygame.draw.circle(lo, WHITE, (c, c), max(1, int(outer * 0.3)))
+    result = pygame.transform.scale(lo, (c * 2 * PX, c * 2 * PX))
+    if _convert:
+        result = formats.optimize(result)
+    _blast_cache[outer] = result
+    return result
+
+
+def alpha_stats() -> dict[str, int]:
+    """半透明表面缓存的 (表面数, 累计分配数, 命中数)，用于核对逐帧分配是否归零"""
+    return {"surfaces": len(_alpha_cache), "created": _alpha_cache.misses,
+            "hits": _alpha_cache.hits}
+
+
 # ═══════════════════════════════════════════════════════════
 #  Title Screen Scene
 # ═══════════════════════════════════════════════════════════
 
+def title_scene_key(w: int, h: int) -> str:
+    return f"title_{w}x{h}"
+
+
 def create_title_scene(w: int, h: int) -> pygame.Surface:
+    key = title_scene_key(w, h)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
     import random
     s = pygame.Surface((w, h), pygame.SRCALPHA)
     s.fill((8, 12, 30))
@@ -630,6 +979,7 @@ def create_title_scene(w: int, h: int) -> pygame.Surface:
     glow.fill((255, 163, 0, 50))
     s.blit(glow, (w // 2 - 12, h - 8))
 
+    _cache[key] = s
     return s
 
 
@@ -680,6 +1030,16 @@ def create_scanlines(w: int, h: int, alpha: int = 18) -> pygame.Surface:
     return s
 
 
+def create_scanlines_mult(w: int, h: int, alpha: int = 18) -> pygame.Surface:
+    """与 create_scanlines 等效的不透明乘法层，配合 BLEND_MULT 使用"""
+    s = pygame.Surface((w, h))
+    s.fill((255, 255, 255))
+    v = 255 - alpha
+    for y in range(0, h, 2):
+        pygame.draw.line(s, (v, v, v), (0, y), (w, y))
+    return s
+
+
 def create_bg_gradient(w: int, h: int) -> pygame.Surface:
     s = pygame.Surface((w, h))
     step = PX * 2
@@ -731,11 +1091,13 @@ def draw_shield_effect(surface: pygame.Surface, cx: int, cy: int,
             c = WHITE
         pygame.draw.rect(surface, c, (x - PX, y - PX, PX * 2, PX * 2))
 
-    glow_surf = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
-    glow_alpha = int(20 + 10 * math.sin(ticks / 150.0))
-    pygame.draw.circle(glow_surf, (*SHIELD_BLUE, glow_alpha),
-                       (radius + 2, radius + 2), radius)
-    surface.blit(glow_surf, (cx - radius - 2, cy - radius - 2))
+    if quality.glow:
+        glow_alpha = int(20 + 10 * math.sin(ticks / 150.0))
+        surface.blit(alpha_circle(radius, SHIELD_BLUE, glow_alpha),
+                     (cx - radius - 2, cy - radius - 2))
+
+
+HP_GLOW_STEP = 64
 
 
 def draw_boss_hp_bar(surface: pygame.Surface, x: int, y: int,
@@ -761,8 +1123,8 @@ def draw_boss_hp_bar(surface: pygame.Surface, x: int, y: int,
         else:
             pygame.draw.rect(surface, (25, 8, 8), (sx, y, sw, h))
     pygame.draw.rect(surface, (180, 50, 50), (x, y, w, h), 1)
-    if ratio > 0:
+    if ratio > 0 and quality.glow:
         glow_w = max(1, int(w * ratio))
-        glow = pygame.Surface((glow_w, h + 4), pygame.SRCALPHA)
-        glow.fill((255, 60, 60, 25))
-        surface.blit(glow, (x, y - 2))
+        # 宽度按 HP_GLOW_STEP 向上取整，各关血条宽度不同也只缓存少数几张光晕
+        glow = alpha_rect((-(-w // HP_GLOW_STEP) * HP_GLOW_STEP, h + 4), (255, 60, 60), 25)
+        surface.blit(glow, (x, y - 2), (0, 0, glow_w, h + 4))
@@ -0,0 +1,93 @@
+"""
+对象池与实体列表
+短命实体（爆炸、火花、飘字、道具）用完后归还空闲链表，下次 acquire 时调用
+reset() 原地复用，避免频繁分配带来的 GC 压力；EntityList 提供 O(1) 交换删除
+"""
+
+
+class Pool:
+    """单一类型的空闲链表；被池化的类需提供与 __init__ 同签名的 reset()"""
+
+    def __init__(self, cls, capacity: int = 256):
+        self.cls = cls
+        self.capacity = capacity
+        self.free: list = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj) -> None:
+        if len(self.free) < self.capacity:
+            self.free.append(obj)
+
+
+_pools: dict[type, Pool] = {}
+
+
+def register(cls, capacity: int = 256):
+    """登记可池化的类（可作类装饰器使用）"""
+    _pools[cls] = Pool(cls, capacity)
+    return cls
+
+
+def acquire(cls, *args, **kwargs):
+    pool = _pools.get(cls)
+    if pool is None:
+        return cls(*args, **kwargs)
+    return pool.acquire(*args, **kwargs)
+
+
+def release(obj) -> None:
+    """按类型归还对象；未登记的类型直接丢弃"""
+    pool = _pools.get(type(obj))
+    if pool is not None:
+        pool.release(obj)
+
+
+def stats() -> dict[str, tuple[int, int, int]]:
+    """各池的 (新建数, 复用数, 空闲数)"""
+    return {cls.__name__: (p.created, p.reused, len(p.free))
+            for cls, p in _pools.items()}
+
+
+def total_reused() -> int:
+    """累计复用次数，即避免的分配次数"""
+    return sum(p.reused for p in _pools.values())
+
+
+class EntityList(list):
+    """交换删除的实体列表：删除 O(1)，不保证顺序；sweep 倒序遍历保证每个元素恰好访问一次"""
+
+    __slots__ = ()
+
+    def swap_remove(self, i: int):
+        last = self.pop()
+        if i < len(self):
+            obj = self[i]
+            self[i] = last
+            return obj
+        return last
+
+    def sweep(self, dead) -> int:
+        """dead(obj) 为真时移除并归还对象池，返回移除数量"""
+        removed = 0
+        for i in range(len(self) - 1, -1, -1):
+            obj = self[i]
+            if dead(obj):
+                self.swap_remove(i)
+                release(obj)
+                removed += 1
+        return removed
+
+    def remove_indices(self, indices) -> None:
+        """按下标批量删除并归还对象池"""
+        for i in sorted(indices, reverse=True):
+            release(self.swap_remove(i))
@@ -0,0 +1,79 @@
+"""
+渲染质量自适应：按滚动窗口内的平均帧耗时升降质量档位
+降档看最近一个窗口是否超出预算，升档要求连续一段时间明显低于预算（迟滞），
+换档后清空窗口并冷却，避免在两档之间来回抖动
+各绘制路径直接读取本模块的当前档位变量
+"""
+from collections import deque
+
+import settings
+
+# 档位: (名称, HUD 标签, 粒子数量/尾迹长度倍率, 发光层, 流星, 扫描线策略)
+# 扫描线策略为 None 时使用 settings.SCANLINE_MODE
+TIERS = (
+    ("high", "高", 1.0, True, True, None),
+    ("medium", "中", 0.6, True, False, "baked"),
+    ("low", "低", 0.35, False, False, "off"),
+)
+
+tier = 0
+name, label, detail, glow, shooting_stars, _scanlines = TIERS[0]
+
+
+def set_tier(index: int) -> None:
+    global tier, name, label, detail, glow, shooting_stars, _scanlines
+    tier = max(0, min(len(TIERS) - 1, index))
+    name, label, detail, glow, shooting_stars, _scanlines = TIERS[tier]
+
+
+def scanline_mode() -> str:
+    return _scanlines or settings.SCANLINE_MODE
+
+
+class QualityGovernor:
+    """记录每帧实际工作耗时（不含等待帧率上限的休眠），必要时切换档位
+    预算按目标帧率 FPS 计：RENDER_FPS 只是插值渲染的上限，60 Hz 设备上超出 8.3 ms 并不掉帧"""
+
+    def __init__(self, target_ms: float = 1000.0 / settings.FPS,
+                 window: int = 90, upgrade_frames: int = 300,
+                 down_ratio: float = 1.0, up_ratio: float = 0.6):
+        self.target_ms = target_ms
+        self.samples: deque[float] = deque(maxlen=window)
+        self.upgrade_frames = upgrade_frames
+        self.down_ms = target_ms * down_ratio
+        self.up_ms = target_ms * up_ratio
+        self._calm = 0
+        self.changes: list[tuple[int, str, float]] = []
+        self.frames = 0
+
+    def average(self) -> float:
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def record(self, frame_ms: float) -> bool:
+        """记录一帧耗时；档位变化时返回 True"""
+        self.frames += 1
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        avg = self.average()
+        if avg > self.down_ms and tier < len(TIERS) - 1:
+            return self._switch(tier + 1, avg)
+        if avg < self.up_ms and tier > 0:
+            self._calm += 1
+            if self._calm >= self.upgrade_frames:
+                return self._switch(tier - 1, avg)
+        else:
+            self._calm = 0
+        return False
+
+    def _switch(self, index: int, avg: float) -> bool:
+        set_tier(index)
+        self.samples.clear()
+        self._calm = 0
+        self.changes.append((self.frames, name, avg))
+        return True
+
+    def stats(self) -> dict:
+        return {"tier": name, "avg_ms": round(self.average(), 2),
+                "target_ms": round(self.target_ms, 2),
+                "changes": len(self.changes)}
@@ -16,6 +16,20 @@ SCREEN_HEIGHT = 700
 WINDOW_TITLE = "飞机大战"
 
 FPS = 60
+SIM_HZ = 60
+RENDER_FPS = 120
+MAX_SIM_STEPS = 5
+PARTICLE_BUDGET = 1500
+# 扫描线策略见 compositor.SCANLINE_MODES，用 python bench.py post 比较各策略耗时
+SCANLINE_MODE = "mult"
+SCANLINE_ALPHA = 18
+# 冷启动时用进程池并行生成精灵（Android 上始终关闭；桌面端进程启动开销通常大于收益）
+PARALLEL_WARMUP = False
+# 每帧留给分时资源预热的最长时间（毫秒），只在帧耗时未超预算时使用
+ASSET_BUDGET_MS = 2.0
+# 8 位调色板精灵：像素内存约为 32 位的 1/4，换色只换调色板；绘制比 colorkey + RLE 的
+# 32 位精灵慢，也不走图集 / 磁盘缓存。小内存的 Android 设备可开启（python bench.py palette）
+PALETTE_SPRITES = False
 FIRE_COOLDOWN = 6
 INITIAL_SPAWN_INTERVAL = 50
 MIN_SPAWN_INTERVAL = 20
@@ -41,6 +55,8 @@ ENEMY_MEDIUM = (40, 40, 4, 1)
 ENEMY_LARGE = (52, 52, 2, 3)
 
 SCORE_FONT_SIZE = 28
+# 游戏中用到的全部字号，启动时预热
+FONT_SIZES = (14, 16, 17, 18, 20, 22, 28, 32, 36, 42, 48)
 SCORE_POS = (10, 10)
 HIGH_SCORE_FILE = os.path.join(_BASE_DIR, "highscore.txt")
 LEADERBOARD_FILE = os.path.join(_BASE_DIR, "leaderboard.txt")
@@ -0,0 +1,90 @@
+"""
+精灵磁盘缓存：打包好的图集连同指纹写到存档目录（与最高分文件同处），冷启动时整体读入
+页面存为原始 BGRA 字节而非 PNG：PNG 解码比重新生成全部精灵还慢
+指纹覆盖调色板 / 字符网格等常量、pixel_art 各函数的字节码、精灵清单与缓存格式版本，
+不一致或文件损坏时回退为重新生成并覆盖缓存
+"""
+import hashlib
+import os
+import types
+
+import pygame
+
+import pixel_art as pa
+import settings
+from atlas import SpriteAtlas
+
+CACHE_VERSION = 1
+CACHE_PATH = os.path.join(os.path.dirname(settings.HIGH_SCORE_FILE), "sprite_cache")
+
+
+def _stable(value):
+    """与内存地址无关的表示：函数取名字，容器逐项展开"""
+    if isinstance(value, types.FunctionType):
+        return value.__qualname__
+    if isinstance(value, dict):
+        return sorted((repr(k), _stable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    return repr(value)
+
+
+def _digest_code(h, code: types.CodeType) -> None:
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _digest_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+
+def fingerprint(entries, raw_keys=()) -> str:
+    h = hashlib.sha1(f"{CACHE_VERSION}|{pygame.version.ver}|".encode())
+    for name, value in sorted(vars(pa).items()):
+        if isinstance(value, types.FunctionType):
+            if value.__module__ == pa.__name__:
+                h.update(name.encode())
+                _digest_code(h, value.__code__)
+        elif name.lstrip("_").isupper():
+            h.update(f"{name}={_stable(value)}".encode())
+    h.update(repr([list(entries), list(raw_keys)]).encode())
+    return h.hexdigest()
+
+
+def load(entries, raw_keys=(), path: str = CACHE_PATH) -> SpriteAtlas | None:
+    """指纹一致且包含全部精灵时返回缓存的图集，否则返回 None"""
+    try:
+        cached = SpriteAtlas.load(path)
+    except (OSError, ValueError):
+        return None
+    if cached.meta.get("fingerprint") != fingerprint(entries, raw_keys):
+        return None
+    names = [pa.atlas_name(key, size) for key, size in entries] + list(raw_keys)
+    if not all(name in cached for name in names):
+        return None
+    return cached
+
+
+def save(atlas: SpriteAtlas, entries, raw_keys=(), path: str = CACHE_PATH) -> bool:
+    atlas.meta = {"version": CACHE_VERSION,
+                  "fingerprint": fingerprint(entries, raw_keys)}
+    try:
+        atlas.save(path, raw=True)
+    except (OSError, pygame.error):
+        return False
+    return True
+
+
+def load_or_build(entries, raw_keys=(), path: str = CACHE_PATH,
+                  generate=None) -> tuple[SpriteAtlas, bool]:
+    """返回 (图集, 是否命中缓存)；未命中时重新生成并写回缓存
+    generate(entries, raw_keys) 可预先把精灵生成进 pixel_art 缓存（如并行预热）"""
+    cached = load(entries, raw_keys, path)
+    if cached is not None:
+        return cached, True
+    if generate is not None:
+        generate(entries, raw_keys)
+    built = pa.build_atlas(entries, raw_keys)
+    save(built, entries, raw_keys, path)
+    return built, False
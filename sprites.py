@@ -1,13 +1,17 @@
 """
 游戏精灵类：玩家、子弹、敌机、星空、爆炸 —— 像素风格版 v2
-新增：FloatingText, HitSpark, ScreenShake, ShootingStar
+新增：FloatingText, ScreenShake, ShootingStar（粒子见 particles.py）
 """
 import math
 import random
 import pygame
 
 import pixel_art as pa
-from utils import get_font
+import quality
+import settings
+from particles import ParticleSystem, emit_stardust, rng as fx_random
+from pools import register
+from utils import get_font, render_text
 
 
 class ScreenShake:
@@ -36,13 +40,16 @@ class ScreenShake:
         return (0, 0)
 
 
+@register
 class FloatingText:
     """浮动文字效果（得分、连杀提示等）"""
 
-    _font_cache: dict[int, pygame.font.Font] = {}
-
     def __init__(self, x: int, y: int, text: str, color: tuple,
                  duration: int = 45, size: int = 16):
+        self.reset(x, y, text, color, duration, size)
+
+    def reset(self, x: int, y: int, text: str, color: tuple,
+              duration: int = 45, size: int = 16) -> None:
         self.x = x
         self.y = float(y)
         self.text = text
@@ -50,75 +57,50 @@ class FloatingText:
         self.duration = duration
         self.frame = 0
         self.size = size
-        if size not in FloatingText._font_cache:
-            FloatingText._font_cache[size] = get_font(size)
-        self.font = FloatingText._font_cache[size]
 
     def update(self) -> bool:
         self.frame += 1
         self.y -= 1.2
         return self.frame >= self.duration
 
-    def draw(self, surface: pygame.Surface) -> None:
-        alpha = max(0, 255 - int(255 * (self.frame / self.duration) ** 2))
-        scale = 1.0 + 0.3 * max(0, 1 - self.frame / 8)
-        txt = self.font.render(self.text, False, self.color)
-        if scale > 1.05:
-            sw = int(txt.get_width() * scale)
-            sh = int(txt.get_height() * scale)
-            txt = pygame.transform.scale(txt, (sw, sh))
-        txt.set_alpha(alpha)
-        surface.blit(txt, (self.x - txt.get_width() // 2, int(self.y)))
-
+    @staticmethod
+    def _scale(frame: int) -> float:
+        """出现时的放大弹跳，接近 1 时直接用原尺寸"""
+        scale = 1.0 + 0.3 * max(0, 1 - frame / 8)
+        return scale if scale > 1.05 else 1.0
 
-class HitSpark:
-    """子弹命中时的火花粒子"""
+    @staticmethod
+    def _font(size: int) -> pygame.font.Font:
+        # 直接走 utils 的有界字体缓存，不再另存一份（否则被淘汰的字体仍常驻内存）
+        return get_font(size)
 
-    def __init__(self, x: int, y: int, color: tuple = None):
-        self.particles: list[list] = []
-        colors = [pa.WHITE, pa.YELLOW, pa.ORANGE] if color is None else [color, pa.WHITE]
-        for _ in range(8):
-            angle = random.random() * 2 * math.pi
-            spd = random.uniform(2, 6)
-            self.particles.append([
-                float(x), float(y),
-                math.cos(angle) * spd,
-                math.sin(angle) * spd,
-                random.randint(4, 10),
-                random.choice(colors),
-            ])
-
-    def update(self) -> bool:
-        all_dead = True
-        for p in self.particles:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[2] *= 0.88
-            p[3] *= 0.88
-            p[4] -= 1
-            if p[4] > 0:
-                all_dead = False
-        return all_dead
+    @classmethod
+    def prerender(cls, text: str, color: tuple, size: int = 16) -> None:
+        """预先渲染该文字各帧会用到的全部缩放版本"""
+        font = cls._font(size)
+        for scale in dict.fromkeys(cls._scale(f) for f in range(9)):
+            render_text(font, text, color, scale=scale)
 
     def draw(self, surface: pygame.Surface) -> None:
-        px = pa.PX
-        for x, y, _, _, life, color in self.particles:
-            if life > 0:
-                size = px * 2 if life > 6 else px
-                pygame.draw.rect(surface, color,
-                                 (int(x) - size // 2, int(y) - size // 2, size, size))
+        alpha = max(0, 255 - int(255 * (self.frame / self.duration) ** 2))
+        txt = render_text(self._font(self.size), self.text, self.color,
+                          scale=self._scale(self.frame))
+        txt.set_alpha(alpha)
+        surface.blit(txt, (self.x - txt.get_width() // 2, int(self.y)))
+        txt.set_alpha(255)
 
 
 class ShootingStar:
     """流星效果"""
 
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int,
+                 particles: ParticleSystem):
         self.sw = screen_width
         self.sh = screen_height
+        self.particles = particles
         self.active = False
-        self.timer = random.randint(200, 500)
+        self.timer = fx_random.randint(200, 500)
         self.x = self.y = self.dx = self.dy = 0.0
-        self.trail: list[tuple[float, float, int]] = []
         self.life = 0
 
     def update(self) -> None:
@@ -126,100 +108,126 @@ class ShootingStar:
             self.timer -= 1
             if self.timer <= 0:
                 self.active = True
-                self.x = float(random.randint(0, self.sw))
-                self.y = float(random.randint(-20, self.sh // 4))
-                angle = random.uniform(0.3, 1.0)
-                speed = random.uniform(10, 18)
+                self.x = float(fx_random.randint(0, self.sw))
+                self.y = float(fx_random.randint(-20, self.sh // 4))
+                angle = fx_random.uniform(0.3, 1.0)
+                speed = fx_random.uniform(10, 18)
                 self.dx = math.cos(angle) * speed
                 self.dy = math.sin(angle) * speed
-                self.trail = []
-                self.life = random.randint(20, 40)
+                self.life = fx_random.randint(20, 40)
             return
 
-        self.trail.append((self.x, self.y, 15))
+        emit_stardust(self.particles, self.x, self.y)
         self.x += self.dx
         self.y += self.dy
         self.life -= 1
 
-        new_trail = []
-        for tx, ty, tl in self.trail:
-            if tl > 1:
-                new_trail.append((tx, ty, tl - 1))
-        self.trail = new_trail
-
         if self.life <= 0 or self.x < -20 or self.x > self.sw + 20 or self.y > self.sh:
             self.active = False
-            self.timer = random.randint(200, 500)
+            self.timer = fx_random.randint(200, 500)
 
     def draw(self, surface: pygame.Surface) -> None:
         px = pa.PX
-        for tx, ty, tl in self.trail:
-            alpha = min(255, tl * 18)
-            size = px if tl < 5 else px * 2
-            s = pygame.Surface((size, size), pygame.SRCALPHA)
-            s.fill((255, 255, 255, alpha))
-            surface.blit(s, (int(tx), int(ty)))
         if self.active:
             pygame.draw.rect(surface, pa.WHITE,
                              (int(self.x) - 1, int(self.y) - 1, px * 2, px * 2))
 
 
 class StarBackground:
-    """多层像素星空背景 —— 带颜色、大小分层和闪烁效果"""
+    """多层像素星空背景 —— 每层预渲染为一条窄而高的可循环星带，横向平铺、各列错开相位，
+    省下整屏宽度星带的内存（低内存 Android 设备）
+    闪烁：每层按相位分成两组星带，组内统一用表面透明度做亮度脉冲"""
 
     STAR_COLORS_DIM = [(80, 80, 100), (60, 60, 80), (100, 80, 100), (70, 70, 90)]
     STAR_COLORS_MID = [pa.WHITE, (200, 200, 255), (255, 255, 200), pa.LIGHT_GRAY]
     STAR_COLORS_BRIGHT = [pa.WHITE, pa.CYAN, pa.YELLOW, pa.PINK, pa.LIGHT_BLUE]
 
+    # (权重, 滚动速度, 颜色, 星点边长)
+    LAYERS = (
+        (3, 0.55, STAR_COLORS_DIM, pa.PX),
+        (4, 1.5, STAR_COLORS_MID, pa.PX),
+        (3, 2.75, STAR_COLORS_BRIGHT, pa.PX * 2),
+    )
+    TWINKLE_PHASES = (0.0, math.pi)
+    TWINKLE_LEVELS = 16
+    TILE_WIDTH = 120
+
     def __init__(self, screen_width: int, screen_height: int, star_count: int = 120):
         self.sw = screen_width
         self.sh = screen_height
-        self.stars: list[dict] = []
-        for _ in range(star_count):
-            layer = random.choices([0, 1, 2], weights=[3, 4, 3])[0]
-            if layer == 0:
-                speed = random.uniform(0.3, 0.8)
-                color = random.choice(self.STAR_COLORS_DIM)
-                size = pa.PX
-            elif layer == 1:
-                speed = random.uniform(1.0, 2.0)
-                color = random.choice(self.STAR_COLORS_MID)
-                size = pa.PX
-            else:
-                speed = random.uniform(2.0, 3.5)
-                color = random.choice(self.STAR_COLORS_BRIGHT)
-                size = pa.PX * 2
-            self.stars.append({
-                "x": random.randint(0, screen_width),
-                "y": random.randint(0, screen_height),
-                "speed": speed,
-                "color": color,
-                "size": size,
-                "phase": random.random() * 6.28,
-            })
-        self.shooting_stars = [ShootingStar(screen_width, screen_height) for _ in range(2)]
+        weights = [layer[0] for layer in self.LAYERS]
+        groups = len(self.TWINKLE_PHASES)
+        tile_w = min(self.TILE_WIDTH, screen_width)
+        columns = -(-screen_width // tile_w)
+        # 各列的纵向相位（黄金分割错开），避免相邻列看出重复
+        self.columns = [(c * tile_w, int(c * screen_height * 0.618) % screen_height)
+                        for c in range(columns)]
+        # strips[layer][group]
+        self.strips: list[list[pygame.Surface]] = []
+        for _ in self.LAYERS:
+            row = []
+            for _ in range(groups):
+                strip = pygame.Surface((tile_w, screen_height))
+                strip.fill((0, 0, 0))
+                row.append(strip)
+            self.strips.append(row)
+        # 每块星带平铺 columns 次，星点数按列数折算，保持整屏密度不变
+        for _ in range(max(1, star_count // columns)):
+            layer = random.choices(range(len(self.LAYERS)), weights=weights)[0]
+            _, _, colors, size = self.LAYERS[layer]
+            strip = self.strips[layer][random.randrange(groups)]
+            # 横向不回绕：相邻列纵向相位不同，回绕到左缘的半颗星会错开高度
+            x = min(random.randrange(tile_w), tile_w - size)
+            y = random.randint(0, screen_height)
+            color = random.choice(colors)
+            strip.fill(color, (x, y, size, size))
+            if y + size > screen_height:
+                strip.fill(color, (x, y - screen_height, size, size))
+        for row in self.strips:
+            for strip in row:
+                strip.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        self.offsets = [0.0] * len(self.LAYERS)
+        self._alpha = [-1] * groups
+        self.particles = ParticleSystem(64)
+        self.shooting_stars = [ShootingStar(screen_width, screen_height, self.particles)
+                               for _ in range(2)]
 
     def update(self) -> None:
-        for s in self.stars:
-            s["y"] += s["speed"]
-            if s["y"] > self.sh:
-                s["y"] = -s["size"]
-                s["x"] = random.randint(0, self.sw)
-        for ss in self.shooting_stars:
-            ss.update()
+        for i, layer in enumerate(self.LAYERS):
+            self.offsets[i] = (self.offsets[i] + layer[1]) % self.sh
+        if quality.shooting_stars:
+            for ss in self.shooting_stars:
+                ss.update()
+        self.particles.update()
+
+    def _twinkle(self) -> None:
+        """按组更新透明度；量化到 TWINKLE_LEVELS 级，只在级别变化时重设"""
+        t = pygame.time.get_ticks() / 600.0
+        steps = self.TWINKLE_LEVELS - 1
+        for g, phase in enumerate(self.TWINKLE_PHASES):
+            level = round((math.sin(t + phase) * 0.5 + 0.5) * steps)
+            if level != self._alpha[g]:
+                self._alpha[g] = level
+                alpha = int(255 * (0.4 + 0.6 * level / steps))
+                for row in self.strips:
+                    row[g].set_alpha(alpha, pygame.RLEACCEL)
 
     def draw(self, surface: pygame.Surface) -> None:
-        t = pygame.time.get_ticks() / 600.0
-        for s in self.stars:
-            twinkle = math.sin(t + s["phase"]) * 0.3 + 0.7
-            r, g, b = s["color"]
-            c = (max(0, min(255, int(r * twinkle))),
-                 max(0, min(255, int(g * twinkle))),
-                 max(0, min(255, int(b * twinkle))))
-            pygame.draw.rect(surface, c,
-                             (int(s["x"]), int(s["y"]), s["size"], s["size"]))
-        for ss in self.shooting_stars:
-            ss.draw(surface)
+        self._twinkle()
+        sh = self.sh
+        seq = []
+        for row, offset in zip(self.strips, self.offsets):
+            y = int(offset)
+            for x, phase in self.columns:
+                yc = (y + phase) % sh
+                for strip in row:
+                    seq.append((strip, (x, yc)))
+                    seq.append((strip, (x, yc - sh)))
+        surface.blits(seq, False)
+        self.particles.draw(surface)
+        if quality.shooting_stars:
+            for ss in self.shooting_stars:
+                ss.draw(surface)
 
 
 class Missile:
@@ -229,142 +237,87 @@ class Missile:
         self.x = float(x)
         self.y = float(y)
         self.speed = speed
-        self.trail: list[tuple[float, float, int]] = []
+        self.save_prev()
+
+    def save_prev(self) -> None:
+        self.prev_x = self.x
+        self.prev_y = self.y
 
     def update(self, screen_height: int) -> bool:
         self.y -= self.speed
-        self.trail.append((self.x, self.y + self.speed * 2, 8))
-        for i in range(len(self.trail) - 1, -1, -1):
-            tx, ty, life = self.trail[i]
-            self.trail[i] = (tx, ty, life - 1)
-            if life <= 0:
-                self.trail.pop(i)
         return self.y < -30
 
-    def draw(self, surface: pygame.Surface) -> None:
+    @property
+    def exhaust_pos(self) -> tuple[float, float]:
+        return self.x, self.y + self.speed * 2
+
+    _body: pygame.Surface | None = None
+
+    @classmethod
+    def _get_body(cls) -> pygame.Surface:
+        if cls._body is None:
+            px = pa.PX
+            body = pygame.Surface((px * 2 + 2, px * 4 + 2))
+            body.fill(pa.CYAN)
+            pygame.draw.rect(body, pa.WHITE, (1, px, px * 2, px * 3))
+            pygame.draw.rect(body, pa.LIGHT_BLUE, (1, 0, px * 2, px))
+            cls._body = body
+        return cls._body
+
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
         px = pa.PX
-        for tx, ty, life in self.trail:
-            size = max(px, life // 2 * px)
-            t = 1 - life / 8
-            if t < 0.25:
-                c = pa.WHITE
-            elif t < 0.45:
-                c = pa.YELLOW
-            elif t < 0.7:
-                c = pa.ORANGE
-            else:
-                c = pa.RED
-            pygame.draw.rect(surface, c,
-                             (int(tx) - size // 2, int(ty) - size // 2, size, size))
-        mx, my = int(self.x), int(self.y)
-        pygame.draw.rect(surface, pa.CYAN,
-                         (mx - px - 1, my - px * 3, px * 2 + 2, px * 4 + 2))
-        pygame.draw.rect(surface, pa.WHITE,
-                         (mx - px, my - px * 2, px * 2, px * 3))
-        pygame.draw.rect(surface, pa.LIGHT_BLUE,
-                         (mx - px, my - px * 3, px * 2, px))
+        mx = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        my = int(self.prev_y + (self.y - self.prev_y) * alpha)
+        surface.blit(self._get_body(), (mx - px - 1, my - px * 3))
 
     @property
     def explosion_pos(self) -> tuple[int, int]:
         return int(self.x), int(self.y) + 20
 
 
+@register
 class MissileExplosion:
     """导弹爆炸：低分辨率渲染后放大，保持像素风格"""
 
     def __init__(self, x: int, y: int, radius: int = 110, duration: int = 35):
+        self.reset(x, y, radius, duration)
+
+    def reset(self, x: int, y: int, radius: int = 110, duration: int = 35) -> None:
         self.x = x
         self.y = y
         self.radius = radius
         self.duration = duration
         self.frame = 0
-        self.particles: list[list] = []
-        for _ in range(55):
-            angle = random.random() * 2 * math.pi
-            spd = random.uniform(1.5, 7)
-            dist = random.uniform(0, radius * 0.25)
-            self.particles.append([
-                x + dist * math.cos(angle),
-                y + dist * math.sin(angle),
-                math.cos(angle) * spd,
-                math.sin(angle) * spd,
-                random.randint(15, duration),
-            ])
 
     def update(self) -> bool:
         self.frame += 1
-        for p in self.particles:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[2] *= 0.94
-            p[3] *= 0.94
-            p[4] -= 1
         return self.frame >= self.duration
 
     def draw(self, surface: pygame.Surface) -> None:
-        px = pa.PX
         progress = self.frame / self.duration
         if progress < 0.5:
-            lo_r = self.radius // px
-            lo_size = lo_r * 2 + 4
-            lo = pygame.Surface((lo_size, lo_size), pygame.SRCALPHA)
-            cx, cy = lo_size // 2, lo_size // 2
-            outer = int(lo_r * progress * 2)
-            inner = max(1, int(outer * 0.6))
-            core = max(1, int(outer * 0.3))
-            if outer > 0:
-                pygame.draw.circle(lo, pa.ORANGE, (cx, cy), outer)
-            if inner > 0:
-                pygame.draw.circle(lo, pa.YELLOW, (cx, cy), inner)
-            if core > 0:
-                pygame.draw.circle(lo, pa.WHITE, (cx, cy), core)
-            hi = pygame.transform.scale(lo, (lo_size * px, lo_size * px))
-            surface.blit(hi,
-                         (self.x - lo_size * px // 2, self.y - lo_size * px // 2))
-        for x, y, _, _, life in self.particles:
-            if life > 0:
-                t = 1 - life / self.duration
-                if t < 0.2:
-                    c = pa.WHITE
-                elif t < 0.4:
-                    c = pa.YELLOW
-                elif t < 0.6:
-                    c = pa.ORANGE
-                else:
-                    c = pa.RED
-                size = px * 2 if life > self.duration * 0.5 else px
-                pygame.draw.rect(surface, c,
-                                 (int(x) - size // 2, int(y) - size // 2, size, size))
+            # 各帧只取决于低分辨率半径，预生成的放大帧由 pixel_art 缓存
+            outer = int(self.radius // pa.PX * progress * 2)
+            blast = pa.missile_blast(outer)
+            half = blast.get_width() // 2
+            surface.blit(blast, (self.x - half, self.y - half))
 
 
+@register
 class Explosion:
-    """像素风格爆炸效果：方形粒子 + 闪光核心 + 碎片"""
+    """像素风格爆炸效果的闪光核心（碎片粒子由粒子系统负责）"""
 
     def __init__(self, x: int, y: int, duration: int = 16):
+        self.reset(x, y, duration)
+
+    def reset(self, x: int, y: int, duration: int = 16) -> None:
         self.x = x
         self.y = y
         self.duration = duration
         self.frame = 0
-        self.particles: list[list] = []
-        for _ in range(20):
-            angle = random.random() * 2 * math.pi
-            spd = random.uniform(1.5, 6)
-            self.particles.append([
-                float(x), float(y),
-                math.cos(angle) * spd,
-                math.sin(angle) * spd,
-                random.randint(6, duration),
-                random.choice([0, 1]),
-            ])
 
     def update(self) -> bool:
         self.frame += 1
-        for p in self.particles:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[2] *= 0.92
-            p[3] *= 0.92
-            p[4] -= 1
         return self.frame >= self.duration
 
     def draw(self, surface: pygame.Surface) -> None:
@@ -378,32 +331,27 @@ class Explosion:
                                   cr + 2, cr + 2))
                 pygame.draw.rect(surface, pa.WHITE,
                                  (self.x - cr // 2, self.y - cr // 2, cr, cr))
-        for x, y, _, _, life, ptype in self.particles:
-            if life > 0:
-                t = 1 - life / self.duration
-                if ptype == 0:
-                    if t < 0.2:
-                        c = pa.WHITE
-                    elif t < 0.4:
-                        c = pa.YELLOW
-                    elif t < 0.7:
-                        c = pa.ORANGE
-                    else:
-                        c = pa.RED
-                else:
-                    if t < 0.3:
-                        c = pa.LIGHT_GRAY
-                    elif t < 0.6:
-                        c = pa.DARK_GRAY
-                    else:
-                        c = (60, 50, 45)
-                size = px * 2 if life > self.duration * 0.6 else px
-                pygame.draw.rect(surface, c,
-                                 (int(x) - size // 2, int(y) - size // 2,
-                                  size, size))
-
-
-class Player:
+
+
+class Interpolated:
+    """记录上一逻辑帧的位置，渲染时在两帧之间按 alpha 插值"""
+
+    rect: pygame.Rect
+
+    def save_prev(self) -> None:
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+
+    def lerp_rect(self, alpha: float = 1.0) -> pygame.Rect:
+        if alpha >= 1.0:
+            return self.rect
+        r = self.rect.copy()
+        r.x = round(self.prev_x + (r.x - self.prev_x) * alpha)
+        r.y = round(self.prev_y + (r.y - self.prev_y) * alpha)
+        return r
+
+
+class Player(Interpolated):
     """玩家飞机类 - 像素风格精灵，支持引擎动画和护盾"""
 
     FORM_STATS = {"normal": (6, 1.0), "agile": (8, 0.85), "heavy": (4, 1.2)}
@@ -430,10 +378,10 @@ class Player:
             x = screen_width * 3 // 4 - width // 2
         y = screen_height - height - 20
         self.rect = pygame.Rect(x, y, width, height)
+        self.save_prev()
         self.invincible = False
         self.invincible_timer = 0
         self.shield_timer = 0
-        self.trail_particles: list[list] = []
 
     def _get_form_stats(self) -> tuple[int, float]:
         speed, scale = self.FORM_STATS.get(self.plane_form, (6, 1.0))
@@ -443,7 +391,9 @@ class Player:
         self.plane_form = form
         self.speed, _ = self._get_form_stats()
 
-    def update(self, keys=None, touch_target: tuple[float, float] | None = None) -> None:
+    def update(self, move: tuple[int, int] | None = None,
+               touch_target: tuple[float, float] | None = None) -> bool:
+        """返回本帧是否发生了移动"""
         if self.invincible:
             self.invincible_timer -= 1
             if self.invincible_timer <= 0:
@@ -456,202 +406,55 @@ class Player:
         if touch_target is not None:
             self.rect.centerx = int(touch_target[0])
             self.rect.centery = int(touch_target[1])
-        elif keys is not None:
-            dx = dy = 0
-            if self.player_id == 1:
-                if keys[pygame.K_a]:
-                    dx -= self.speed
-                if keys[pygame.K_d]:
-                    dx += self.speed
-                if keys[pygame.K_w]:
-                    dy -= self.speed
-                if keys[pygame.K_s]:
-                    dy += self.speed
-            else:
-                if keys[pygame.K_LEFT]:
-                    dx -= self.speed
-                if keys[pygame.K_RIGHT]:
-                    dx += self.speed
-                if keys[pygame.K_UP]:
-                    dy -= self.speed
-                if keys[pygame.K_DOWN]:
-                    dy += self.speed
-            self.rect.x += dx
-            self.rect.y += dy
+        elif move is not None:
+            self.rect.x += move[0] * self.speed
+            self.rect.y += move[1] * self.speed
         self.rect.x = max(0, min(self.screen_width - self.width, self.rect.x))
         self.rect.y = max(0, min(self.screen_height - self.height, self.rect.y))
 
-        moved = (self.rect.x != old_x or self.rect.y != old_y)
-        if moved:
-            self.trail_particles.append([
-                float(self.rect.centerx + random.randint(-3, 3)),
-                float(self.rect.bottom),
-                random.uniform(-0.5, 0.5),
-                random.uniform(1.0, 3.0),
-                random.randint(6, 12),
-            ])
-
-        new_trail = []
-        for tp in self.trail_particles:
-            tp[0] += tp[2]
-            tp[1] += tp[3]
-            tp[4] -= 1
-            if tp[4] > 0:
-                new_trail.append(tp)
-        self.trail_particles = new_trail[-30:]
+        return self.rect.x != old_x or self.rect.y != old_y
 
     def hit(self, invincibility_frames: int) -> None:
         self.invincible = True
         self.invincible_timer = invincibility_frames
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
         px = pa.PX
         ticks = pygame.time.get_ticks()
-
-        for tp in self.trail_particles:
-            t = 1 - tp[4] / 12
-            if t < 0.3:
-                c = pa.YELLOW
-            elif t < 0.6:
-                c = pa.ORANGE
-            else:
-                c = (180, 60, 20)
-            alpha = max(0, min(255, int(tp[4] * 25)))
-            s = pygame.Surface((px, px), pygame.SRCALPHA)
-            s.fill((*c, alpha))
-            surface.blit(s, (int(tp[0]), int(tp[1])))
+        rect = self.lerp_rect(alpha)
 
         if self.invincible and (self.invincible_timer // 5) % 2 == 0:
             return
         frame = (ticks // 100) % 2
-        sprite = pa.player_sprite(self.player_id, frame)
-        scaled = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
+        scaled = pa.get_scaled(f"player_{self.player_id}_{frame}", rect.size)
 
-        glow_alpha = int(40 + 20 * math.sin(ticks / 200.0))
-        glow_h = px * 4
-        glow_w = self.rect.width // 3
-        glow_surf = pygame.Surface((glow_w, glow_h), pygame.SRCALPHA)
-        glow_surf.fill((255, 163, 0, glow_alpha))
-        glow_x = self.rect.centerx - glow_w // 2
-        glow_y = self.rect.bottom - px
-        surface.blit(glow_surf, (glow_x, glow_y))
+        if quality.glow:
+            glow_alpha = int(40 + 20 * math.sin(ticks / 200.0))
+            glow_h = px * 4
+            glow_w = rect.width // 3
+            glow_x = rect.centerx - glow_w // 2
+            glow_y = rect.bottom - px
+            surface.blit(pa.alpha_rect((glow_w, glow_h), (255, 163, 0), glow_alpha),
+                         (glow_x, glow_y))
 
-        surface.blit(scaled, self.rect)
+        surface.blit(scaled, rect)
 
         blink = (ticks // 500) % 2 == 0
         if blink:
-            tip_y = self.rect.y + int(self.rect.height * 0.52)
-            left_x = self.rect.x + px
-            right_x = self.rect.right - px * 2
+            tip_y = rect.y + int(rect.height * 0.52)
+            left_x = rect.x + px
+            right_x = rect.right - px * 2
             c = pa.RED if self.player_id == 1 else pa.GREEN
             pygame.draw.rect(surface, c, (left_x, tip_y, px, px))
             pygame.draw.rect(surface, c, (right_x, tip_y, px, px))
 
         if self.shield_timer > 0:
-            radius = max(self.rect.width, self.rect.height) // 2 + 6
-            pa.draw_shield_effect(surface, self.rect.centerx, self.rect.centery,
+            radius = max(rect.width, rect.height) // 2 + 6
+            pa.draw_shield_effect(surface, rect.centerx, rect.centery,
                                   radius, ticks)
 
 
-class Bullet:
-    """像素风格子弹 — 支持角度射击"""
-
-    def __init__(self, x: float, y: float, width: int = 4, height: int = 12,
-                 speed: int = 12, style: str = "normal",
-                 vx: float = 0.0, vy: float | None = None):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.speed = speed
-        self.style = style
-        self.vx = float(vx)
-        self.vy = float(vy) if vy is not None else -float(speed)
-        self._fx = float(x)
-        self._fy = float(y)
-
-    def update(self) -> None:
-        self._fx += self.vx
-        self._fy += self.vy
-        self.rect.x = int(self._fx)
-        self.rect.y = int(self._fy)
-
-    def is_off_screen(self, screen_height: int) -> bool:
-        return self.rect.bottom < -20 or self.rect.top > screen_height + 20 or \
-               self.rect.right < -20 or self.rect.left > 500
-
-    def draw(self, surface: pygame.Surface) -> None:
-        r = self.rect
-        px = pa.PX
-        cx, cy = r.centerx, r.centery
-        t = (pygame.time.get_ticks() // 60) % 4
-
-        if self.style == "laser":
-            pygame.draw.rect(surface, pa.LASER_EDGE,
-                             (cx - px, r.top - px, px * 2, r.height + px * 2))
-            pygame.draw.rect(surface, pa.LASER_CORE,
-                             (cx - px // 2, r.top, px, r.height))
-            pygame.draw.rect(surface, pa.WHITE,
-                             (cx - 1, r.top, 2, px * 2))
-        elif self.style == "plasma":
-            size = px * 3
-            pygame.draw.rect(surface, pa.PLASMA_EDGE,
-                             (cx - size // 2, cy - size // 2, size, size))
-            pygame.draw.rect(surface, pa.PLASMA_MID,
-                             (cx - px, cy - px, px * 2, px * 2))
-            pygame.draw.rect(surface, pa.PLASMA_CORE,
-                             (cx - 1, cy - 1, 3, 3))
-        elif self.style == "electric":
-            offsets = [((t + i) % 3 - 1) * px for i in range(3)]
-            for i, ox in enumerate(offsets):
-                yy = r.top + i * r.height // 3
-                pygame.draw.rect(surface, pa.ELEC_BOLT,
-                                 (cx + ox - 1, yy, px, r.height // 3))
-            pygame.draw.rect(surface, pa.ELEC_CORE,
-                             (cx - 1, r.top, 2, r.height))
-        else:
-            pygame.draw.rect(surface, pa.BULLET_YELLOW, r)
-            pygame.draw.rect(surface, pa.BULLET_WHITE,
-                             (r.x, r.y, r.width, px))
-
-
-class EnemyBullet:
-    """敌机子弹 - 像素风格，支持方向速度"""
-
-    def __init__(self, x: int, y: int, speed: int = 5,
-                 vx: float = 0, vy: float | None = None,
-                 is_boss: bool = False):
-        self.rect = pygame.Rect(x - 3, y, 6, 14)
-        self.vx = float(vx)
-        self.vy = float(vy) if vy is not None else float(speed)
-        self.is_boss = is_boss
-
-    def update(self) -> None:
-        self.rect.x += int(self.vx)
-        self.rect.y += int(self.vy)
-
-    def is_off_screen(self, screen_height: int) -> bool:
-        return (self.rect.top > screen_height or self.rect.bottom < 0
-                or self.rect.right < 0 or self.rect.left > 600)
-
-    def draw(self, surface: pygame.Surface) -> None:
-        r = self.rect
-        px = pa.PX
-        if self.is_boss:
-            pygame.draw.rect(surface, pa.BOSS_BULLET_COLOR, r)
-            pygame.draw.rect(surface, pa.BOSS_BULLET_CORE,
-                             (r.centerx - 1, r.top, 2, r.height))
-            ticks = pygame.time.get_ticks()
-            glow = pygame.Surface((r.width + 4, r.height + 4), pygame.SRCALPHA)
-            glow_alpha = int(30 + 15 * math.sin(ticks / 100.0))
-            glow.fill((*pa.BOSS_BULLET_COLOR, glow_alpha))
-            surface.blit(glow, (r.x - 2, r.y - 2))
-        else:
-            pygame.draw.rect(surface, pa.ENEMY_BULLET_CORE, r)
-            pygame.draw.rect(surface, pa.ENEMY_BULLET_TIP,
-                             (r.x, r.bottom - px, r.width, px))
-            pygame.draw.rect(surface, pa.WHITE,
-                             (r.centerx - 1, r.top, 2, px))
-
-
-class Enemy:
+class Enemy(Interpolated):
     """敌机类 - 像素风格精灵"""
 
     TYPES = {
@@ -669,6 +472,7 @@ class Enemy:
         x = random.randint(0, max(0, screen_width - w))
         y = -h
         self.rect = pygame.Rect(x, y, w, h)
+        self.save_prev()
         self.color = color
         self.points = {"small": 2, "medium": 1, "large": 3}.get(etype, 1)
         self.fire_timer = random.randint(0, 50)
@@ -680,17 +484,22 @@ class Enemy:
     def is_off_screen(self, screen_height: int) -> bool:
         return self.rect.top > screen_height
 
-    def draw(self, surface: pygame.Surface) -> None:
-        sprite = pa.enemy_sprite(self.etype)
-        scaled = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-        surface.blit(scaled, self.rect)
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
+        scaled = pa.get_scaled(f"enemy_{self.etype}", self.rect.size)
+        surface.blit(scaled, self.lerp_rect(alpha))
 
 
-class PowerUp:
+@register
+class PowerUp(Interpolated):
     """道具 - 像素风格带脉冲动画"""
 
     def __init__(self, x: int, y: int, ptype: str, speed: float = 2):
         self.rect = pygame.Rect(x - 10, y - 10, 20, 20)
+        self.reset(x, y, ptype, speed)
+
+    def reset(self, x: int, y: int, ptype: str, speed: float = 2) -> None:
+        self.rect.update(x - 10, y - 10, 20, 20)
+        self.save_prev()
         self.ptype = ptype
         self.speed = speed
 
@@ -700,21 +509,23 @@ class PowerUp:
     def is_off_screen(self, screen_height: int) -> bool:
         return self.rect.top > screen_height
 
-    def draw(self, surface: pygame.Surface) -> None:
-        sprite = pa.powerup_sprite(self.ptype)
-        scaled = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-        t = pygame.time.get_ticks() / 300.0
-        pulse = math.sin(t) * 0.3 + 0.7
-        glow_size = int(self.rect.width * (1 + pulse * 0.15))
-        glow_offset = (glow_size - self.rect.width) // 2
-        glow = pygame.transform.scale(sprite, (glow_size, glow_size))
-        glow.set_alpha(int(80 * pulse))
-        surface.blit(glow,
-                     (self.rect.x - glow_offset, self.rect.y - glow_offset))
-        surface.blit(scaled, self.rect)
-
-
-class Boss:
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
+        rect = self.lerp_rect(alpha)
+        key = f"powerup_{self.ptype}"
+        scaled = pa.get_scaled(key, rect.size)
+        if quality.glow:
+            t = pygame.time.get_ticks() / 300.0
+            pulse = math.sin(t) * 0.3 + 0.7
+            glow_size = int(rect.width * (1 + pulse * 0.15))
+            glow_offset = (glow_size - rect.width) // 2
+            glow = pa.get_glow(key, (glow_size, glow_size))
+            glow.set_alpha(int(80 * pulse))
+            surface.blit(glow,
+                         (rect.x - glow_offset, rect.y - glow_offset))
+        surface.blit(scaled, rect)
+
+
+class Boss(Interpolated):
     """Boss 敌机 - 每关不同外观/大小/行为"""
 
     BOSS_CONFIGS = {
@@ -727,12 +538,21 @@ class Boss:
         7: {"w": 180, "h": 115, "hp": 200, "spd": 3.8, "pts": 180},
     }
 
+    @classmethod
+    def size_for(cls, level: int) -> tuple[int, int]:
+        cfg = cls.BOSS_CONFIGS[min(level, 7)]
+        extra = max(0, level - 7)
+        return cfg["w"] + extra * 5, cfg["h"] + extra * 3
+
+    @classmethod
+    def points_for(cls, level: int) -> int:
+        return cls.BOSS_CONFIGS[min(level, 7)]["pts"] + max(0, level - 7) * 20
+
     def __init__(self, screen_width: int, screen_height: int, level: int):
         cfg_key = min(level, 7)
         cfg = self.BOSS_CONFIGS.get(cfg_key, self.BOSS_CONFIGS[7])
         extra = max(0, level - 7)
-        self.width = cfg["w"] + extra * 5
-        self.height = cfg["h"] + extra * 3
+        self.width, self.height = self.size_for(level)
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.level = level
@@ -740,11 +560,12 @@ class Boss:
         self.hp = self.max_hp
         x = (screen_width - self.width) // 2
         self.rect = pygame.Rect(x, -self.height, self.width, self.height)
+        self.save_prev()
         self.target_y = 50
         self.entering = True
         self.speed = cfg["spd"] + extra * 0.2
         self.direction = 1
-        self.points = cfg["pts"] + extra * 20
+        self.points = self.points_for(level)
         self.fire_timer = 0
         self.pattern_timer = 0
         self.attack_phase = 0
@@ -796,16 +617,34 @@ class Boss:
     def is_dead(self) -> bool:
         return self.hp <= 0
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0) -> None:
+        rect = self.lerp_rect(alpha)
         frame = (pygame.time.get_ticks() // 200) % 2
-        sprite = pa.boss_sprite(self.level, frame)
-        scaled = pygame.transform.scale(sprite, (self.rect.width, self.rect.height))
-        surface.blit(scaled, self.rect)
+        scaled = pa.get_scaled(pa.boss_key(self.level, frame), rect.size)
+        surface.blit(scaled, rect)
 
         bar_w = self.width + 20
         bar_h = pa.PX * 3
-        bar_x = self.rect.centerx - bar_w // 2
-        bar_y = self.rect.top - bar_h - pa.PX * 4
+        bar_x = rect.centerx - bar_w // 2
+        bar_y = rect.top - bar_h - pa.PX * 4
         if not self.entering:
             pa.draw_boss_hp_bar(surface, bar_x, bar_y, bar_w, bar_h,
                                 self.hp / self.max_hp, pygame.time.get_ticks())
+
+
+def scaled_sprite_keys(level: int = 1) -> list[tuple[str, tuple[int, int]]]:
+    """某关卡会用到的 (精灵键, 显示尺寸)，供 pa.warm_up 预生成"""
+    entries = [(f"player_{pid}_{frame}", (50, 60))
+               for pid in (1, 2) for frame in (0, 1)]
+    entries += [(f"enemy_{etype}", (w, h))
+                for etype, (w, h, _, _) in Enemy.TYPES.items()]
+    entries += [(f"powerup_{ptype}", (20, 20)) for ptype in settings.POWERUP_TYPES]
+    entries += [(pa.boss_key(level, frame), Boss.size_for(level))
+                for frame in (0, 1)]
+    return entries
+
+
+def all_sprite_keys() -> list[tuple[str, tuple[int, int]]]:
+    """全部关卡（7 种 Boss）的 (精灵键, 显示尺寸)，供打包图集"""
+    levels = range(1, len(Boss.BOSS_CONFIGS) + 1)
+    return list(dict.fromkeys(e for lv in levels for e in scaled_sprite_keys(lv)))
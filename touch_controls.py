@@ -5,6 +5,8 @@
 import math
 import pygame
 
+import formats
+
 
 class TouchControls:
     """
@@ -47,6 +49,9 @@ class TouchControls:
         self.move_hint = pygame.Surface((120, 120), pygame.SRCALPHA)
         pygame.draw.circle(self.move_hint, (255, 255, 255, 18), (60, 60), 55)
         pygame.draw.circle(self.move_hint, (255, 255, 255, 35), (60, 60), 55, 1)
+        self.btn_normal = formats.optimize(self.btn_normal)
+        self.btn_active = formats.optimize(self.btn_active)
+        self.move_hint = formats.optimize(self.move_hint)
 
     def begin_move(self, finger_id: int, finger_x: float, finger_y: float,
                    player_cx: float, player_cy: float) -> None:
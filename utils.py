@@ -1,10 +1,13 @@
 """
-工具函数：字体加载等
+工具函数：字体加载、文字渲染缓存等
 """
 import os
 import sys
+
 import pygame
 
+from assetcache import AssetCache
+
 IS_ANDROID = "ANDROID_ROOT" in os.environ or "ANDROID_STORAGE" in os.environ
 
 if getattr(sys, "frozen", False):
@@ -42,7 +45,9 @@ def _build_font_candidates() -> list[str]:
 
 
 _FONT_CANDIDATES = _build_font_candidates()
-_cached_fonts: dict[tuple[str, int], pygame.font.Font] = {}
+FONT_CACHE_SIZE = 24
+# 字体对象的内存无从测量，只限个数
+_cached_fonts = AssetCache("fonts", max_entries=FONT_CACHE_SIZE, sizeof=None)
 _resolved_font_path: str | None = None
 
 
@@ -58,31 +63,77 @@ def _find_font_path() -> str | None:
 
 
 def get_font(size: int, bold: bool = False) -> pygame.font.Font:
-    """获取支持中文的字体，失败时回退到默认字体"""
+    """获取支持中文的字体（LRU 缓存，最多 FONT_CACHE_SIZE 个），失败时回退到默认字体"""
     key = ("bold" if bold else "normal", size)
-    if key in _cached_fonts:
-        return _cached_fonts[key]
+    font = _cached_fonts.get(key)
+    if font is None:
+        font = _cached_fonts[key] = _load_font(size, bold)
+    return font
+
 
+def _load_font(size: int, bold: bool) -> pygame.font.Font:
     font_path = _find_font_path()
     if font_path:
         try:
-            font = pygame.font.Font(font_path, size)
-            _cached_fonts[key] = font
-            return font
+            return pygame.font.Font(font_path, size)
         except (OSError, pygame.error):
             pass
 
     if not IS_ANDROID:
         try:
-            font = pygame.font.SysFont(
+            return pygame.font.SysFont(
                 ["microsoftyahei", "simhei", "simsun", "kaiti"],
                 size, bold=bold,
             )
-            _cached_fonts[key] = font
-            return font
         except (OSError, pygame.error):
             pass
 
-    font = pygame.font.Font(None, size)
-    _cached_fonts[key] = font
-    return font
+    return pygame.font.Font(None, size)
+
+
+def warm_fonts(sizes) -> None:
+    """启动时预先打开声明的字号，避免游戏中途首次打开 TTF 造成卡顿"""
+    for size in sizes:
+        get_font(size)
+
+
+# ── 文字渲染缓存 ────────────────────────────────
+
+TEXT_CACHE_SIZE = 256
+TEXT_CACHE_BYTES = 2 * 1024 * 1024
+SHADOW_OFFSET = 2
+
+_text_cache = AssetCache("text", TEXT_CACHE_BYTES, TEXT_CACHE_SIZE)
+
+
+def render_text(font: pygame.font.Font, text: str, color: tuple,
+                shadow: tuple | None = None, scale: float = 1.0) -> pygame.Surface:
+    """渲染文字并按 (字体, 文本, 颜色, 阴影色, 缩放) 缓存（LRU）
+    shadow 不为 None 时返回带右下 2px 阴影的合成表面；返回的表面是共享的，
+    临时改动用完需还原：set_alpha 要用 set_alpha(255) 还原，set_alpha(None) 会去掉
+    带阴影合成表面（SRCALPHA）的逐像素透明，之后再画就是一块黑底"""
+    key = (font, text, color, shadow, scale)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        return surf
+    if scale != 1.0:
+        base = render_text(font, text, color, shadow)
+        size = (int(base.get_width() * scale), int(base.get_height() * scale))
+        surf = pygame.transform.scale(base, size)
+    elif shadow is not None:
+        main = font.render(text, False, color)
+        back = font.render(text, False, shadow)
+        w, h = main.get_size()
+        surf = pygame.Surface((w + SHADOW_OFFSET, h + SHADOW_OFFSET), pygame.SRCALPHA)
+        surf.blit(back, (SHADOW_OFFSET, SHADOW_OFFSET))
+        surf.blit(main, (0, 0))
+    else:
+        surf = font.render(text, False, color)
+    _text_cache[key] = surf
+    return surf
+
+
+def text_cache_info() -> dict[str, int]:
+    return {"hits": _text_cache.hits, "misses": _text_cache.misses,
+            "size": len(_text_cache), "capacity": TEXT_CACHE_SIZE,
+            "bytes": _text_cache.bytes}
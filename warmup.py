@@ -0,0 +1,64 @@
+"""
+冷启动精灵预热：按精灵键分组生成（原始精灵 + 各显示尺寸），可选进程池并行
+工作进程只返回 (名称, 尺寸, BGRA 字节)，主进程用 pygame.image.frombuffer 直接映射成表面
+进程池不可用（Android、受限环境）或出错时回退为主线程串行生成
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pygame
+
+import pixel_art as pa
+
+
+def _groups(entries, raw_keys=()) -> list[tuple[str, list[tuple[int, int]]]]:
+    """(精灵键, 显示尺寸列表)，保持首次出现的顺序"""
+    groups: dict[str, list[tuple[int, int]]] = {key: [] for key in raw_keys}
+    for key, size in entries:
+        groups.setdefault(key, []).append(size)
+    return list(groups.items())
+
+
+def _render_group(key: str, sizes: list[tuple[int, int]]
+                  ) -> list[tuple[str, tuple[int, int], bytes]]:
+    """工作进程入口：生成一个精灵键的原始精灵与各尺寸缩放版本"""
+    surfaces = [(pa.atlas_name(key), pa.get_sprite(key))]
+    surfaces += [(pa.atlas_name(key, size), pa.get_scaled(key, size)) for size in sizes]
+    return [(name, s.get_size(), pygame.image.tobytes(s, "BGRA")) for name, s in surfaces]
+
+
+def _install(results) -> None:
+    pa.install_sprites({name: pygame.image.frombuffer(bytearray(data), size, "BGRA")
+                        for name, size, data in results})
+
+
+def generate(entries, raw_keys=(), parallel: bool = False, progress=None,
+             workers: int | None = None) -> str:
+    """把 entries / raw_keys 中的精灵生成进 pixel_art 缓存
+    progress(done, total) 每完成一组回调一次；返回实际使用的方式 "parallel" / "serial" """
+    groups = _groups(entries, raw_keys)
+    total = len(groups)
+    if parallel:
+        try:
+            workers = workers or min(total, os.cpu_count() or 1)
+            # spawn: 不把已初始化的 SDL 显示状态 fork 进工作进程
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(_render_group, key, sizes) for key, sizes in groups]
+                for done, future in enumerate(as_completed(futures), 1):
+                    _install(future.result())
+                    if progress is not None:
+                        progress(done, total)
+            return "parallel"
+        except Exception:
+            # 进程池只是可选的加速：启动失败、工作进程出错（pygame.error、序列化失败等）
+            # 都回退为串行生成；已装入的组串行时直接命中缓存
+            pass
+    for done, (key, sizes) in enumerate(groups, 1):
+        pa.get_sprite(key)
+        for size in sizes:
+            pa.get_scaled(key, size)
+        if progress is not None:
+            progress(done, total)
+    return "serial"